@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+로컬 E-utilities 대역 서버
+esearch.fcgi(JSON, retstart/retmax 페이지), efetch.fcgi(GET/POST, 합성 XML),
+elink.fcgi(JSON, pubmed_pubmed_refs/citedin)를 구현하며
+응답 지연과 429 응답 비율을 설정해 크롤러·수집 파이프라인을 네트워크 없이 측정할 수 있게 함
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.synthetic_pubmed import FIRST_PMID, SyntheticCorpus
+
+
+class FakeEUtilsServer:
+    """
+    별도 스레드에서 실행되는 E-utilities 대역 서버. with 문으로 시작·종료합니다.
+    검색어와 관계없이 esearch는 papers편 전체를 돌려주며, error_rate 비율의 요청에는 429를 응답합니다.
+    """
+
+    def __init__(self, corpus: SyntheticCorpus, papers: int, latency: float = 0.0, error_rate: float = 0.0,
+                 retry_after: int = 0, host: str = '127.0.0.1', port: int = 0, seed: int = 0):
+        self.corpus = corpus
+        self.papers = papers
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.counts = {'esearch': 0, 'efetch': 0, 'elink': 0, 'rejected': 0}
+        self._cited_in = None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-eutils', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def _reject(self) -> bool:
+        with self._lock:
+            rejected = self._rng.random() < self.error_rate
+            if rejected:
+                self.counts['rejected'] += 1
+            return rejected
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.counts[endpoint] += 1
+
+    def links(self, pmid: int, linkname: str) -> List[int]:
+        """합성 인용 관계. citedin은 처음 요청될 때 말뭉치 전체의 참고문헌을 뒤집어 만듭니다."""
+        if linkname == 'pubmed_pubmed_refs':
+            return self.corpus.references(pmid)
+        with self._lock:
+            if self._cited_in is None:
+                self._cited_in = defaultdict(list)
+                for citing in range(FIRST_PMID, FIRST_PMID + self.papers):
+                    for cited in self.corpus.references(citing):
+                        self._cited_in[cited].append(citing)
+            return self._cited_in.get(pmid, [])
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._dispatch(parse_qs(urlsplit(self.path).query))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                self._dispatch(parse_qs(self.rfile.read(length).decode('utf-8')))
+
+            def _dispatch(self, params: Dict):
+                if server.latency:
+                    time.sleep(server.latency)
+                endpoint = urlsplit(self.path).path.rsplit('/', 1)[-1]
+                if endpoint not in ('esearch.fcgi', 'efetch.fcgi', 'elink.fcgi'):
+                    self._send(404, b'not found', 'text/plain')
+                    return
+                if server._reject():
+                    self._send(429, b'{"error":"API rate limit exceeded"}', 'application/json',
+                               {'Retry-After': str(server.retry_after)})
+                    return
+
+                if endpoint == 'esearch.fcgi':
+                    server._count('esearch')
+                    retstart = int(params.get('retstart', ['0'])[0])
+                    retmax = int(params.get('retmax', ['20'])[0])
+                    ids = [str(FIRST_PMID + i) for i in range(retstart, min(retstart + retmax, server.papers))]
+                    body = json.dumps({'esearchresult': {
+                        'count': str(server.papers), 'retstart': str(retstart), 'retmax': str(len(ids)), 'idlist': ids,
+                    }}).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                elif endpoint == 'elink.fcgi':
+                    server._count('elink')
+                    linkname = params.get('linkname', [''])[0]
+                    linksets = []
+                    for pmid in params.get('id', []):
+                        links = server.links(int(pmid), linkname)
+                        linkset = {'dbfrom': 'pubmed', 'ids': [pmid]}
+                        if links:
+                            linkset['linksetdbs'] = [{'dbto': 'pubmed', 'linkname': linkname,
+                                                      'links': [str(link) for link in links]}]
+                        linksets.append(linkset)
+                    body = json.dumps({'linksets': linksets}).encode('utf-8')
+                    self._send(200, body, 'application/json')
+                else:
+                    server._count('efetch')
+                    ids = [pmid for value in params.get('id', []) for pmid in value.split(',') if pmid]
+                    body = server.corpus.articleset_xml(ids).encode('utf-8')
+                    self._send(200, body, 'text/xml; charset=UTF-8')
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: Dict[str, str] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 E-utilities 대역 서버')
+    parser.add_argument('--papers', type=int, default=10000, help='esearch가 돌려줄 논문 수')
+    parser.add_argument('--port', type=int, default=8798, help='수신 포트')
+    parser.add_argument('--latency', type=float, default=0.3, help='요청당 응답 지연(초)')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='429로 응답할 요청 비율')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    server = FakeEUtilsServer(SyntheticCorpus(seed=args.seed), args.papers, args.latency, args.error_rate,
+                              port=args.port, seed=args.seed)
+    print(f"E-utilities 대역 서버: {server.base_url} (논문 {args.papers}편, 지연 {args.latency}초, "
+          f"429 비율 {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+종단간 벤치마크 모음
+합성 PubMed 코퍼스와 로컬 E-utilities 대역 서버로 파싱·분류·저장·수집·조회·분석 단계를 측정하고
+커밋 간 비교할 수 있도록 결과를 JSON으로 저장
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from xml.etree import ElementTree as ET
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fake_eutils import FakeEUtilsServer
+from benchmarks.startup_latency import build_synthetic_db
+from benchmarks.synthetic_pubmed import SyntheticCorpus
+from scripts.analyzer import TrendAnalyzer
+from scripts.categorizer import PaperCategorizer
+from scripts.citation_graph import CitationGraph
+from scripts.db_manager import DatabaseManager
+from scripts.ingest_pipeline import IngestPipeline
+from scripts.pubmed_crawler import PubMedCrawler
+from scripts.pubmed_parser import PubMedXMLParser
+
+VIEWER_FILTERS = {
+    'all': {},
+    'category': {'category': 'biomarker'},
+    'year': {'year': '2020'},
+    'search': {'search': 'amyloid'},
+    'combined': {'category': 'neuroscience', 'year': '2022', 'search': 'memory'},
+}
+
+
+class BenchmarkContext:
+    """시나리오들이 공유하는 합성 데이터와 임시 작업 디렉토리"""
+
+    def __init__(self, args):
+        self.args = args
+        self.workdir = tempfile.mkdtemp(prefix='mci_bench_')
+        self.corpus = SyntheticCorpus(seed=args.seed, vocab_size=args.vocab)
+        self.chunks = list(self.corpus.iter_chunks(args.papers))
+        self.papers = [PubMedXMLParser.parse_article(article)
+                       for chunk in self.chunks for article in ET.fromstring(chunk).iter('PubmedArticle')]
+        self.read_db = None
+        self._server = None
+        self._db_counter = 0
+
+    def fresh_db(self) -> DatabaseManager:
+        """측정마다 새 DB (유사도 색인도 별도 디렉토리)를 만듭니다."""
+        self._db_counter += 1
+        db_dir = os.path.join(self.workdir, f"db{self._db_counter}")
+        os.makedirs(db_dir)
+        return DatabaseManager(os.path.join(db_dir, 'papers.db'))
+
+    def read_db_path(self) -> str:
+        """조회·분석 시나리오용 대용량 DB를 한 번만 만듭니다."""
+        if self.read_db is None:
+            self.read_db = self.args.read_db or os.path.join(self.workdir, 'read.db')
+            if not os.path.exists(self.read_db):
+                build_synthetic_db(self.read_db, self.args.read_papers, seed=self.args.seed)
+        return self.read_db
+
+    def crawler(self, server: FakeEUtilsServer) -> PubMedCrawler:
+        crawler = PubMedCrawler()
+        crawler.base_url = server.base_url
+        crawler.api_key = None
+        if not self.args.rate_limit:
+            crawler.min_interval = 0.0
+        return crawler
+
+    def server(self) -> FakeEUtilsServer:
+        """대역 서버를 한 번만 띄워 수집 시나리오들이 함께 사용합니다."""
+        if self._server is None:
+            self._server = FakeEUtilsServer(self.corpus, self.args.papers, latency=self.args.latency,
+                                            error_rate=self.args.error_rate, seed=self.args.seed).start()
+        return self._server
+
+    def cleanup(self):
+        if self._server is not None:
+            self._server.stop()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+# 각 시나리오는 준비 함수를 받아 (측정할 함수, 처리 항목 수)를 돌려줍니다.
+# 준비 시간은 측정에 포함되지 않습니다.
+
+def scenario_parse(ctx: BenchmarkContext):
+    """efetch XML 파싱 (ElementTree + PubMedXMLParser.parse_article)"""
+    def run():
+        for chunk in ctx.chunks:
+            for article in ET.fromstring(chunk).iter('PubmedArticle'):
+                PubMedXMLParser.parse_article(article)
+    return run, len(ctx.papers)
+
+
+def scenario_categorize(ctx: BenchmarkContext):
+    """PaperCategorizer.categorize_paper"""
+    categorizer = PaperCategorizer()
+
+    def run():
+        for paper in ctx.papers:
+            categorizer.categorize_paper(paper['title'], paper['abstract'])
+    return run, len(ctx.papers)
+
+
+def scenario_add_paper(ctx: BenchmarkContext):
+    """DatabaseManager.add_paper 한 편씩 (빈 DB)"""
+    papers = ctx.papers[:ctx.args.write_papers]
+    db_manager = ctx.fresh_db()
+
+    def run():
+        for paper in papers:
+            db_manager.add_paper(dict(paper))
+    return run, len(papers)
+
+
+def scenario_add_papers(ctx: BenchmarkContext):
+    """DatabaseManager.add_papers 배치 저장 (빈 DB)"""
+    papers = ctx.papers[:ctx.args.write_papers]
+    db_manager = ctx.fresh_db()
+
+    def run():
+        db_manager.add_papers([dict(paper) for paper in papers])
+    return run, len(papers)
+
+
+def scenario_crawl(ctx: BenchmarkContext):
+    """PubMedCrawler.search_papers (대역 서버, 순차 검색·조회·파싱)"""
+    crawler = ctx.crawler(ctx.server())
+
+    def run():
+        crawler.search_papers()
+    return run, ctx.args.papers
+
+
+def scenario_pipeline(ctx: BenchmarkContext):
+    """IngestPipeline 전체 (대역 서버 → 빈 DB)"""
+    pipeline = IngestPipeline(ctx.crawler(ctx.server()), ctx.fresh_db())
+
+    def run():
+        pipeline.run(term='benchmark')
+    return run, ctx.args.papers
+
+
+def scenario_citations(ctx: BenchmarkContext):
+    """CitationGraph.enrich: elink 묶음 조회 + 간선 저장 + PageRank (대역 서버, 수집된 DB)"""
+    papers = ctx.papers[:ctx.args.write_papers]
+    db_manager = ctx.fresh_db()
+    db_manager.add_papers([dict(paper) for paper in papers])
+    graph = CitationGraph(ctx.crawler(ctx.server()), db_manager)
+
+    def run():
+        graph.enrich()
+    return run, len(papers)
+
+
+def scenario_get_all_papers(ctx: BenchmarkContext):
+    """DatabaseManager.get_all_papers (대용량 DB)"""
+    db_manager = DatabaseManager(ctx.read_db_path())
+
+    def run():
+        db_manager.get_all_papers()
+    return run, ctx.args.read_papers
+
+
+def scenario_viewer_filters(ctx: BenchmarkContext):
+    """뷰어 필터: 필터 조합마다 전체 개수와 첫 페이지 조회 (대용량 DB)"""
+    db_manager = DatabaseManager(ctx.read_db_path())
+
+    def run():
+        for filters in VIEWER_FILTERS.values():
+            db_manager.count_papers(filters)
+            db_manager.get_papers_page(filters, limit=100)
+    return run, len(VIEWER_FILTERS)
+
+
+def scenario_analyzer(ctx: BenchmarkContext):
+    """TrendAnalyzer 집계 (메모 캐시 없이, 대용량 DB)"""
+    db_manager = DatabaseManager(ctx.read_db_path())
+    # 트렌드 큐브·용어 스케치는 처음 한 번만 만들어지므로 측정 전에 준비
+    TrendAnalyzer(db_manager).analyze_category_trends()
+    TrendAnalyzer(db_manager).analyze_emerging_terms()
+
+    def run():
+        analyzer = TrendAnalyzer(db_manager)
+        analyzer.analyze_category_trends(12, 'month')
+        analyzer.analyze_category_trends(12, 'week')
+        analyzer.analyze_emerging_terms(12)
+        analyzer.analyze_year_distribution()
+        analyzer.analyze_top_journals()
+    return run, 5
+
+
+SCENARIOS: Dict[str, Callable] = {
+    'parse': scenario_parse,
+    'categorize': scenario_categorize,
+    'add_paper': scenario_add_paper,
+    'add_papers': scenario_add_papers,
+    'crawl': scenario_crawl,
+    'pipeline': scenario_pipeline,
+    'citations': scenario_citations,
+    'get_all_papers': scenario_get_all_papers,
+    'viewer_filters': scenario_viewer_filters,
+    'analyzer': scenario_analyzer,
+}
+
+
+def measure(ctx: BenchmarkContext, setup: Callable, repeat: int) -> Dict[str, Any]:
+    """준비 → 측정을 repeat회 반복하고 최솟값·중앙값과 처리량을 계산합니다."""
+    runs = []
+    items = 0
+    for _ in range(repeat):
+        run, items = setup(ctx)
+        started = time.perf_counter()
+        run()
+        runs.append(time.perf_counter() - started)
+    best = min(runs)
+    return {
+        'items': items,
+        'runs_seconds': [round(seconds, 4) for seconds in runs],
+        'min_seconds': round(best, 4),
+        'median_seconds': round(statistics.median(runs), 4),
+        'items_per_second': round(items / best, 1) if best else None,
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    """결과를 비교할 수 있도록 현재 커밋과 작업 트리 변경 여부를 기록합니다."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=project_root,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {'commit': commit, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+
+def print_comparison(results: Dict[str, Any], baseline_path: str):
+    """이전 결과 파일과 시나리오별 최솟값을 비교해 출력합니다."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\n기준: {baseline_path} ({((baseline.get('git') or {}).get('commit') or '?')[:10]})")
+    changed = [name for name, value in results['params'].items()
+               if name != 'scenarios' and baseline.get('params', {}).get(name) != value]
+    if changed:
+        print(f"주의: 측정 조건이 다릅니다 ({', '.join(changed)})")
+    for name, result in results['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        ratio = result['min_seconds'] / before['min_seconds'] if before['min_seconds'] else float('inf')
+        print(f"{name:>16}: {before['min_seconds']:.3f}s → {result['min_seconds']:.3f}s ({ratio:.2f}x)")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='종단간 벤치마크 모음')
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"실행할 시나리오 (기본: 전체) — {', '.join(SCENARIOS)}")
+    parser.add_argument('--papers', type=int, default=2000, help='합성 코퍼스 논문 수 (파싱·분류·수집)')
+    parser.add_argument('--write-papers', type=int, default=500, help='저장 시나리오에서 저장할 논문 수')
+    parser.add_argument('--read-papers', type=int, default=20000, help='조회·분석용 합성 DB 논문 수')
+    parser.add_argument('--read-db', help='조회·분석용 DB 경로 (없으면 생성, 지정하지 않으면 임시 DB)')
+    parser.add_argument('--repeat', type=int, default=3, help='시나리오별 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--vocab', type=int, default=20000, help='합성 코퍼스 어휘 크기')
+    parser.add_argument('--latency', type=float, default=0.05, help='대역 서버 응답 지연(초)')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='대역 서버 429 응답 비율')
+    parser.add_argument('--rate-limit', action='store_true', help='크롤러의 E-utilities 요청 속도 제한 적용')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/data/results/<시각>-<커밋>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+    print(f"합성 코퍼스 준비 중: {args.papers}편")
+    ctx = BenchmarkContext(args)
+    results = {
+        'benchmark': 'end_to_end',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {name: value for name, value in vars(args).items() if name not in ('output', 'compare')},
+        'scenarios': {},
+    }
+    try:
+        for name in names:
+            result = measure(ctx, SCENARIOS[name], args.repeat)
+            results['scenarios'][name] = result
+            print(f"{name:>16}: {result['min_seconds']:.3f}s (중앙값 {result['median_seconds']:.3f}s), "
+                  f"{result['items_per_second']}/s × {result['items']}")
+    finally:
+        ctx.cleanup()
+
+    output = args.output or os.path.join(
+        project_root, 'benchmarks', 'data', 'results',
+        f"{datetime.now():%Y%m%d-%H%M%S}-{(results['git']['commit'] or 'nogit')[:10]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+뷰어 시작 지연 벤치마크
+합성 대용량 DB에서 기존 방식(전체 논문 로드 후 통계 계산)과
+집계 쿼리 + 첫 페이지 조회 방식의 시작 시간을 비교
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import insert
+
+from scripts.database import Paper, Author, PaperAuthor, Category, paper_categories, init_db
+from scripts.db_manager import DatabaseManager
+
+CATEGORIES = ['clinical_study', 'neuroscience', 'biomarker', 'ai_ml', 'imaging', 'cognitive_assessment']
+WORDS = ('amyloid tau cognition memory hippocampus plasma biomarker cohort decline dementia '
+         'mri pet eeg network learning model trial intervention risk progression impairment').split()
+BATCH_SIZE = 5000
+
+
+def build_synthetic_db(db_path: str, papers: int, seed: int = 0):
+    """논문·저자·카테고리를 무작위로 채운 합성 DB를 만듭니다."""
+    rng = random.Random(seed)
+    engine = init_db(db_path)
+    journals = [f"Journal of Synthetic Research {i}" for i in range(200)]
+    start_day = date(2015, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{'id': i, 'name': name} for i, name in enumerate(CATEGORIES, 1)])
+        conn.execute(insert(Author), [{'id': i, 'name': f"Author {i}"} for i in range(1, papers // 2 + 2)])
+
+    for offset in range(0, papers, BATCH_SIZE):
+        ids = range(offset + 1, min(offset + BATCH_SIZE, papers) + 1)
+        paper_rows, author_rows, category_rows = [], [], []
+        for paper_id in ids:
+            paper_rows.append({
+                'id': paper_id,
+                'pmid': str(30000000 + paper_id),
+                'title': ' '.join(rng.choices(WORDS, k=10)).capitalize(),
+                'abstract': ' '.join(rng.choices(WORDS, k=180)),
+                'journal_name': rng.choice(journals),
+                'journal_volume': str(rng.randint(1, 60)),
+                'journal_issue': str(rng.randint(1, 12)),
+                'publication_year': str(rng.randint(2015, 2025)),
+                'created_date': start_day + timedelta(days=paper_id * 3650 // papers),
+            })
+            for order, author_id in enumerate(rng.sample(range(1, papers // 2 + 2), 4), 1):
+                author_rows.append({'paper_id': paper_id, 'author_id': author_id, 'author_order': order})
+            for category_id in rng.sample(range(1, len(CATEGORIES) + 1), rng.randint(1, 3)):
+                category_rows.append({'paper_id': paper_id, 'category_id': category_id})
+        with engine.begin() as conn:
+            conn.execute(insert(Paper), paper_rows)
+            conn.execute(insert(PaperAuthor), author_rows)
+            conn.execute(insert(paper_categories), category_rows)
+    engine.dispose()
+
+
+def legacy_startup(db_path: str) -> dict:
+    """예전 뷰어처럼 전체 논문을 불러온 뒤 통계를 여러 번 순회하여 계산합니다."""
+    timings = {}
+    started = time.perf_counter()
+    db_manager = DatabaseManager(db_path)
+    timings['open'] = time.perf_counter() - started
+
+    papers = db_manager.get_all_papers()
+    timings['load_all'] = time.perf_counter() - started
+
+    journals = set(paper.journal_name for paper in papers if paper.journal_name)
+    years = set(paper.publication_year for paper in papers if paper.publication_year)
+    categories = set()
+    for paper in papers:
+        categories.update(cat.name for cat in paper.categories)
+    timings['stats'] = time.perf_counter() - started
+    timings['first_page'] = timings['stats']
+    return timings
+
+
+def paged_startup(db_path: str) -> dict:
+    """집계 쿼리로 통계를 구하고 첫 페이지만 조회합니다."""
+    timings = {}
+    started = time.perf_counter()
+    db_manager = DatabaseManager(db_path)
+    timings['open'] = time.perf_counter() - started
+
+    db_manager.get_corpus_stats()
+    timings['stats'] = time.perf_counter() - started
+
+    db_manager.get_papers_page(limit=100)
+    timings['first_page'] = time.perf_counter() - started
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='뷰어 시작 지연 벤치마크')
+    parser.add_argument('--db', default='benchmarks/data/startup.db', help='합성 DB 경로 (없으면 생성)')
+    parser.add_argument('--papers', type=int, default=100000, help='합성 DB 논문 수')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값을 보고)')
+    parser.add_argument('--skip-legacy', action='store_true', help='전체 로드 방식 측정 생략')
+    parser.add_argument('--json', help='결과를 JSON으로 저장할 경로')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+        print(f"합성 DB 생성 중: {args.papers}편 → {args.db}")
+        started = time.perf_counter()
+        build_synthetic_db(args.db, args.papers)
+        print(f"생성 완료 ({time.perf_counter() - started:.1f}초)")
+
+    scenarios = {'paged': paged_startup}
+    if not args.skip_legacy:
+        scenarios['legacy'] = legacy_startup
+
+    results = {}
+    for name, scenario in scenarios.items():
+        runs = [scenario(args.db) for _ in range(args.repeat)]
+        results[name] = {key: min(run[key] for run in runs) for key in runs[0]}
+        timing_text = ', '.join(f"{key}={value * 1000:.0f}ms" for key, value in results[name].items())
+        print(f"{name:>8}: {timing_text}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': 'startup_latency', 'db': args.db, 'repeat': args.repeat,
+                       'results_seconds': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
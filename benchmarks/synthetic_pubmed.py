@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+합성 PubMed XML 생성기
+efetch 응답과 같은 구조(저자·소속, 구조화 초록, MeSH, 저널·출판일)의 논문을 재현 가능하게 생성
+초록에는 category_rules.yaml 키워드를 섞어 분류기가 실제와 비슷한 비율로 카테고리를 찾도록 함
+"""
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+from xml.sax.saxutils import escape
+
+import yaml
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+FIRST_PMID = 40000000
+ABSTRACT_LABELS = ['BACKGROUND', 'OBJECTIVE', 'METHODS', 'RESULTS', 'CONCLUSIONS']
+MESH_TERMS = [
+    'Cognitive Dysfunction', 'Alzheimer Disease', 'Dementia', 'Aged', 'Humans', 'Female', 'Male',
+    'Neuropsychological Tests', 'Magnetic Resonance Imaging', 'Positron-Emission Tomography',
+    'Biomarkers', 'Amyloid beta-Peptides', 'tau Proteins', 'Hippocampus', 'Disease Progression',
+    'Machine Learning', 'Cohort Studies', 'Risk Factors', 'Memory Disorders', 'Electroencephalography',
+]
+MESH_QUALIFIERS = ['diagnosis', 'diagnostic imaging', 'epidemiology', 'metabolism', 'physiopathology', 'therapy']
+PUBLICATION_TYPES = [('D016428', 'Journal Article'), ('D016454', 'Review'),
+                     ('D016449', 'Randomized Controlled Trial'), ('D017418', 'Meta-Analysis')]
+LAST_NAMES = ['Kim', 'Lee', 'Park', 'Tanaka', 'Suzuki', 'Smith', 'Garcia', 'Müller', 'Rossi', 'Wang',
+              'Chen', 'Nguyen', 'Johnson', 'Silva', 'Dubois', 'Kowalski', 'Ivanova', 'Sato', 'Jones', 'Li']
+FIRST_NAMES = ['Min', 'Yuki', 'Anna', 'John', 'Maria', 'Wei', 'Hiroshi', 'Sara', 'David', 'Jin',
+               'Elena', 'Paul', 'Lucia', 'Tom', 'Mei', 'Ali', 'Nora', 'Ken', 'Ines', 'Omar']
+
+
+def load_category_keywords() -> List[str]:
+    """분류 규칙의 키워드를 모두 읽어옵니다."""
+    with open(project_root / 'config' / 'category_rules.yaml', 'r', encoding='utf-8') as f:
+        rules = yaml.safe_load(f)
+    return [keyword for data in rules['categories'].values() for keyword in data['keywords']]
+
+
+class SyntheticCorpus:
+    """
+    시드가 같으면 PMID마다 항상 같은 논문을 생성합니다.
+    일반 단어는 Zipf 분포로 뽑아 실제 초록처럼 소수의 단어가 자주 나오게 합니다.
+    """
+
+    def __init__(self, seed: int = 0, vocab_size: int = 20000, journals: int = 300,
+                 authors: int = 50000, keyword_rate: float = 0.03):
+        self.seed = seed
+        rng = random.Random(seed)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        self.vocab = [''.join(rng.choices(letters, k=rng.randint(3, 11))) for _ in range(vocab_size)]
+        self.weights = [1.0 / rank for rank in range(1, vocab_size + 1)]
+        self.keywords = load_category_keywords()
+        self.keyword_rate = keyword_rate
+        self.journals = [f"Journal of {rng.choice(self.vocab).capitalize()} Research {i}" for i in range(journals)]
+        self.author_count = authors
+
+    def article(self, pmid: int) -> Dict:
+        """PMID 하나에 해당하는 논문 필드를 생성합니다."""
+        rng = random.Random(self.seed * 1000003 + pmid)
+        sections = [self._sentences(rng, rng.randint(2, 4)) for _ in ABSTRACT_LABELS]
+        # 소수의 저자가 많은 논문에 등장하도록 파레토 분포로 뽑되, 한 논문 안에서는 중복 없이
+        author_ids = []
+        for _ in range(rng.randint(1, 12)):
+            author_id = int(rng.paretovariate(1.2) * 10) % self.author_count
+            if author_id not in author_ids:
+                author_ids.append(author_id)
+        authors = []
+        for author_id in author_ids:
+            authors.append((LAST_NAMES[author_id % len(LAST_NAMES)] + str(author_id // len(LAST_NAMES)),
+                            FIRST_NAMES[(author_id * 7) % len(FIRST_NAMES)],
+                            f"Department {author_id % 40}, University {author_id % 900}"))
+        return {
+            'pmid': str(pmid),
+            'title': self._words(rng, rng.randint(8, 18)).capitalize(),
+            'sections': list(zip(ABSTRACT_LABELS, sections)),
+            'authors': authors,
+            'journal': rng.choice(self.journals),
+            'volume': str(rng.randint(1, 80)),
+            'issue': str(rng.randint(1, 12)),
+            'year': str(rng.randint(2000, 2025)),
+            'month': rng.randint(1, 12),
+            'day': rng.randint(1, 28),
+            'mesh': rng.sample(MESH_TERMS, rng.randint(3, 10)),
+            'qualifiers': rng.sample(MESH_QUALIFIERS, rng.randint(0, 2)),
+            'publication_type': rng.choices(PUBLICATION_TYPES, weights=[80, 12, 6, 2])[0],
+            'entry_delay_days': rng.randint(0, 60),
+        }
+
+    def references(self, pmid: int) -> List[int]:
+        """
+        논문이 인용하는 PMID 목록. 앞선(번호가 작은) 논문을 인용하되 오래된 논문일수록 더 자주 인용되어
+        피인용 수가 치우친 분포가 되게 하고, 일부는 말뭉치 밖의 PMID를 인용합니다.
+        """
+        rng = random.Random(self.seed * 7919 + pmid * 31 + 1)
+        earlier = pmid - FIRST_PMID
+        refs = set()
+        for _ in range(rng.randint(5, 40)):
+            if earlier and rng.random() < 0.7:
+                refs.add(FIRST_PMID + int(earlier * rng.random() ** 2))
+            else:
+                refs.add(rng.randint(10000000, FIRST_PMID - 1))
+        return sorted(refs)
+
+    def _words(self, rng: random.Random, count: int) -> str:
+        words = rng.choices(self.vocab, weights=self.weights, k=count)
+        for i in range(count):
+            if rng.random() < self.keyword_rate:
+                words[i] = rng.choice(self.keywords)
+        return ' '.join(words)
+
+    def _sentences(self, rng: random.Random, count: int) -> str:
+        return ' '.join(self._words(rng, rng.randint(12, 30)).capitalize() + '.' for _ in range(count))
+
+    def article_xml(self, pmid: int) -> str:
+        """efetch 응답의 PubmedArticle 요소 하나를 만듭니다."""
+        a = self.article(pmid)
+        authors = ''.join(
+            f"<Author ValidYN=\"Y\"><LastName>{escape(last)}</LastName><ForeName>{escape(first)}</ForeName>"
+            f"<Initials>{first[0]}</Initials><AffiliationInfo><Affiliation>{escape(affiliation)}</Affiliation>"
+            f"</AffiliationInfo></Author>"
+            for last, first, affiliation in a['authors']
+        )
+        abstract = ''.join(f"<AbstractText Label=\"{label}\" NlmCategory=\"{label}\">{escape(text)}</AbstractText>"
+                           for label, text in a['sections'])
+        # 첫 기술어만 주요 주제로 두고 세부 표목을 붙임
+        mesh = ''.join(
+            f"<MeshHeading><DescriptorName UI=\"D{MESH_TERMS.index(term):06d}\" MajorTopicYN=\"{'Y' if i == 0 else 'N'}\">"
+            f"{escape(term)}</DescriptorName>"
+            + (''.join(f"<QualifierName MajorTopicYN=\"N\">{escape(q)}</QualifierName>" for q in a['qualifiers'])
+               if i == 0 else '')
+            + "</MeshHeading>"
+            for i, term in enumerate(a['mesh'])
+        )
+        type_ui, type_name = a['publication_type']
+        published = date(int(a['year']), a['month'], a['day'])
+        entered = published + timedelta(days=a['entry_delay_days'])
+        return (
+            f"<PubmedArticle><MedlineCitation Status=\"MEDLINE\" Owner=\"NLM\"><PMID Version=\"1\">{a['pmid']}</PMID>"
+            f"<Article PubModel=\"Print-Electronic\"><Journal><JournalIssue CitedMedium=\"Internet\">"
+            f"<Volume>{a['volume']}</Volume><Issue>{a['issue']}</Issue>"
+            f"<PubDate><Year>{a['year']}</Year><Month>{a['month']:02d}</Month><Day>{a['day']:02d}</Day></PubDate>"
+            f"</JournalIssue><Title>{escape(a['journal'])}</Title></Journal>"
+            f"<ArticleTitle>{escape(a['title'])}</ArticleTitle><Abstract>{abstract}</Abstract>"
+            f"<AuthorList CompleteYN=\"Y\">{authors}</AuthorList><Language>eng</Language>"
+            f"<PublicationTypeList><PublicationType UI=\"{type_ui}\">{type_name}</PublicationType></PublicationTypeList>"
+            f"<ELocationID EIdType=\"doi\" ValidYN=\"Y\">10.5555/synth.{a['pmid']}</ELocationID></Article>"
+            f"<MeshHeadingList>{mesh}</MeshHeadingList></MedlineCitation>"
+            f"<PubmedData><History><PubMedPubDate PubStatus=\"entrez\"><Year>{entered.year}</Year>"
+            f"<Month>{entered.month}</Month><Day>{entered.day}</Day></PubMedPubDate></History>"
+            f"<PublicationStatus>ppublish</PublicationStatus>"
+            f"<ArticleIdList><ArticleId IdType=\"pubmed\">{a['pmid']}</ArticleId>"
+            f"<ArticleId IdType=\"doi\">10.5555/synth.{a['pmid']}</ArticleId></ArticleIdList></PubmedData></PubmedArticle>"
+        )
+
+    def articleset_xml(self, pmids: Iterable[int]) -> str:
+        """efetch 응답 전체(PubmedArticleSet)를 만듭니다."""
+        return '<?xml version="1.0" ?><PubmedArticleSet>' + \
+            ''.join(self.article_xml(int(pmid)) for pmid in pmids) + '</PubmedArticleSet>'
+
+    def iter_chunks(self, count: int, chunk_size: int = 200) -> Iterator[str]:
+        """count편을 chunk_size편씩 efetch 응답 형태로 내보냅니다."""
+        for start in range(0, count, chunk_size):
+            yield self.articleset_xml(range(FIRST_PMID + start, FIRST_PMID + min(start + chunk_size, count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 PubMed XML 생성')
+    parser.add_argument('--papers', type=int, default=1000, help='생성할 논문 수')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--vocab', type=int, default=20000, help='일반 단어 어휘 크기')
+    parser.add_argument('--output', default='benchmarks/data/synthetic_pubmed.xml', help='출력 XML 경로')
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(seed=args.seed, vocab_size=args.vocab)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(corpus.articleset_xml(range(FIRST_PMID, FIRST_PMID + args.papers)))
+    print(f"{args.papers}편 생성 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,22 @@
 """
 MCI 논문 데이터베이스 콘솔 뷰어
 데이터베이스의 논문들을 콘솔에서 확인
+
+인자 없이 실행하면 대화형 메뉴를, 하위 명령을 주면 결과를 표준 출력으로 스트리밍합니다.
+    python console_viewer.py search "plasma p-tau217" --format csv
+    python console_viewer.py list --category biomarker --since 2025-01-01 > biomarker.jsonl
+    python console_viewer.py list --topic parkinson_cognition --format csv
+    python console_viewer.py list --sort rank --limit 50 --no-abstract
+    python console_viewer.py list --mesh "Cognitive Dysfunction" --publication-type "Randomized Controlled Trial"
+    python console_viewer.py stats
+    python console_viewer.py --profile list --category biomarker > /dev/null
 """
+import argparse
+import csv
+import json
+import os
 import sys
+from datetime import date
 from pathlib import Path
 
 # 프로젝트 루트 디렉토리를 Python path에 추가
@@ -12,105 +26,260 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from scripts.db_manager import DatabaseManager
+from scripts.blog_generator import CATEGORY_DISPLAY
+from scripts.profiling import profile_session, split_profile_arguments
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 목록을 가져오는 페이지 크기
+PAGE_SIZE = 50
 
 def display_paper(paper, index):
-    """논문 정보를 보기 좋게 출력합니다."""
+    """논문 정보를 보기 좋게 출력합니다. paper는 DatabaseManager.get_paper_by_pmid의 결과입니다."""
+    journal = paper['journal']
     print(f"\n{'='*80}")
     print(f"📋 논문 {index + 1}")
     print(f"{'='*80}")
-    print(f"📋 제목: {paper.title}")
-    print(f"🔗 PMID: {paper.pmid}")
-    print(f"📖 저널: {paper.journal_name}")
+    print(f"📋 제목: {paper['title']}")
+    print(f"🔗 PMID: {paper['pmid']}")
+    print(f"📖 저널: {journal['name']}")
     
-    if paper.journal_volume:
-        print(f"📄 Volume: {paper.journal_volume}")
-    if paper.journal_issue:
-        print(f"📄 Issue: {paper.journal_issue}")
+    if journal['volume']:
+        print(f"📄 Volume: {journal['volume']}")
+    if journal['issue']:
+        print(f"📄 Issue: {journal['issue']}")
     
-    print(f"📅 발행연도: {paper.publication_year}")
+    print(f"📅 발행연도: {journal['year']}")
+    if paper.get('publication_date'):
+        print(f"📅 발행일: {paper['publication_date']}")
+    if paper.get('doi'):
+        print(f"🔗 DOI: https://doi.org/{paper['doi']}")
+    if paper.get('publication_types'):
+        print(f"📑 유형: {', '.join(paper['publication_types'])}")
     
     # 저자 정보
-    if paper.authors:
-        authors = [author.name for author in paper.authors]
+    authors = paper['authors']
+    if authors:
         print(f"👥 저자: {', '.join(authors[:3])}")
         if len(authors) > 3:
             print(f"      (외 {len(authors)-3}명)")
+    if paper.get('affiliations'):
+        print(f"🏛️ 소속: {paper['affiliations'][0]}")
+        if len(paper['affiliations']) > 1:
+            print(f"      (외 {len(paper['affiliations'])-1}곳)")
     
     # 카테고리 정보
-    if paper.categories:
-        category_names = [cat.name for cat in paper.categories]
-        category_display = {
-            'clinical_study': '🏥 임상연구',
-            'neuroscience': '🧬 신경과학',
-            'biomarker': '🔬 바이오마커',
-            'ai_ml': '🤖 AI/머신러닝',
-            'imaging': '📸 이미징',
-            'cognitive_assessment': '🧪 인지평가'
-        }
-        display_categories = [category_display.get(cat, cat) for cat in category_names]
+    if paper['categories']:
+        display_categories = [CATEGORY_DISPLAY.get(cat, cat) for cat in paper['categories']]
         print(f"🏷️ 카테고리: {', '.join(display_categories)}")
     
+    # MeSH 주제어 (주요 주제는 * 표시)
+    if paper.get('mesh_terms'):
+        print(f"🔖 MeSH: {', '.join(term['descriptor'] + ('*' if term['major'] else '') for term in paper['mesh_terms'])}")
+    
     # 초록
-    if paper.abstract:
+    if paper['abstract']:
         print(f"\n📝 초록:")
         print("-" * 60)
         # 초록을 80자씩 줄바꿈
-        abstract = paper.abstract
+        abstract = paper['abstract']
         for i in range(0, len(abstract), 80):
             print(abstract[i:i+80])
     
-    print(f"\n🔗 PubMed 링크: https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/")
+    print(f"\n🔗 PubMed 링크: https://pubmed.ncbi.nlm.nih.gov/{paper['pmid']}/")
+
+def wait_with_progress(future, message):
+    """백그라운드 작업이 끝날 때까지 스피너를 표시하고 결과를 반환합니다."""
+    spinner = itertools.cycle('|/-\\')
+    started = time.perf_counter()
+    while not future.done():
+        print(f"\r{message} {next(spinner)}", end='', flush=True)
+        time.sleep(0.1)
+    print(f"\r{message} 완료 ({time.perf_counter() - started:.1f}초)")
+    return future.result()
+
+def iter_papers(db_manager, filters=None, first_page=None):
+    """
+    keyset 페이지를 차례로 가져오며 논문 행을 하나씩 내보냅니다.
+    현재 페이지를 보여주는 동안 다음 페이지를 백그라운드에서 미리 조회합니다.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = first_page if first_page is not None else db_manager.get_papers_page(filters, limit=PAGE_SIZE)
+        while page:
+            next_page = None
+            if len(page) == PAGE_SIZE:
+                next_page = executor.submit(db_manager.get_papers_page, filters,
+                                            after=page[-1]['key'], limit=PAGE_SIZE)
+            yield from page
+            page = next_page.result() if next_page is not None else []
+
+def show_papers(db_manager, rows, pause_every):
+    """논문 행을 상세 정보와 함께 출력하고 pause_every편마다 계속 볼지 묻습니다."""
+    for i, row in enumerate(rows):
+        paper = db_manager.get_paper_by_pmid(row['pmid'])
+        if paper is None:
+            continue
+        display_paper(paper, i)
+        if (i + 1) % pause_every == 0:
+            response = input(f"\n계속 보시겠습니까? (y/n): ").strip().lower()
+            if response != 'y':
+                break
 
-def main():
+def corpus_stats(db_manager):
+    """말뭉치 스냅샷(memmap)에서 통계를 읽고, 스냅샷을 쓸 수 없으면 집계 쿼리로 계산합니다."""
+    if db_manager.corpus_snapshot.load(db_manager):
+        return db_manager.corpus_snapshot.stats()
+    return db_manager.get_corpus_stats()
+
+def load_viewer_data(db_path):
+    """DB를 열고 통계를 계산합니다. 논문 본문은 불러오지 않습니다."""
+    db_manager = DatabaseManager(db_path)
+    return db_manager, corpus_stats(db_manager)
+
+def write_records(records, output_format, out, limit=None):
+    """레코드를 JSON Lines, CSV 또는 TSV로 한 줄씩 출력하고 출력한 개수를 반환합니다."""
+    writer = None
+    count = 0
+    for record in records:
+        if limit is not None and count >= limit:
+            break
+        if output_format == 'jsonl':
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(record), lineterminator='\n',
+                                        delimiter='\t' if output_format == 'tsv' else ',')
+                writer.writeheader()
+            writer.writerow(record)
+        count += 1
+    out.flush()
+    return count
+
+def stats_records(stats):
+    """통계를 출력 형식에 맞는 레코드로 바꿉니다. CSV/TSV에서는 metric,value 행으로 펼칩니다."""
+    rows = [
+        {'metric': 'total_papers', 'value': stats['total_papers']},
+        {'metric': 'journal_count', 'value': stats['journal_count']},
+        {'metric': 'min_year', 'value': stats['min_year']},
+        {'metric': 'max_year', 'value': stats['max_year']},
+    ]
+    for category, count in sorted(stats['category_counts'].items()):
+        rows.append({'metric': f"category:{category}", 'value': count})
+    for topic, count in sorted(stats.get('topic_counts', {}).items()):
+        rows.append({'metric': f"topic:{topic}", 'value': count})
+    return rows
+
+def build_parser():
+    """비대화형 하위 명령 파서를 만듭니다."""
+    parser = argparse.ArgumentParser(description='MCI 논문 데이터베이스 조회·내보내기 (인자 없이 실행하면 대화형 모드)')
+    parser.add_argument('--db', default='data/mci_papers.db', help='데이터베이스 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--format', choices=['jsonl', 'csv', 'tsv'], default='jsonl', help='출력 형식')
+    
+    records = argparse.ArgumentParser(add_help=False, parents=[output])
+    records.add_argument('--category', help='카테고리 이름으로 필터')
+    records.add_argument('--topic', help='수집 주제 key로 필터 (config.yaml의 topics)')
+    records.add_argument('--year', help='발행연도로 필터')
+    records.add_argument('--mesh', help='MeSH 기술어(예: "Cognitive Dysfunction")로 필터')
+    records.add_argument('--publication-type', help='논문 유형(예: "Randomized Controlled Trial")으로 필터')
+    records.add_argument('--affiliation', help='저자 소속에 이 문자열이 포함된 논문만')
+    records.add_argument('--doi', help='DOI로 필터')
+    records.add_argument('--published-since', type=date.fromisoformat, help='이 날짜(YYYY-MM-DD) 이후 발행된 논문만')
+    records.add_argument('--published-until', type=date.fromisoformat, help='이 날짜(YYYY-MM-DD)까지 발행된 논문만')
+    records.add_argument('--sort', choices=['id', 'rank', 'citations'], default='id',
+                         help='정렬: 수집순, 인용 PageRank순, 피인용 수순 (rank·citations는 pagerank·cited_by 열 추가)')
+    records.add_argument('--limit', type=int, help='최대 출력 개수')
+    records.add_argument('--no-abstract', action='store_true', help='초록 열 제외')
+    records.add_argument('--batch-size', type=int, default=1000, help='DB 커서에서 한 번에 읽을 행 수')
+    
+    search_parser = subparsers.add_parser('search', parents=[records], help='제목·초록 전문 검색')
+    search_parser.add_argument('query', nargs='+', help='검색어')
+    
+    list_parser = subparsers.add_parser('list', parents=[records], help='필터 조건에 맞는 논문 목록')
+    list_parser.add_argument('--since', type=date.fromisoformat, help='이 날짜(YYYY-MM-DD) 이후 수집된 논문만')
+    
+    subparsers.add_parser('stats', parents=[output], help='말뭉치 통계')
+    return parser
+
+def run_command(args):
+    """하위 명령을 실행하여 결과를 표준 출력으로 스트리밍합니다."""
+    db_manager = DatabaseManager(args.db)
+    
+    if args.command == 'stats':
+        stats = corpus_stats(db_manager)
+        if args.format == 'jsonl':
+            write_records([stats], 'jsonl', sys.stdout)
+        else:
+            write_records(stats_records(stats), args.format, sys.stdout)
+        return
+    
+    filters = {'category': args.category, 'topic': args.topic, 'year': args.year, 'mesh': args.mesh,
+               'publication_type': args.publication_type, 'affiliation': args.affiliation, 'doi': args.doi,
+               'published_since': args.published_since, 'published_until': args.published_until}
+    if args.command == 'search':
+        filters['search'] = ' '.join(args.query)
+    else:
+        filters['since'] = args.since
+    
+    records = db_manager.iter_paper_records(filters, batch_size=args.batch_size,
+                                            include_abstract=not args.no_abstract, order=args.sort)
+    try:
+        write_records(records, args.format, sys.stdout, args.limit)
+    finally:
+        records.close()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # --profile은 대화형·하위 명령 모두에 쓸 수 있도록 먼저 분리
+    profile_options, argv = split_profile_arguments(argv)
+    with profile_session(profile_options, 'console_viewer'):
+        if argv:
+            try:
+                run_command(build_parser().parse_args(argv))
+            except BrokenPipeError:
+                # head 등으로 파이프가 먼저 닫힌 경우 남은 출력을 버리고 조용히 종료
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, sys.stdout.fileno())
+                sys.exit(1)
+            return
+        interactive_main()
+
+def interactive_main():
     print("🧠 MCI 논문 데이터베이스 콘솔 뷰어")
     print("=" * 50)
     
+    executor = ThreadPoolExecutor(max_workers=1)
     try:
-        # 데이터베이스 연결
-        db_manager = DatabaseManager('data/mci_papers.db')
-        papers = db_manager.get_all_papers()
+        # 데이터베이스 연결과 통계 집계를 백그라운드에서 수행
+        db_manager, stats = wait_with_progress(executor.submit(load_viewer_data, 'data/mci_papers.db'),
+                                               "⏳ 데이터베이스 불러오는 중")
         
-        if not papers:
+        if not stats['total_papers']:
             print("❌ 데이터베이스에 논문이 없습니다.")
             return
         
+        # 통계를 보여주는 동안 첫 페이지를 미리 가져옴
+        first_page = executor.submit(db_manager.get_papers_page, limit=PAGE_SIZE)
+        
         # 통계 정보
         print(f"\n📊 통계 정보")
-        print(f"- 총 논문 수: {len(papers)}편")
-        
-        journals = set(paper.journal_name for paper in papers if paper.journal_name)
-        print(f"- 저널 수: {len(journals)}개")
-        
-        years = set(paper.publication_year for paper in papers if paper.publication_year)
-        if years:
-            print(f"- 연도 범위: {min(years)}-{max(years)}")
+        print(f"- 총 논문 수: {stats['total_papers']}편")
+        print(f"- 저널 수: {stats['journal_count']}개")
+        if stats['min_year']:
+            print(f"- 연도 범위: {stats['min_year']}-{stats['max_year']}")
         
-        categories = set()
-        for paper in papers:
-            if paper.categories:
-                categories.update(cat.name for cat in paper.categories)
-        print(f"- 카테고리 수: {len(categories)}개")
+        category_count = stats['category_counts']
+        print(f"- 카테고리 수: {len(category_count)}개")
         
         # 카테고리별 분포
-        if categories:
+        if category_count:
             print(f"\n🏷️ 카테고리별 논문 수:")
-            category_count = {}
-            for paper in papers:
-                if paper.categories:
-                    for cat in paper.categories:
-                        category_count[cat.name] = category_count.get(cat.name, 0) + 1
-            
-            category_display = {
-                'clinical_study': '🏥 임상연구',
-                'neuroscience': '🧬 신경과학',
-                'biomarker': '🔬 바이오마커',
-                'ai_ml': '🤖 AI/머신러닝',
-                'imaging': '📸 이미징',
-                'cognitive_assessment': '🧪 인지평가'
-            }
-            
             for category, count in sorted(category_count.items(), key=lambda x: x[1], reverse=True):
-                display_name = category_display.get(category, category)
+                display_name = CATEGORY_DISPLAY.get(category, category)
                 print(f"  - {display_name}: {count}편")
         
         # 사용자 선택
@@ -126,71 +295,51 @@ def main():
             
             if choice == '1':
                 print(f"\n📚 최신 논문 5편:")
-                recent_papers = papers[-5:]
-                for i, paper in enumerate(recent_papers):
+                recent_papers = wait_with_progress(first_page, "⏳ 논문 불러오는 중")[:5]
+                for i, row in enumerate(recent_papers):
+                    paper = db_manager.get_paper_by_pmid(row['pmid'])
+                    if paper is None:
+                        continue
                     display_paper(paper, i)
                     input("\n다음 논문을 보려면 Enter를 누르세요...")
             
             elif choice == '2':
-                print(f"\n📚 전체 논문 목록 ({len(papers)}편):")
-                for i, paper in enumerate(papers):
-                    display_paper(paper, i)
-                    if (i + 1) % 3 == 0:  # 3편마다 멈춤
-                        response = input(f"\n계속 보시겠습니까? (y/n): ").strip().lower()
-                        if response != 'y':
-                            break
+                print(f"\n📚 전체 논문 목록 ({stats['total_papers']}편):")
+                page = wait_with_progress(first_page, "⏳ 논문 불러오는 중")
+                show_papers(db_manager, iter_papers(db_manager, first_page=page), 3)  # 3편마다 멈춤
             
             elif choice == '3':
-                if not categories:
+                if not category_count:
                     print("❌ 카테고리 정보가 없습니다.")
                     continue
                 
                 print(f"\n🏷️ 카테고리 선택:")
-                category_list = sorted(list(categories))
+                category_list = sorted(category_count)
                 for i, cat in enumerate(category_list, 1):
-                    display_name = category_display.get(cat, cat)
-                    count = sum(1 for paper in papers 
-                              if paper.categories and any(c.name == cat for c in paper.categories))
-                    print(f"{i}. {display_name} ({count}편)")
+                    display_name = CATEGORY_DISPLAY.get(cat, cat)
+                    print(f"{i}. {display_name} ({category_count[cat]}편)")
                 
                 try:
                     cat_choice = int(input("카테고리 번호를 선택하세요: ")) - 1
                     if 0 <= cat_choice < len(category_list):
                         selected_category = category_list[cat_choice]
-                        filtered_papers = [paper for paper in papers 
-                                         if paper.categories and any(c.name == selected_category for c in paper.categories)]
-                        
-                        display_name = category_display.get(selected_category, selected_category)
-                        print(f"\n📚 {display_name} 카테고리 논문 ({len(filtered_papers)}편):")
-                        
-                        for i, paper in enumerate(filtered_papers):
-                            display_paper(paper, i)
-                            if (i + 1) % 2 == 0:  # 2편마다 멈춤
-                                response = input(f"\n계속 보시겠습니까? (y/n): ").strip().lower()
-                                if response != 'y':
-                                    break
+                        display_name = CATEGORY_DISPLAY.get(selected_category, selected_category)
+                        print(f"\n📚 {display_name} 카테고리 논문 ({category_count[selected_category]}편):")
+                        rows = iter_papers(db_manager, {'category': selected_category})
+                        show_papers(db_manager, rows, 2)  # 2편마다 멈춤
                     else:
                         print("❌ 잘못된 선택입니다.")
                 except ValueError:
                     print("❌ 숫자를 입력해주세요.")
             
             elif choice == '4':
-                search_term = input("검색어를 입력하세요: ").strip().lower()
+                search_term = input("검색어를 입력하세요: ").strip()
                 if search_term:
-                    matching_papers = []
-                    for paper in papers:
-                        if (search_term in paper.title.lower() if paper.title else False) or \
-                           (search_term in paper.abstract.lower() if paper.abstract else False):
-                            matching_papers.append(paper)
-                    
-                    if matching_papers:
-                        print(f"\n🔍 검색 결과: '{search_term}' ({len(matching_papers)}편)")
-                        for i, paper in enumerate(matching_papers):
-                            display_paper(paper, i)
-                            if (i + 1) % 2 == 0:  # 2편마다 멈춤
-                                response = input(f"\n계속 보시겠습니까? (y/n): ").strip().lower()
-                                if response != 'y':
-                                    break
+                    filters = {'search': search_term}
+                    match_count = db_manager.count_papers(filters)
+                    if match_count:
+                        print(f"\n🔍 검색 결과: '{search_term}' ({match_count}편)")
+                        show_papers(db_manager, iter_papers(db_manager, filters), 2)  # 2편마다 멈춤
                     else:
                         print(f"❌ '{search_term}'에 대한 검색 결과가 없습니다.")
             
@@ -205,6 +354,8 @@ def main():
         print(f"❌ 오류가 발생했습니다: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        executor.shutdown(wait=False)
 
 if __name__ == "__main__":
     main()
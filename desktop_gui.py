@@ -8,6 +8,10 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import webbrowser
 import sys
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # 프로젝트 루트 디렉토리를 Python path에 추가
@@ -15,6 +19,20 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from scripts.db_manager import DatabaseManager
+from scripts.blog_generator import CATEGORY_DISPLAY
+from scripts.profiling import add_profile_arguments, profile_session, timed
+
+# 목록 창에 한 번에 가져오는 행 수와 메모리에 유지하는 최대 행 수
+PAGE_SIZE = 100
+MAX_WINDOW_ROWS = 300
+
+# 검색 입력 디바운스 시간, 결과 확인 주기, 첫 페이지 결과 캐시 크기
+SEARCH_DEBOUNCE_MS = 300
+RESULT_POLL_MS = 30
+QUERY_CACHE_SIZE = 64
+
+# 정렬 가능한 열과 처음 클릭했을 때의 정렬 방향 (True: 내림차순)
+SORTABLE_COLUMNS = {'year': True, 'journal': False, 'categories': False, 'citations': True, 'rank': True}
 
 class MCIPapersGUI:
     def __init__(self, root):
@@ -22,17 +40,36 @@ class MCIPapersGUI:
         self.root.title("🧠 MCI 논문 데이터베이스")
         self.root.geometry("1200x800")
         
-        # 데이터베이스 연결
-        try:
-            self.db_manager = DatabaseManager('data/mci_papers.db')
-            self.papers = self.db_manager.get_all_papers()
-            self.filtered_papers = self.papers.copy()
-        except Exception as e:
-            messagebox.showerror("오류", f"데이터베이스 연결 실패: {str(e)}")
-            return
+        # 데이터베이스 연결은 창을 띄운 뒤 작업 스레드에서 수행
+        self.db_manager = None
+        
+        # 목록 창 상태: 현재 메모리에 있는 행과 양 끝 도달 여부
+        self.filters = {}
+        self.sort = 'id'
+        self.descending = True
+        self.rows = []
+        self.at_start = True
+        self.at_end = True
+        self.load_scheduled = False
+        self.similar_pmids = []
+        
+        # 패싯 콤보박스 항목 표시 문자열("값 (개수)") → 필터 값
+        self.facet_labels = {'category': {}, 'topic': {}, 'year': {}}
+        
+        # DB 조회는 작업 스레드에서 실행하고, 결과를 반영하는 콜백은 큐를 거쳐 메인 스레드에서 실행
+        self.query_executor = ThreadPoolExecutor(max_workers=1)
+        self.query_results = queue.Queue()
+        self.query_cache = OrderedDict()
+        self.query_generation = 0
+        self.pending_query = None
+        self.jobs_in_flight = 0
+        self.debounce_id = None
+        self.poll_id = None
         
         self.setup_ui()
-        self.refresh_papers_list()
+        self.facet_vars = {'category': self.category_var, 'topic': self.topic_var, 'year': self.year_var}
+        self.facet_combos = {'category': self.category_combo, 'topic': self.topic_combo, 'year': self.year_combo}
+        self.submit_job(self.load_database, 'data/mci_papers.db')
     
     def setup_ui(self):
         # 메인 프레임
@@ -47,18 +84,12 @@ class MCIPapersGUI:
         stats_frame = ttk.LabelFrame(main_frame, text="📊 통계 정보", padding="5")
         stats_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        total_papers = len(self.papers)
-        journals = set(paper.journal_name for paper in self.papers if paper.journal_name)
-        years = set(paper.publication_year for paper in self.papers if paper.publication_year)
-        categories = set()
-        for paper in self.papers:
-            if paper.categories:
-                categories.update(cat.name for cat in paper.categories)
-        
-        ttk.Label(stats_frame, text=f"총 논문 수: {total_papers}편").grid(row=0, column=0, padx=10)
-        ttk.Label(stats_frame, text=f"저널 수: {len(journals)}개").grid(row=0, column=1, padx=10)
-        ttk.Label(stats_frame, text=f"연도 범위: {min(years) if years else 'N/A'}-{max(years) if years else 'N/A'}").grid(row=0, column=2, padx=10)
-        ttk.Label(stats_frame, text=f"카테고리 수: {len(categories)}개").grid(row=0, column=3, padx=10)
+        # 통계는 DB 로드가 끝나면 채움
+        self.stats_labels = []
+        for column in range(4):
+            label = ttk.Label(stats_frame, text="불러오는 중...")
+            label.grid(row=0, column=column, padx=10)
+            self.stats_labels.append(label)
         
         # 필터 섹션
         filter_frame = ttk.LabelFrame(main_frame, text="🔍 필터 및 검색", padding="5")
@@ -68,48 +99,101 @@ class MCIPapersGUI:
         ttk.Label(filter_frame, text="카테고리:").grid(row=0, column=0, padx=(0, 5))
         self.category_var = tk.StringVar()
         category_combo = ttk.Combobox(filter_frame, textvariable=self.category_var, width=20)
-        category_options = ['전체'] + sorted(list(categories))
-        category_combo['values'] = category_options
+        category_combo['values'] = ['전체']
         category_combo.set('전체')
         category_combo.grid(row=0, column=1, padx=(0, 10))
         category_combo.bind('<<ComboboxSelected>>', self.filter_papers)
+        self.category_combo = category_combo
+        
+        # 주제 필터
+        ttk.Label(filter_frame, text="주제:").grid(row=0, column=2, padx=(0, 5))
+        self.topic_var = tk.StringVar()
+        topic_combo = ttk.Combobox(filter_frame, textvariable=self.topic_var, width=16)
+        topic_combo['values'] = ['전체']
+        topic_combo.set('전체')
+        topic_combo.grid(row=0, column=3, padx=(0, 10))
+        topic_combo.bind('<<ComboboxSelected>>', self.filter_papers)
+        self.topic_combo = topic_combo
         
         # 연도 필터
-        ttk.Label(filter_frame, text="연도:").grid(row=0, column=2, padx=(0, 5))
+        ttk.Label(filter_frame, text="연도:").grid(row=0, column=4, padx=(0, 5))
         self.year_var = tk.StringVar()
         year_combo = ttk.Combobox(filter_frame, textvariable=self.year_var, width=10)
-        year_options = ['전체'] + sorted(list(years), reverse=True)
-        year_combo['values'] = year_options
+        year_combo['values'] = ['전체']
         year_combo.set('전체')
-        year_combo.grid(row=0, column=3, padx=(0, 10))
+        year_combo.grid(row=0, column=5, padx=(0, 10))
         year_combo.bind('<<ComboboxSelected>>', self.filter_papers)
+        self.year_combo = year_combo
         
         # 검색
-        ttk.Label(filter_frame, text="검색:").grid(row=0, column=4, padx=(0, 5))
+        ttk.Label(filter_frame, text="검색:").grid(row=0, column=6, padx=(0, 5))
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=30)
-        search_entry.grid(row=0, column=5, padx=(0, 10))
-        search_entry.bind('<KeyRelease>', self.filter_papers)
+        search_entry.grid(row=0, column=7, padx=(0, 10))
+        search_entry.bind('<KeyRelease>', self.schedule_search)
         
         # 초기화 버튼
-        ttk.Button(filter_frame, text="초기화", command=self.reset_filters).grid(row=0, column=6)
+        ttk.Button(filter_frame, text="초기화", command=self.reset_filters).grid(row=0, column=8)
+        
+        # 논문 유형 필터 (둘째 줄)
+        ttk.Label(filter_frame, text="유형:").grid(row=1, column=0, padx=(0, 5), pady=(5, 0))
+        self.publication_type_var = tk.StringVar()
+        publication_type_combo = ttk.Combobox(filter_frame, textvariable=self.publication_type_var, width=20)
+        publication_type_combo['values'] = ['전체']
+        publication_type_combo.set('전체')
+        publication_type_combo.grid(row=1, column=1, padx=(0, 10), pady=(5, 0))
+        publication_type_combo.bind('<<ComboboxSelected>>', self.filter_papers)
+        self.publication_type_combo = publication_type_combo
+        
+        # MeSH 필터: 자주 쓰인 기술어를 고르거나 직접 입력 후 Enter
+        ttk.Label(filter_frame, text="MeSH:").grid(row=1, column=2, padx=(0, 5), pady=(5, 0))
+        self.mesh_var = tk.StringVar()
+        mesh_combo = ttk.Combobox(filter_frame, textvariable=self.mesh_var, width=30)
+        mesh_combo['values'] = ['전체']
+        mesh_combo.set('전체')
+        mesh_combo.grid(row=1, column=3, columnspan=3, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        mesh_combo.bind('<<ComboboxSelected>>', self.filter_papers)
+        mesh_combo.bind('<Return>', self.filter_papers)
+        self.mesh_combo = mesh_combo
         
         # 논문 목록 (왼쪽)
         list_frame = ttk.LabelFrame(main_frame, text="📚 논문 목록", padding="5")
         list_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 5))
         
-        # 리스트박스 with 스크롤바
-        listbox_frame = ttk.Frame(list_frame)
-        listbox_frame.pack(fill=tk.BOTH, expand=True)
-        
-        self.papers_listbox = tk.Listbox(listbox_frame, height=20, width=50)
-        scrollbar = ttk.Scrollbar(listbox_frame, orient=tk.VERTICAL, command=self.papers_listbox.yview)
-        self.papers_listbox.configure(yscrollcommand=scrollbar.set)
-        
-        self.papers_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.papers_listbox.bind('<<ListboxSelect>>', self.show_paper_details)
+        status_frame = ttk.Frame(list_frame)
+        status_frame.pack(fill=tk.X)
+        self.count_label = ttk.Label(status_frame, text="")
+        self.count_label.pack(side=tk.LEFT)
+        self.count_text = ""
+        
+        # 작업 스레드에서 조회 중일 때만 움직이는 진행 표시줄
+        self.progress_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self.progress_bar.pack(side=tk.RIGHT)
+        
+        # 트리뷰 with 스크롤바: 스크롤 위치에 따라 페이지 단위로 행을 가져오고 버림
+        tree_frame = ttk.Frame(list_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ('year', 'journal', 'categories', 'citations', 'rank', 'title')
+        self.papers_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20,
+                                        selectmode='browse')
+        self.column_titles = {'year': '연도', 'journal': '저널', 'categories': '카테고리', 'citations': '피인용',
+                              'rank': 'PageRank', 'title': '제목'}
+        for column, width in zip(columns, (50, 120, 140, 50, 70, 300)):
+            self.papers_tree.column(column, width=width, stretch=(column == 'title'))
+            if column in SORTABLE_COLUMNS:
+                self.papers_tree.heading(column, text=self.column_titles[column],
+                                         command=lambda c=column: self.sort_by(c))
+            else:
+                self.papers_tree.heading(column, text=self.column_titles[column])
+        
+        self.tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.papers_tree.yview)
+        self.papers_tree.configure(yscrollcommand=self.on_tree_scroll)
+        
+        self.papers_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.papers_tree.bind('<<TreeviewSelect>>', self.show_paper_details)
         
         # 논문 상세 정보 (오른쪽)
         detail_frame = ttk.LabelFrame(main_frame, text="📖 논문 상세 정보", padding="5")
@@ -118,6 +202,13 @@ class MCIPapersGUI:
         self.detail_text = scrolledtext.ScrolledText(detail_frame, height=20, width=70, wrap=tk.WORD)
         self.detail_text.pack(fill=tk.BOTH, expand=True)
         
+        # 유사 논문 목록
+        similar_frame = ttk.LabelFrame(detail_frame, text="🔗 유사 논문", padding="5")
+        similar_frame.pack(fill=tk.X, pady=(10, 0))
+        self.similar_listbox = tk.Listbox(similar_frame, height=6)
+        self.similar_listbox.pack(fill=tk.X)
+        self.similar_listbox.bind('<Double-Button-1>', self.open_similar_paper)
+        
         # PubMed 링크 버튼
         self.pubmed_button = ttk.Button(detail_frame, text="🔗 PubMed에서 보기", command=self.open_pubmed)
         self.pubmed_button.pack(pady=(10, 0))
@@ -129,108 +220,385 @@ class MCIPapersGUI:
         main_frame.columnconfigure(1, weight=1)
         main_frame.rowconfigure(3, weight=1)
     
-    def refresh_papers_list(self):
-        """논문 목록을 새로고침합니다."""
-        self.papers_listbox.delete(0, tk.END)
-        
-        for i, paper in enumerate(self.filtered_papers):
-            display_text = f"[{paper.publication_year}] {paper.title[:80]}..."
-            self.papers_listbox.insert(tk.END, display_text)
+    def submit_job(self, function, *args):
+        """
+        함수를 작업 스레드에서 실행합니다. 함수가 콜백을 반환하면 메인 스레드에서 실행합니다.
+        진행 중인 작업이 있는 동안 진행 표시줄을 움직이고 결과 큐를 확인합니다.
+        """
+        future = self.query_executor.submit(self.run_job, function, *args)
+        self.jobs_in_flight += 1
+        self.progress_bar.start(10)
+        if self.poll_id is None:
+            self.poll_id = self.root.after(RESULT_POLL_MS, self.poll_results)
+        return future
+    
+    def cancel_job(self, future):
+        """아직 시작하지 않은 작업을 취소합니다."""
+        if future.cancel():
+            self.jobs_in_flight -= 1
+    
+    def run_job(self, function, *args):
+        """작업 스레드: 함수를 실행하고 반영할 콜백(또는 None)을 결과 큐에 넣습니다."""
+        try:
+            callback = function(*args)
+        except Exception as e:
+            callback = partial(messagebox.showerror, "오류", f"데이터베이스 조회 실패: {str(e)}")
+        self.query_results.put(callback)
+    
+    def poll_results(self):
+        """메인 스레드: 완료된 작업의 콜백을 실행하고, 남은 작업이 있으면 다시 확인을 예약합니다."""
+        self.poll_id = None
+        while True:
+            try:
+                callback = self.query_results.get_nowait()
+            except queue.Empty:
+                break
+            self.jobs_in_flight -= 1
+            if callback is not None:
+                callback()
+        if self.jobs_in_flight > 0:
+            self.poll_id = self.root.after(RESULT_POLL_MS, self.poll_results)
+        else:
+            self.progress_bar.stop()
+    
+    def load_database(self, db_path):
+        """
+        작업 스레드: DB를 열고 통계와 필터 선택지를 조회합니다.
+        말뭉치 스냅샷이 최신이면 memmap으로 열기만 하므로 집계 쿼리 없이 바로 통계를 얻습니다.
+        """
+        try:
+            self.db_manager = DatabaseManager(db_path)
+            if self.db_manager.corpus_snapshot.load(self.db_manager):
+                stats = self.db_manager.corpus_snapshot.stats()
+                categories = sorted(stats['category_counts'])
+            else:
+                stats = self.db_manager.get_corpus_stats()
+                categories = sorted(self.db_manager.get_all_categories())
+            publication_types = self.db_manager.get_publication_types()
+            mesh_descriptors = self.db_manager.get_mesh_descriptors()
+        except Exception as e:
+            return partial(messagebox.showerror, "오류", f"데이터베이스 연결 실패: {str(e)}")
+        return partial(self.apply_database, stats, categories, publication_types, mesh_descriptors)
+    
+    def apply_database(self, stats, categories, publication_types, mesh_descriptors):
+        """통계와 필터 선택지를 화면에 반영하고 첫 페이지 조회를 시작합니다."""
+        texts = [
+            f"총 논문 수: {stats['total_papers']}편",
+            f"저널 수: {stats['journal_count']}개",
+            f"연도 범위: {stats['min_year'] or 'N/A'}-{stats['max_year'] or 'N/A'}",
+            f"카테고리 수: {len(stats['category_counts'])}개",
+        ]
+        for label, text in zip(self.stats_labels, texts):
+            label.config(text=text)
+        self.category_combo['values'] = ['전체'] + categories
+        self.topic_combo['values'] = ['전체'] + sorted(stats.get('topic_counts', {}))
+        self.year_combo['values'] = ['전체'] + stats['years']
+        self.publication_type_combo['values'] = ['전체'] + publication_types
+        self.mesh_combo['values'] = ['전체'] + mesh_descriptors
+        self.filter_papers()
+    
+    def refresh_papers_list(self, filters=None, sort=None, descending=None):
+        """
+        주어진 필터·정렬 조건(없으면 현재 조건)으로 첫 페이지 조회를 작업 스레드에 맡깁니다.
+        이전에 요청한 조회는 취소하거나 결과를 버리며, 목록 상태는 결과가 도착할 때 바뀝니다.
+        """
+        if self.db_manager is None:
+            return
+        filters = self.filters if filters is None else filters
+        sort = self.sort if sort is None else sort
+        descending = self.descending if descending is None else descending
+        self.query_generation += 1
+        if self.pending_query is not None:
+            self.cancel_job(self.pending_query)
+        self.pending_query = self.submit_job(self.run_query, self.query_generation, dict(filters), sort, descending)
+        self.count_label.config(text=f"{self.count_text} (검색 중...)")
+    
+    @timed
+    def run_query(self, generation, filters, sort, descending):
+        """
+        작업 스레드: 첫 페이지, 전체 개수, 패싯별 개수를 조회합니다. 같은 조회는 LRU 캐시에서 꺼냅니다.
+        패싯 필터만 쓰는 수집순 조회는 말뭉치 스냅샷의 비트셋으로, 나머지는 DB로 조회합니다.
+        """
+        if generation != self.query_generation:
+            return None
+        # 수집이나 인용 순위 갱신으로 DB가 바뀌면 데이터 버전이 달라져 이전 캐시 항목을 쓰지 않음
+        key = (self.db_manager.get_data_version(), tuple(sorted(filters.items())), sort, descending)
+        result = self.query_cache.get(key)
+        if result is None:
+            snapshot = self.db_manager.corpus_snapshot
+            snapshot_ready = snapshot.load(self.db_manager)
+            if snapshot_ready and snapshot.supports(filters, sort):
+                rows = snapshot.page(filters, descending, limit=PAGE_SIZE)
+                count = snapshot.count(filters)
+            else:
+                rows = self.db_manager.get_papers_page(filters, sort, descending, limit=PAGE_SIZE)
+                count = self.db_manager.count_papers(filters)
+            # 검색어가 있으면 패싯 개수는 스냅샷으로 셀 수 없으므로 표시를 생략
+            facet_counts = ({facet: snapshot.facet_counts(facet, filters) for facet in self.facet_labels}
+                            if snapshot_ready and snapshot.supports(filters) else None)
+            result = (rows, count, facet_counts)
+            self.query_cache[key] = result
+            if len(self.query_cache) > QUERY_CACHE_SIZE:
+                self.query_cache.popitem(last=False)
+        else:
+            self.query_cache.move_to_end(key)
+        return partial(self.apply_first_page, generation, filters, sort, descending, *result)
+    
+    def apply_first_page(self, generation, filters, sort, descending, rows, count, facet_counts):
+        """조회된 첫 페이지로 목록 창을 새로 채웁니다. 그 사이 새 조회가 요청되었으면 버립니다."""
+        if generation != self.query_generation:
+            return
+        if facet_counts is not None:
+            self.update_facet_counts(facet_counts)
+        self.filters, self.sort, self.descending = filters, sort, descending
+        self.papers_tree.delete(*self.papers_tree.get_children())
+        self.rows = list(rows)
+        self.at_start = True
+        self.at_end = len(self.rows) < PAGE_SIZE
+        for row in self.rows:
+            self.insert_row(row, tk.END)
+        self.papers_tree.yview_moveto(0)
+        self.count_text = f"{count}편"
+        self.count_label.config(text=self.count_text)
+        self.update_headings()
+    
+    def update_facet_counts(self, facet_counts):
+        """
+        패싯 콤보박스 항목을 "값 (개수)"로 바꿉니다. 개수는 다른 패싯 조건을 적용한 결과 수이며,
+        0편인 값은 빼되 현재 선택한 값은 남깁니다.
+        """
+        for facet, counts in facet_counts.items():
+            selected = self.facet_value(facet)
+            values = sorted(set(counts) | ({selected} if selected else set()), reverse=(facet == 'year'))
+            labels = {f"{value} ({counts.get(value, 0)})": value for value in values}
+            self.facet_labels[facet] = labels
+            self.facet_combos[facet]['values'] = ['전체'] + list(labels)
+            if selected:
+                self.facet_vars[facet].set(next(label for label, value in labels.items() if value == selected))
     
+    def facet_value(self, facet):
+        """패싯 콤보박스에서 선택한 필터 값 ('전체'면 None)"""
+        label = self.facet_vars[facet].get()
+        if label == '전체':
+            return None
+        return self.facet_labels[facet].get(label, label)
+    
+    def fetch_page(self, **page_args):
+        """현재 조건으로 이어지는 페이지를 스냅샷 또는 DB에서 가져옵니다. 두 경로의 행 key 형식은 같습니다."""
+        snapshot = self.db_manager.corpus_snapshot
+        if snapshot.supports(self.filters, self.sort):
+            return snapshot.page(self.filters, self.descending, limit=PAGE_SIZE, **page_args)
+        return self.db_manager.get_papers_page(self.filters, self.sort, self.descending, limit=PAGE_SIZE,
+                                               **page_args)
+    
+    def insert_row(self, row, index):
+        """트리뷰에 한 행을 추가합니다. 항목 id는 PMID입니다."""
+        self.papers_tree.insert('', index, iid=row['pmid'], values=(
+            row['year'] or '', row['journal'] or '', row['categories'], row['cited_by'] or '',
+            f"{row['pagerank']:.2e}" if row['pagerank'] else '', row['title'] or ''
+        ))
+    
+    def on_tree_scroll(self, first, last):
+        """스크롤 위치가 창의 끝에 가까워지면 다음/이전 페이지 로드를 예약합니다."""
+        self.tree_scrollbar.set(first, last)
+        if self.load_scheduled:
+            return
+        if float(last) > 0.9 and not self.at_end:
+            self.load_scheduled = True
+            self.root.after_idle(self.load_next_page)
+        elif float(first) < 0.1 and not self.at_start:
+            self.load_scheduled = True
+            self.root.after_idle(self.load_previous_page)
+    
+    def load_next_page(self):
+        """창 아래쪽에 다음 페이지를 붙이고, 넘치는 만큼 위쪽 행을 버립니다."""
+        self.load_scheduled = False
+        if not self.rows:
+            return
+        page = self.fetch_page(after=self.rows[-1]['key'])
+        self.at_end = len(page) < PAGE_SIZE
+        for row in page:
+            self.insert_row(row, tk.END)
+        self.rows.extend(page)
+        
+        overflow = len(self.rows) - MAX_WINDOW_ROWS
+        if overflow > 0:
+            top = self.papers_tree.yview()[0] * len(self.rows)
+            self.papers_tree.delete(*[row['pmid'] for row in self.rows[:overflow]])
+            del self.rows[:overflow]
+            self.at_start = False
+            self.papers_tree.yview_moveto(max(top - overflow, 0) / len(self.rows))
+    
+    def load_previous_page(self):
+        """창 위쪽에 이전 페이지를 붙이고, 넘치는 만큼 아래쪽 행을 버립니다."""
+        self.load_scheduled = False
+        if not self.rows:
+            return
+        top = self.papers_tree.yview()[0] * len(self.rows)
+        page = self.fetch_page(before=self.rows[0]['key'])
+        self.at_start = len(page) < PAGE_SIZE
+        for i, row in enumerate(page):
+            self.insert_row(row, i)
+        self.rows[:0] = page
+        
+        overflow = len(self.rows) - MAX_WINDOW_ROWS
+        if overflow > 0:
+            self.papers_tree.delete(*[row['pmid'] for row in self.rows[-overflow:]])
+            del self.rows[-overflow:]
+            self.at_end = False
+        self.papers_tree.yview_moveto((top + len(page)) / len(self.rows))
+    
+    def sort_by(self, column):
+        """열 제목을 클릭하면 해당 열로 정렬하고, 같은 열을 다시 누르면 방향을 바꿉니다."""
+        if self.sort == column:
+            self.refresh_papers_list(sort=column, descending=not self.descending)
+        else:
+            self.refresh_papers_list(sort=column, descending=SORTABLE_COLUMNS[column])
+    
+    def update_headings(self):
+        """현재 정렬 열의 제목에 방향 표시를 붙입니다."""
+        for column in SORTABLE_COLUMNS:
+            text = self.column_titles[column]
+            if column == self.sort:
+                text += ' ▼' if self.descending else ' ▲'
+            self.papers_tree.heading(column, text=text)
+    
+    def schedule_search(self, event=None):
+        """입력이 멈춘 뒤 SEARCH_DEBOUNCE_MS가 지나면 한 번만 검색합니다."""
+        if self.debounce_id is not None:
+            self.root.after_cancel(self.debounce_id)
+        self.debounce_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_papers)
+    
+    @timed
     def filter_papers(self, event=None):
-        """필터 조건에 따라 논문을 필터링합니다."""
-        category = self.category_var.get()
-        year = self.year_var.get()
-        search_term = self.search_var.get().lower()
-        
-        self.filtered_papers = []
-        
-        for paper in self.papers:
-            # 카테고리 필터
-            if category != '전체':
-                if not paper.categories or not any(cat.name == category for cat in paper.categories):
-                    continue
-            
-            # 연도 필터
-            if year != '전체':
-                if str(paper.publication_year) != year:
-                    continue
-            
-            # 검색 필터
-            if search_term:
-                title_match = search_term in paper.title.lower() if paper.title else False
-                abstract_match = search_term in paper.abstract.lower() if paper.abstract else False
-                if not (title_match or abstract_match):
-                    continue
-            
-            self.filtered_papers.append(paper)
-        
-        self.refresh_papers_list()
-        self.detail_text.delete(1.0, tk.END)
-        self.current_pmid = None
+        """필터 조건을 DB 조회 조건으로 바꾸어 목록을 다시 불러옵니다."""
+        self.debounce_id = None
+        search_term = self.search_var.get().strip()
+        
+        filters = {}
+        for facet in self.facet_vars:
+            value = self.facet_value(facet)
+            if value:
+                filters[facet] = value
+        # 유형·MeSH 필터는 스냅샷 패싯이 아니므로 이 조건이 있으면 DB로 조회
+        for name, var in (('publication_type', self.publication_type_var), ('mesh', self.mesh_var)):
+            value = var.get().strip()
+            if value and value != '전체':
+                filters[name] = value
+        if search_term:
+            filters['search'] = search_term
+        
+        self.refresh_papers_list(filters)
+        self.clear_details()
     
     def reset_filters(self):
         """필터를 초기화합니다."""
         self.category_var.set('전체')
+        self.topic_var.set('전체')
         self.year_var.set('전체')
+        self.publication_type_var.set('전체')
+        self.mesh_var.set('전체')
         self.search_var.set('')
-        self.filtered_papers = self.papers.copy()
-        self.refresh_papers_list()
+        self.filter_papers()
+    
+    def clear_details(self):
+        """상세 정보와 유사 논문 목록을 비웁니다."""
         self.detail_text.delete(1.0, tk.END)
+        self.similar_listbox.delete(0, tk.END)
         self.current_pmid = None
     
     def show_paper_details(self, event):
         """선택된 논문의 상세 정보를 표시합니다."""
-        selection = self.papers_listbox.curselection()
+        selection = self.papers_tree.selection()
         if not selection:
             return
         
-        paper_index = selection[0]
-        paper = self.filtered_papers[paper_index]
-        self.current_pmid = paper.pmid
+        self.display_paper(selection[0])
+    
+    def display_paper(self, pmid):
+        """논문 상세 정보를 DB에서 조회하여 유사 논문 목록과 함께 표시합니다."""
+        paper = self.db_manager.get_paper_by_pmid(pmid)
+        if paper is None:
+            return
+        self.current_pmid = paper['pmid']
+        journal = paper['journal']
         
         # 상세 정보 텍스트 구성
         details = []
-        details.append(f"📋 제목: {paper.title}\n")
-        details.append(f"🔗 PMID: {paper.pmid}")
-        details.append(f"📖 저널: {paper.journal_name}")
-        
-        if paper.journal_volume:
-            details.append(f"📄 Volume: {paper.journal_volume}")
-        if paper.journal_issue:
-            details.append(f"📄 Issue: {paper.journal_issue}")
-        
-        details.append(f"📅 발행연도: {paper.publication_year}\n")
+        details.append(f"📋 제목: {paper['title']}\n")
+        details.append(f"🔗 PMID: {paper['pmid']}")
+        details.append(f"📖 저널: {journal['name']}")
+        
+        if journal['volume']:
+            details.append(f"📄 Volume: {journal['volume']}")
+        if journal['issue']:
+            details.append(f"📄 Issue: {journal['issue']}")
+        
+        details.append(f"📅 발행연도: {journal['year']}")
+        if paper['publication_date']:
+            details.append(f"📅 발행일: {paper['publication_date']}")
+        if paper['doi']:
+            details.append(f"🔗 DOI: https://doi.org/{paper['doi']}")
+        if paper['publication_types']:
+            details.append(f"📑 유형: {', '.join(paper['publication_types'])}")
+        details.append("")
         
         # 저자 정보
-        if paper.authors:
-            authors = [author.name for author in paper.authors]
+        authors = paper['authors']
+        if authors:
             details.append(f"👥 저자: {', '.join(authors[:5])}")
             if len(authors) > 5:
                 details.append(f" (외 {len(authors)-5}명)")
             details.append("\n")
+        if paper['affiliations']:
+            details.append(f"🏛️ 소속: {'; '.join(paper['affiliations'][:3])}")
+            if len(paper['affiliations']) > 3:
+                details.append(f" (외 {len(paper['affiliations'])-3}곳)")
+            details.append("\n")
         
         # 카테고리 정보
-        if paper.categories:
-            category_names = [cat.name for cat in paper.categories]
-            category_display = {
-                'clinical_study': '🏥 임상연구',
-                'neuroscience': '🧬 신경과학',
-                'biomarker': '🔬 바이오마커',
-                'ai_ml': '🤖 AI/머신러닝',
-                'imaging': '📸 이미징',
-                'cognitive_assessment': '🧪 인지평가'
-            }
-            display_categories = [category_display.get(cat, cat) for cat in category_names]
+        if paper['categories']:
+            display_categories = [CATEGORY_DISPLAY.get(cat, cat) for cat in paper['categories']]
             details.append(f"🏷️ 카테고리: {', '.join(display_categories)}\n")
         
+        # MeSH 주제어 (주요 주제는 * 표시)
+        if paper['mesh_terms']:
+            terms = [term['descriptor'] + ('*' if term['major'] else '') for term in paper['mesh_terms']]
+            details.append(f"🔖 MeSH: {', '.join(terms)}\n")
+        
+        # 근사 중복으로 합쳐진 항목 (정오표, 재게재 등)
+        duplicate_pmids = self.db_manager.get_duplicate_pmids(paper['pmid'])
+        if duplicate_pmids:
+            details.append(f"🔁 중복 항목 PMID: {', '.join(duplicate_pmids)}\n")
+        
         # 초록
-        if paper.abstract:
-            details.append(f"📝 초록:\n{paper.abstract}")
+        if paper['abstract']:
+            details.append(f"📝 초록:\n{paper['abstract']}")
         
         # 텍스트 표시
         self.detail_text.delete(1.0, tk.END)
         self.detail_text.insert(1.0, '\n'.join(details))
+        self.show_similar_papers(paper['pmid'])
+    
+    def show_similar_papers(self, pmid):
+        """유사도 색인에서 비슷한 논문을 찾아 목록에 표시합니다."""
+        self.similar_listbox.delete(0, tk.END)
+        self.similar_pmids = []
+        similar = self.db_manager.similarity_index.most_similar(pmid, k=10)
+        titles = self.db_manager.get_paper_titles([similar_pmid for similar_pmid, _ in similar])
+        for similar_pmid, score in similar:
+            title = titles.get(similar_pmid)
+            if title is None:
+                continue
+            self.similar_pmids.append(similar_pmid)
+            self.similar_listbox.insert(tk.END, f"[{score:.2f}] {title[:80]}...")
+    
+    def open_similar_paper(self, event):
+        """유사 논문 목록에서 선택한 논문을 표시합니다."""
+        selection = self.similar_listbox.curselection()
+        if not selection:
+            return
+        self.display_paper(self.similar_pmids[selection[0]])
     
     def open_pubmed(self):
         """PubMed 페이지를 웹브라우저에서 엽니다."""
@@ -241,9 +609,15 @@ class MCIPapersGUI:
             messagebox.showwarning("경고", "선택된 논문이 없습니다.")
 
 def main():
-    root = tk.Tk()
-    app = MCIPapersGUI(root)
-    root.mainloop()
+    import argparse
+    parser = argparse.ArgumentParser(description='MCI 논문 데이터베이스 GUI 뷰어')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    with profile_session(args, 'desktop_gui'):
+        root = tk.Tk()
+        app = MCIPapersGUI(root)
+        root.mainloop()
 
 if __name__ == "__main__":
     main()
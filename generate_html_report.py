@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+MCI 논문 데이터베이스 정적 HTML 리포트 생성기
+브라우저에서 오프라인으로 열어 탐색·검색할 수 있는 리포트를 생성
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.db_manager import DatabaseManager
+from scripts.html_report import HTMLReportGenerator
+
+def main():
+    parser = argparse.ArgumentParser(description='MCI 논문 정적 HTML 리포트 생성')
+    parser.add_argument('--db', default='data/mci_papers.db', help='데이터베이스 경로')
+    parser.add_argument('--output', default='output/html_report', help='리포트 출력 디렉토리')
+    parser.add_argument('--workers', type=int, default=None, help='렌더링 워커 프로세스 수')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db)
+    generator = HTMLReportGenerator(db_manager, args.db, args.output, workers=args.workers)
+    total = generator.generate()
+
+    print(f"✅ HTML 리포트 생성 완료: {total}편")
+    print(f"📂 {os.path.abspath(os.path.join(args.output, 'index.html'))}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,35 @@
 import os
 import sys
 import yaml
+import time
 import logging
 from datetime import datetime
-from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from scripts.pubmed_crawler import PubMedCrawler
+from scripts.ingest_pipeline import IngestPipeline
 from scripts.db_manager import DatabaseManager
 from scripts.analyzer import TrendAnalyzer
+from scripts.chart_renderer import ChartRenderer
+from scripts.summarizer import PaperSummarizer
+from scripts.site_generator import SiteGenerator
+from scripts.citation_graph import CitationGraph
+from scripts.metadata_backfill import MetadataBackfill
+from scripts.exporter import PaperExporter
+from scripts.db_maintenance import DatabaseMaintenance, format_size_report
 from scripts.logger import setup_logging
+from scripts import metrics
+from scripts.metrics import MetricsPublisher
+from scripts.profiling import add_profile_arguments, profile_session
+from scripts.run_lock import RunLock
+
+# 스케줄러 작업 저장소에 남는 증분 수집·DB 유지보수 작업 id
+INCREMENTAL_JOB_ID = 'incremental_crawl'
+MAINTENANCE_JOB_ID = 'db_maintenance'
 
 class MCIPapersPipeline:
     def __init__(self):
-        self.logger = setup_logging()
+        self.logger = setup_logging(__name__)
         self.config = self._load_config()
         
         # 경로 설정
@@ -25,9 +43,20 @@ class MCIPapersPipeline:
         
         # 컴포넌트 초기화
         self.db_path = os.path.join(self.data_path, 'mci_papers.db')
+        self.lock_path = os.path.join(self.data_path, 'update.lock')
+        # 작업 상태는 수집 쓰기와 잠금을 다투지 않도록 별도 파일에 저장
+        self.scheduler_db_path = os.path.join(self.data_path, 'scheduler.db')
         self.db_manager = DatabaseManager(self.db_path)
         self.crawler = PubMedCrawler()
         self.analyzer = TrendAnalyzer(self.db_manager)
+        self.chart_renderer = ChartRenderer(os.path.join(self.output_path, 'charts'))
+        self.summarizer = PaperSummarizer()
+        self.citation_graph = CitationGraph(self.crawler, self.db_manager)
+        self.metadata_backfill = MetadataBackfill(self.crawler, self.db_manager)
+        self.exporter = PaperExporter(self.db_manager, self.base_path)
+        self.site_generator = SiteGenerator(
+            self.db_manager, os.path.join(self.base_path, self.config['paths']['blog'])
+        )
         
     def _load_config(self):
         """설정 파일을 로드합니다."""
@@ -35,55 +64,228 @@ class MCIPapersPipeline:
         with open(config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
     
-    def run_daily_update(self):
-        """일일 논문 수집 업데이트를 실행합니다."""
+    def run_daily_update(self, days_back: int = None, run_name: str = 'daily_update') -> bool:
+        """
+        논문 수집 업데이트를 실행합니다. days_back을 주지 않으면 수집 워터마크 이후 놓친 구간만
+        증분 수집합니다. 다른 업데이트가 실행 중이면 건너뛰고 False를 반환합니다.
+        단계별 시간과 계측 값은 pipeline_runs 테이블, JSON 리포트, Prometheus textfile로 남깁니다.
+        수집·요약 단계가 실패하면 실행을 failed로 기록한 뒤 예외를 다시 발생시킵니다.
+        """
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping this run")
+                return False
+            self._run_update(days_back, run_name)
+            return True
+
+    def _run_update(self, days_back: int, run_name: str):
+        run = metrics.start_run(run_name)
         try:
-            self.logger.info("Starting daily paper collection...")
+            self.logger.info("Starting paper collection...")
+            
+            # 새로운 논문 수집: 검색·상세 조회·파싱·저장 단계를 겹쳐 실행
+            ingest = IngestPipeline(self.crawler, self.db_manager)
+            with run.stage('ingest'):
+                result = ingest.run(days_back=days_back) if days_back else ingest.run_incremental()
+            self.logger.info(f"Found {result['found']} papers ({result['skipped_existing']} already stored)")
+            self.logger.info(f"Successfully added {result['added']} new papers to database")
+            
+            # 새 논문이 없고 오늘 이미 후처리를 했다면 요약·차트·사이트 갱신 생략
+            today = datetime.now().date().isoformat()
+            if not result['added'] and self.db_manager.get_state('last_postprocess_date') == today:
+                self.logger.info("No new papers; skipping post-processing")
+                run.finish()
+                return
+            
+            # 요약이 없는 논문만 요약하여 캐시
+            with run.stage('summarize'):
+                run.set_gauge('papers_summarized', self.summarizer.summarize_missing(self.db_manager))
             
-            # 새로운 논문 수집
-            papers = self.crawler.search_papers(days_back=1)
-            self.logger.info(f"Found {len(papers)} new papers")
+            # 새로 저장된 논문만 날짜별 CSV·Parquet로 내보내기 (선택적)
+            if self.config.get('export', {}).get('enabled', True):
+                try:
+                    with run.stage('export'):
+                        self.exporter.export()
+                except Exception as e:
+                    self.logger.warning(f"Failed to export new papers: {str(e)}")
             
-            # 데이터베이스에 저장
-            added_count = 0
-            for paper in papers:
-                success = self.db_manager.add_paper(paper)
-                if success:
-                    added_count += 1
-                else:
-                    self.logger.warning(f"Failed to add paper: {paper['pmid']}")
+            # 인용 관계 보강과 PageRank 갱신 (선택적, 실패해도 나머지 후처리는 진행)
+            if self.config.get('citations', {}).get('enabled', True):
+                try:
+                    with run.stage('citations'):
+                        self.citation_graph.enrich()
+                except Exception as e:
+                    self.logger.warning(f"Failed to update citation graph: {str(e)}")
             
-            self.logger.info(f"Successfully added {added_count} new papers to database")
+            # 메타데이터 파싱 이전에 저장된 논문의 발행일·MeSH 등 보강 (선택적)
+            if self.config.get('metadata_backfill', {}).get('enabled', True):
+                try:
+                    with run.stage('metadata_backfill'):
+                        self.metadata_backfill.run()
+                except Exception as e:
+                    self.logger.warning(f"Failed to backfill paper metadata: {str(e)}")
             
             # 트렌드 분석 결과 저장 (선택적)
             current_date = datetime.now().strftime('%Y%m%d')
             
-            # 카테고리 트렌드 플롯 생성
+            # 차트 생성 (워커 프로세스에서 렌더링, 입력이 같으면 건너뜀)
             try:
-                trend_plot_path = os.path.join(self.output_path, f'category_trends_{current_date}.png')
-                self.analyzer.plot_category_trends(months=12, save_path=trend_plot_path)
-                self.logger.info(f"Trend plot saved: {trend_plot_path}")
+                with run.stage('charts'):
+                    chart_paths = self.chart_renderer.render(self.analyzer.build_chart_specs(months=12))
+                self.logger.info(f"Charts available: {', '.join(sorted(chart_paths.values()))}")
             except Exception as e:
-                self.logger.warning(f"Failed to generate trend plot: {str(e)}")
+                self.logger.warning(f"Failed to generate charts: {str(e)}")
             
             # 트렌드 리포트 생성
             try:
-                report = self.analyzer.generate_trend_report(months=12)
-                report_path = os.path.join(self.output_path, f'trend_report_{current_date}.txt')
-                with open(report_path, 'w', encoding='utf-8') as f:
-                    f.write(report)
+                with run.stage('report'):
+                    report = self.analyzer.generate_trend_report(months=12)
+                    report_path = os.path.join(self.output_path, f'trend_report_{current_date}.txt')
+                    with open(report_path, 'w', encoding='utf-8') as f:
+                        f.write(report)
                 self.logger.info(f"Trend report saved: {report_path}")
             except Exception as e:
                 self.logger.warning(f"Failed to generate trend report: {str(e)}")
             
+            # 블로그 페이지 증분 생성
+            try:
+                with run.stage('site'):
+                    self.site_generator.build()
+            except Exception as e:
+                self.logger.warning(f"Failed to build blog site: {str(e)}")
+            
+            # 뷰어가 바로 열 수 있도록 말뭉치 스냅샷을 새 데이터 버전으로 다시 만듦
+            # (실패해도 뷰어는 SQL 조회로 대신하므로 단계만 실패로 기록)
+            try:
+                with run.stage('snapshot'):
+                    if not self.db_manager.corpus_snapshot.load(self.db_manager):
+                        raise RuntimeError("corpus snapshot build failed (see log)")
+            except Exception as e:
+                self.logger.warning(f"Failed to build corpus snapshot: {str(e)}")
+            
+            self.db_manager.set_state('last_postprocess_date', today)
+            
             # 데이터베이스 상태 출력
-            total_papers = len(self.db_manager.get_all_papers())
+            total_papers = self.db_manager.count_papers()
+            run.set_gauge('corpus_papers', total_papers)
             self.logger.info(f"Total papers in database: {total_papers}")
             
-            self.logger.info("Daily paper collection completed successfully")
+            run.finish()
+            self.logger.info(f"Paper collection completed ({run.status})")
             
         except Exception as e:
-            self.logger.error(f"Error during daily update: {str(e)}")
+            self.logger.exception(f"Error during paper update: {str(e)}")
+            run.finish('failed', f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            MetricsPublisher(self.db_manager, self.base_path).publish(run)
+            metrics.end_run(run)
+
+    def run_citation_update(self) -> bool:
+        """인용 관계 보강만 따로 실행합니다. 수집과 같은 실행 잠금을 사용합니다."""
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping citation update")
+                return False
+            run = metrics.start_run('citation_update')
+            try:
+                with run.stage('citations'):
+                    result = self.citation_graph.enrich()
+                run.finish('failed' if result['errors'] and not result['papers'] else None)
+                return True
+            except Exception as e:
+                self.logger.exception(f"Error during citation update: {str(e)}")
+                run.finish('failed', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                MetricsPublisher(self.db_manager, self.base_path).publish(run)
+                metrics.end_run(run)
+
+    def run_export(self) -> bool:
+        """내보내기만 따로 실행합니다. 같은 워터마크·파일을 쓰는 수집 후처리와 겹치지 않도록 실행 잠금을 사용합니다."""
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping export")
+                return False
+            run = metrics.start_run('export')
+            try:
+                with run.stage('export'):
+                    self.exporter.export()
+                run.finish()
+                return True
+            except Exception as e:
+                self.logger.exception(f"Error during export: {str(e)}")
+                run.finish('failed', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                MetricsPublisher(self.db_manager, self.base_path).publish(run)
+                metrics.end_run(run)
+
+    def run_site_build(self) -> bool:
+        """블로그 페이지 생성만 따로 실행합니다. 수집 후처리의 사이트 생성과 겹치지 않도록 실행 잠금을 사용합니다."""
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping site build")
+                return False
+            run = metrics.start_run('site')
+            try:
+                with run.stage('site'):
+                    self.site_generator.build()
+                run.finish()
+                return True
+            except Exception as e:
+                self.logger.exception(f"Error during site build: {str(e)}")
+                run.finish('failed', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                MetricsPublisher(self.db_manager, self.base_path).publish(run)
+                metrics.end_run(run)
+
+    def run_metadata_backfill(self, max_papers: int = None) -> bool:
+        """메타데이터 보강만 따로 실행합니다. 수집과 같은 실행 잠금을 사용합니다."""
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping metadata backfill")
+                return False
+            run = metrics.start_run('metadata_backfill')
+            try:
+                with run.stage('metadata_backfill'):
+                    result = self.metadata_backfill.run(max_papers=max_papers)
+                run.finish('failed' if result['errors'] and not result['papers'] else None)
+                return True
+            except Exception as e:
+                self.logger.exception(f"Error during metadata backfill: {str(e)}")
+                run.finish('failed', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                MetricsPublisher(self.db_manager, self.base_path).publish(run)
+                metrics.end_run(run)
+
+    def run_maintenance(self) -> dict:
+        """DB 유지보수를 실행합니다. VACUUM이 수집 쓰기와 겹치지 않도록 같은 실행 잠금을 사용합니다."""
+        with RunLock(self.lock_path) as acquired:
+            if not acquired:
+                self.logger.warning("Another update is already running; skipping maintenance")
+                return None
+            run = metrics.start_run('maintenance')
+            try:
+                report = DatabaseMaintenance(self.db_manager).run()
+                run.finish()
+                return report
+            except Exception as e:
+                self.logger.exception(f"Error during maintenance: {str(e)}")
+                run.finish('failed', f"{type(e).__name__}: {e}")
+                raise
+            finally:
+                MetricsPublisher(self.db_manager, self.base_path).publish(run)
+                metrics.end_run(run)
+
+    def show_runs(self, limit: int = 10):
+        """최근 실행 기록을 출력합니다."""
+        for run in self.db_manager.get_pipeline_runs(limit=limit):
+            stages = ', '.join(f"{name}={data['seconds']:.1f}s" for name, data in run.get('stages', {}).items())
+            print(f"#{run['id']} {run['started_at']} {run['name']} {run['status']} "
+                  f"{run['duration_seconds']:.1f}s [{stages}]" + (f" — {run['error']}" if run['error'] else ''))
     
     def run_collection_test(self):
         """논문 수집 테스트를 실행합니다."""
@@ -110,45 +312,142 @@ class MCIPapersPipeline:
             self.logger.error(f"Error during collection test: {str(e)}")
     
     def start_scheduler(self):
-        """스케줄러를 시작합니다."""
-        scheduler = BlockingScheduler()
-        scheduler_time = self.config['scheduler']['time']
-        scheduler_timezone = self.config['scheduler']['timezone']
-        
-        scheduler.add_job(
-            self.run_daily_update,
-            'cron',
-            hour=scheduler_time.split(':')[0],
-            minute=scheduler_time.split(':')[1],
-            timezone=scheduler_timezone
+        """
+        증분 수집 스케줄러를 시작합니다. 작업 상태는 data/scheduler.db의 apscheduler_jobs 테이블에 저장되어
+        재시작해도 유지되며, 꺼져 있는 동안 놓친 실행은 시작할 때 한 번으로 합쳐 실행됩니다.
+        놓친 날짜 구간 자체는 수집 워터마크로 따라잡습니다.
+        """
+        scheduler_config = self.config['scheduler']
+        interval = scheduler_config.get('interval_minutes', 60)
+        scheduler = BackgroundScheduler(
+            jobstores={'default': SQLAlchemyJobStore(url=f"sqlite:///{self.scheduler_db_path}")},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': None},
+            timezone=scheduler_config['timezone'],
         )
-        
-        self.logger.info(f"Scheduler started. Will run daily at {scheduler_time} {scheduler_timezone}")
         scheduler.start()
+        
+        job = scheduler.get_job(INCREMENTAL_JOB_ID)
+        if job is None:
+            # 처음 시작할 때는 바로 한 번 수집
+            scheduler.add_job('main:scheduled_update', 'interval', minutes=interval, id=INCREMENTAL_JOB_ID,
+                              next_run_time=datetime.now(scheduler.timezone))
+        elif job.trigger.interval.total_seconds() != interval * 60:
+            scheduler.reschedule_job(INCREMENTAL_JOB_ID, trigger='interval', minutes=interval)
+        
+        maintenance = self.config.get('maintenance') or {}
+        if maintenance.get('schedule'):
+            # 같은 id로 덮어써서 설정의 cron 일정이 바뀌면 반영
+            scheduler.add_job('main:scheduled_maintenance', 'cron', id=MAINTENANCE_JOB_ID, replace_existing=True,
+                              **maintenance['schedule'])
+        elif scheduler.get_job(MAINTENANCE_JOB_ID):
+            scheduler.remove_job(MAINTENANCE_JOB_ID)
+
+        next_run = scheduler.get_job(INCREMENTAL_JOB_ID).next_run_time
+        self.logger.info(f"Scheduler started. Incremental crawl every {interval} minutes "
+                         f"({scheduler_config['timezone']}), next run at {next_run}")
+        if scheduler.get_job(MAINTENANCE_JOB_ID):
+            self.logger.info(f"DB maintenance next run at {scheduler.get_job(MAINTENANCE_JOB_ID).next_run_time}")
+        try:
+            while True:
+                time.sleep(60)
+        except (KeyboardInterrupt, SystemExit):
+            scheduler.shutdown()
+
+_scheduled_pipeline = None
+
+def scheduled_update():
+    """스케줄러 작업 저장소에 'main:scheduled_update'로 저장되는 증분 수집 작업"""
+    global _scheduled_pipeline
+    if _scheduled_pipeline is None:
+        _scheduled_pipeline = MCIPapersPipeline()
+    _scheduled_pipeline.run_daily_update(run_name='incremental_update')
+
+def scheduled_maintenance():
+    """스케줄러 작업 저장소에 'main:scheduled_maintenance'로 저장되는 DB 유지보수 작업"""
+    global _scheduled_pipeline
+    if _scheduled_pipeline is None:
+        _scheduled_pipeline = MCIPapersPipeline()
+    _scheduled_pipeline.run_maintenance()
 
 def main():
     """메인 실행 함수"""
     import argparse
     parser = argparse.ArgumentParser(description='MCI Papers Research Tool')
-    parser.add_argument('--daily', action='store_true', help='Run daily paper collection')
+    parser.add_argument('--daily', action='store_true', help='Run paper collection (incremental from the last crawl)')
+    parser.add_argument('--days-back', type=int, help='With --daily, re-crawl a fixed number of days instead')
     parser.add_argument('--test', action='store_true', help='Test paper collection')
     parser.add_argument('--scheduler', action='store_true', help='Start scheduler for automatic collection')
+    parser.add_argument('--export', action='store_true', help='Export papers added since the last export')
+    parser.add_argument('--citations', action='store_true', help='Fetch citation links and update PageRank')
+    parser.add_argument('--backfill-metadata', action='store_true',
+                        help='Re-fetch papers stored without publication date/MeSH and fill in the metadata')
+    parser.add_argument('--limit', type=int, help='With --backfill-metadata, maximum number of papers to process')
+    parser.add_argument('--site', action='store_true', help='Build blog pages incrementally')
+    parser.add_argument('--maintain', action='store_true',
+                        help='Clean orphans, vacuum, analyze, check integrity and report table sizes')
+    parser.add_argument('--runs', action='store_true', help='Show recent pipeline runs')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
+    with profile_session(args, 'main'):
+        run_command(args)
+
+def run_command(args):
+    """선택한 작업을 실행합니다."""
     pipeline = MCIPapersPipeline()
     
     if args.daily:
-        pipeline.run_daily_update()
+        try:
+            pipeline.run_daily_update(days_back=args.days_back)
+        except Exception:
+            # 오류와 스택은 이미 로그와 pipeline_runs에 기록됨
+            sys.exit(1)
     elif args.test:
         pipeline.run_collection_test()
     elif args.scheduler:
         pipeline.start_scheduler()
+    elif args.export:
+        try:
+            pipeline.run_export()
+        except Exception:
+            sys.exit(1)
+    elif args.citations:
+        try:
+            pipeline.run_citation_update()
+        except Exception:
+            sys.exit(1)
+    elif args.backfill_metadata:
+        try:
+            pipeline.run_metadata_backfill(max_papers=args.limit)
+        except Exception:
+            sys.exit(1)
+    elif args.site:
+        try:
+            pipeline.run_site_build()
+        except Exception:
+            sys.exit(1)
+    elif args.maintain:
+        try:
+            report = pipeline.run_maintenance()
+        except Exception:
+            sys.exit(1)
+        if report:
+            print(format_size_report(report))
+    elif args.runs:
+        pipeline.show_runs()
     else:
         print("MCI Papers Research Tool")
         print("사용법:")
-        print("  --daily     : 일일 논문 수집 실행")
+        print("  --daily     : 논문 수집 실행 (마지막 수집 이후 구간만, --days-back N으로 기간 지정)")
         print("  --test      : 논문 수집 테스트")
-        print("  --scheduler : 자동 수집 스케줄러 시작")
+        print("  --scheduler : 증분 수집 스케줄러 시작 (기본 1시간마다)")
+        print("  --export    : 마지막 내보내기 이후 논문을 날짜별 CSV(gzip)·Parquet로 내보내기")
+        print("  --citations : 인용 관계(elink) 보강 및 PageRank 갱신")
+        print("  --backfill-metadata : 발행일·MeSH 등이 없는 기존 논문을 다시 받아 보강 (--limit N으로 편수 제한)")
+        print("  --site      : 블로그 페이지 증분 생성")
+        print("  --maintain  : DB 정리 (고아 행 삭제, 증분 VACUUM, ANALYZE, 무결성 검사) 및 크기 보고")
+        print("  --runs      : 최근 실행 기록 (단계별 시간) 확인")
+        print("  --profile   : 위 작업과 함께 사용, 프로파일을 output/profiles/에 저장")
         print("\n데이터 확인:")
         print("  python desktop_gui.py  : GUI로 논문 탐색")
         print("  python console_viewer.py : 콘솔에서 논문 확인")
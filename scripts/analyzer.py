@@ -1,42 +1,60 @@
-import os
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Tuple, Optional
-from sqlalchemy import func, and_
+from sqlalchemy import func
 from scripts.logger import setup_logging
-from scripts.database import Paper, Category
+from scripts import metrics
+from scripts.profiling import timed
+from scripts.database import Paper, exclude_duplicates
+from scripts.trend_cube import window_start
+from scripts.chart_renderer import draw_chart
 
 class TrendAnalyzer:
     def __init__(self, db_manager):
-        self.logger = setup_logging()
+        self.logger = setup_logging(__name__)
         self.db_manager = db_manager
+        self._memo = {}
+        self._memo_version = None
         
-    def analyze_category_trends(self, months: int = 12) -> pd.DataFrame:
+    def _ingest_version(self) -> str:
+        """캐시 무효화 기준이 되는 수집 버전을 반환합니다."""
+        return self.db_manager.get_state('ingest_version', '0')
+
+    def _memoized(self, key: Tuple, compute):
+        """수집 버전이 바뀌지 않았다면 이전 계산 결과를 재사용합니다."""
+        version = self._ingest_version()
+        if version != self._memo_version:
+            self._memo.clear()
+            self._memo_version = version
+        if key not in self._memo:
+            with metrics.current().timer('analyzer_query_seconds', query=key[0]):
+                self._memo[key] = compute()
+        return self._memo[key]
+
+    @timed
+    def analyze_category_trends(self, months: int = 12, granularity: str = 'month') -> pd.DataFrame:
         """
         지정된 기간 동안의 카테고리별 논문 수 추이를 분석합니다.
+        months는 이번 달을 포함한 달력 기준 개월 수이며, 집계는 트렌드 큐브에서 읽어옵니다.
         """
+        today = datetime.now().date()
+        key = ('category_trends', months, granularity, today)
+        return self._memoized(key, lambda: self._load_category_trends(months, granularity, today))
+
+    def _load_category_trends(self, months: int, granularity: str, today) -> pd.DataFrame:
         session = self.db_manager.Session()
         try:
-            # 날짜 범위 계산
-            end_date = datetime.now().date()
-            start_date = end_date - timedelta(days=months * 30)
-            
-            # 카테고리별 월간 논문 수 집계
-            results = (session.query(
-                func.strftime('%Y-%m', Paper.created_date).label('month'),
-                Category.name,
-                func.count(Paper.id).label('count'))
-                .join(Paper.categories)
-                .filter(Paper.created_date >= start_date)
-                .group_by('month', Category.name)
-                .all())
+            if not self.db_manager.ensure_trend_data():
+                self.logger.warning("Trend cube is not built; run an ingest or --maintain first")
+                return pd.DataFrame()
+
+            # 날짜 범위 계산 (달력 기준 months개월)
+            start_date = window_start(today, months, 'month')
+            results = self.db_manager.trend_cube.query(session, start_date, granularity)
             
             # 결과를 DataFrame으로 변환
-            df = pd.DataFrame(results, columns=['month', 'category', 'count'])
-            df_pivot = df.pivot(index='month', columns='category', values='count').fillna(0)
+            df = pd.DataFrame(results, columns=[granularity, 'category', 'count'])
+            df_pivot = df.pivot(index=granularity, columns='category', values='count').fillna(0)
             
             self.logger.info(f"Analyzed trends over {months} months")
             return df_pivot
@@ -47,39 +65,137 @@ class TrendAnalyzer:
         finally:
             session.close()
     
+    def analyze_emerging_terms(self, months: int = 12, recent_months: int = 3, top_n: int = 20) -> pd.DataFrame:
+        """
+        최근 recent_months개월 동안 이전 기간 대비 급증한 용어를 찾습니다.
+        """
+        today = datetime.now().date()
+        key = ('emerging_terms', months, recent_months, top_n, today)
+        return self._memoized(key, lambda: self._load_emerging_terms(months, recent_months, top_n, today))
+
+    def _load_emerging_terms(self, months: int, recent_months: int, top_n: int, today) -> pd.DataFrame:
+        session = self.db_manager.Session()
+        try:
+            if not self.db_manager.ensure_trend_data():
+                self.logger.warning("Term sketches are not built; run an ingest or --maintain first")
+                return pd.DataFrame()
+            terms = self.db_manager.term_trends.emerging_terms(
+                session, today, months=months, recent_months=recent_months, top_n=top_n
+            )
+            self.logger.info(f"Found {len(terms)} emerging terms over {months} months")
+            return pd.DataFrame(terms, columns=['term', 'recent_count', 'baseline_count', 'growth', 'z_score'])
+
+        except Exception as e:
+            self.logger.error(f"Error analyzing emerging terms: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            session.close()
+
+    def analyze_year_distribution(self) -> pd.DataFrame:
+        """
+        발행연도별 논문 수를 집계합니다.
+        """
+        return self._memoized(('year_distribution',), self._load_year_distribution)
+
+    def _load_year_distribution(self) -> pd.DataFrame:
+        session = self.db_manager.Session()
+        try:
+            results = (exclude_duplicates(session.query(Paper.publication_year, func.count(Paper.id)))
+                       .filter(Paper.publication_year.isnot(None), Paper.publication_year != '')
+                       .group_by(Paper.publication_year)
+                       .order_by(Paper.publication_year)
+                       .all())
+            return pd.DataFrame(results, columns=['year', 'count']).set_index('year')
+        except Exception as e:
+            self.logger.error(f"Error analyzing year distribution: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            session.close()
+
+    def analyze_top_journals(self, top_n: int = 15) -> pd.DataFrame:
+        """
+        논문 수 기준 상위 저널을 집계합니다.
+        """
+        return self._memoized(('top_journals', top_n), lambda: self._load_top_journals(top_n))
+
+    def _load_top_journals(self, top_n: int) -> pd.DataFrame:
+        session = self.db_manager.Session()
+        try:
+            count = func.count(Paper.id)
+            results = (exclude_duplicates(session.query(Paper.journal_name, count))
+                       .filter(Paper.journal_name.isnot(None), Paper.journal_name != '')
+                       .group_by(Paper.journal_name)
+                       .order_by(count.desc())
+                       .limit(top_n)
+                       .all())
+            return pd.DataFrame(results, columns=['journal', 'count']).set_index('journal')
+        except Exception as e:
+            self.logger.error(f"Error analyzing top journals: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            session.close()
+
+    def analyze_term_trends(self, months: int = 12, top_n: int = 8) -> pd.DataFrame:
+        """
+        상위 급증 용어의 월별 문서 빈도 추이를 반환합니다.
+        """
+        today = datetime.now().date()
+        key = ('term_trends', months, top_n, today)
+        return self._memoized(key, lambda: self._load_term_trends(months, top_n, today))
+
+    def _load_term_trends(self, months: int, top_n: int, today) -> pd.DataFrame:
+        terms = self.analyze_emerging_terms(months)
+        if terms.empty:
+            return pd.DataFrame()
+        session = self.db_manager.Session()
+        try:
+            selected = terms['term'].head(top_n).tolist()
+            series = self.db_manager.term_trends.term_series(session, selected, window_start(today, months, 'month'))
+            df = pd.DataFrame.from_dict(series, orient='index', columns=selected).sort_index()
+            df.index.name = 'month'
+            return df
+        except Exception as e:
+            self.logger.error(f"Error analyzing term trends: {str(e)}")
+            return pd.DataFrame()
+        finally:
+            session.close()
+
+    def build_chart_specs(self, months: int = 12) -> List[Dict]:
+        """
+        렌더링 단계에 넘길 차트 명세(미리 계산된 DataFrame 포함)를 만듭니다.
+        """
+        return [
+            {'name': 'category_trends', 'kind': 'line', 'data': self.analyze_category_trends(months),
+             'title': f'Paper Categories Trend Over {months} Months', 'xlabel': 'Month', 'ylabel': 'Number of Papers'},
+            {'name': 'year_distribution', 'kind': 'bar', 'data': self.analyze_year_distribution(),
+             'title': 'Papers by Publication Year', 'xlabel': 'Year', 'ylabel': 'Number of Papers'},
+            {'name': 'top_journals', 'kind': 'barh', 'data': self.analyze_top_journals(),
+             'title': 'Top Journals', 'xlabel': 'Number of Papers'},
+            {'name': 'term_trends', 'kind': 'line', 'data': self.analyze_term_trends(months),
+             'title': f'Emerging Terms Over {months} Months', 'xlabel': 'Month', 'ylabel': 'Number of Papers'},
+        ]
+
     def plot_category_trends(self, months: int = 12, save_path: Optional[str] = None):
         """
         카테고리별 트렌드를 시각화합니다.
+        save_path가 없으면 화면에 띄우지 않고 Figure 객체를 반환합니다.
         """
         try:
             df = self.analyze_category_trends(months)
             if df.empty:
                 self.logger.error("No data available for plotting")
-                return
-                
-            plt.figure(figsize=(12, 6))
-            for category in df.columns:
-                plt.plot(df.index, df[category], marker='o', label=category)
-                
-            plt.title(f'Paper Categories Trend Over {months} Months')
-            plt.xlabel('Month')
-            plt.ylabel('Number of Papers')
-            plt.xticks(rotation=45)
-            plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-            plt.tight_layout()
-            
+                return None
+
+            fig = draw_chart('line', df, f'Paper Categories Trend Over {months} Months',
+                             'Month', 'Number of Papers')
             if save_path:
-                plt.savefig(save_path)
+                fig.savefig(save_path)
                 self.logger.info(f"Saved trend plot to {save_path}")
-            else:
-                plt.show()
+            return fig
                 
         except Exception as e:
             self.logger.error(f"Error plotting category trends: {str(e)}")
-        finally:
-            plt.close()
-            
-
+            return None
 
     def generate_trend_report(self, months: int = 12) -> str:
         """
@@ -100,6 +216,16 @@ class TrendAnalyzer:
                 report.append(f"\n### {category}")
                 report.append(f"- Total papers: {total}")
                 report.append(f"- Average papers per month: {avg:.1f}")
+
+            # 급증 용어 섹션
+            terms = self.analyze_emerging_terms(months)
+            if not terms.empty:
+                report.append("\n## Emerging Terms")
+                for row in terms.head(10).itertuples():
+                    report.append(
+                        f"- {row.term}: {row.recent_count} papers recently "
+                        f"(x{row.growth:.1f} vs. baseline, z={row.z_score:.1f})"
+                    )
                 
             return "\n".join(report)
             
@@ -0,0 +1,301 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+import yaml
+
+from scripts.analyzer import TrendAnalyzer
+from scripts.db_manager import DatabaseManager
+from scripts.logger import setup_logging
+from scripts.trend_cube import GRANULARITIES
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+MAX_PAGE_SIZE = 500
+GZIP_MIN_BYTES = 1024
+MAX_HEADER_BYTES = 16384
+
+
+class APIError(Exception):
+    """HTTP 상태 코드와 함께 클라이언트에 돌려줄 오류"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(key) -> str:
+    """keyset 페이지 키를 URL에 넣을 수 있는 불투명한 커서 문자열로 바꿉니다."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii'))))
+    except (ValueError, TypeError):
+        raise APIError(400, 'invalid cursor')
+
+
+class PaperAPIServer:
+    """
+    DatabaseManager 위의 localhost 전용 읽기 전용 JSON API.
+    asyncio로 연결을 처리하고 DB 조회는 읽기 전용 연결 풀을 공유하는 스레드 풀에서 실행합니다.
+    응답은 데이터 버전(수집 버전과 인용 순위 버전) 기준 ETag와 마지막 수집 시점 Last-Modified로 검증하고 데이터 버전별로 캐시합니다.
+    """
+
+    def __init__(self, db_path: str, host: str = None, port: int = None, pool_size: int = None):
+        self.logger = setup_logging(__name__)
+        self.config = self._load_config()
+        self.host = host or self.config.get('host', '127.0.0.1')
+        self.port = port or self.config.get('port', 8765)
+        self.pool_size = pool_size or self.config.get('pool_size', 8)
+        self.cache_entries = self.config.get('cache_entries', 256)
+
+        self.db_manager = DatabaseManager(db_path, read_only=True, pool_size=self.pool_size)
+        self.analyzer = TrendAnalyzer(self.db_manager)
+        self.executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        self._cache = OrderedDict()
+        self.routes = {
+            'papers': self._papers,
+            'search': self._search,
+            'stats': self._stats,
+            'trends': self._trends,
+        }
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 api 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('api') or {}
+
+    async def serve_forever(self):
+        """지정한 주소에서 요청을 받기 시작합니다."""
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.logger.info(f"Paper API listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 keep-alive 연결에서 요청을 차례로 처리합니다."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                if len(head) > MAX_HEADER_BYTES:
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                status, response_headers, body = await self._respond(method, target, headers)
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close') or \
+                             headers.get('connection', '').lower() == 'keep-alive'
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+                response_headers['Content-Length'] = str(len(body))
+
+                out = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+                out += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(('\r\n'.join(out) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """요청을 라우팅하고 조건부 요청·gzip을 처리한 응답을 만듭니다."""
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, 'only GET and HEAD are supported')
+
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if not parts or parts[0] not in self.routes or (len(parts) > 1 and parts[0] != 'papers') or len(parts) > 2:
+            return self._error(404, 'not found')
+
+        loop = asyncio.get_running_loop()
+        try:
+            version, last_ingest_at = await loop.run_in_executor(self.executor, self._validators)
+            etag = '"' + hashlib.sha1(f"{version}|{url.path}?{url.query}".encode('utf-8')).hexdigest()[:20] + '"'
+            last_modified = self._http_date(last_ingest_at)
+            validators = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if last_modified:
+                validators['Last-Modified'] = last_modified
+
+            if self._not_modified(headers, etag, last_ingest_at):
+                return 304, validators, b''
+
+            cache_key = (version, url.path, url.query)
+            body = self._cache_get(cache_key)
+            if body is None:
+                payload = await loop.run_in_executor(self.executor, self.routes[parts[0]], parts[1:], params)
+                body = json.dumps(payload, ensure_ascii=False, default=self._json_default).encode('utf-8')
+                self._cache_put(cache_key, body)
+        except APIError as e:
+            return self._error(e.status, str(e))
+        except Exception as e:
+            self.logger.error(f"Error handling {target}: {str(e)}")
+            return self._error(500, 'internal error')
+
+        response_headers = {'Content-Type': 'application/json; charset=utf-8', 'Vary': 'Accept-Encoding'}
+        response_headers.update(validators)
+        if 'gzip' in headers.get('accept-encoding', '') and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            response_headers['Content-Encoding'] = 'gzip'
+        return 200, response_headers, body
+
+    def _error(self, status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+        body = json.dumps({'error': message}).encode('utf-8')
+        return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+    def _validators(self) -> Tuple[str, Optional[str]]:
+        return self.db_manager.get_data_version(), self.db_manager.get_state('last_ingest_at')
+
+    @staticmethod
+    def _http_date(iso_value: Optional[str]) -> Optional[str]:
+        if not iso_value:
+            return None
+        return format_datetime(datetime.fromisoformat(iso_value).astimezone(timezone.utc), usegmt=True)
+
+    @staticmethod
+    def _not_modified(headers: Dict[str, str], etag: str, last_ingest_at: Optional[str]) -> bool:
+        """If-None-Match를 우선 확인하고, 없으면 If-Modified-Since를 확인합니다."""
+        if 'if-none-match' in headers:
+            return etag in [tag.strip() for tag in headers['if-none-match'].split(',')] or \
+                headers['if-none-match'].strip() == '*'
+        if 'if-modified-since' in headers and last_ingest_at:
+            try:
+                since = parsedate_to_datetime(headers['if-modified-since'])
+                modified = datetime.fromisoformat(last_ingest_at).astimezone().replace(microsecond=0)
+                return modified <= since
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _json_default(value):
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        if hasattr(value, 'item'):
+            # numpy 스칼라
+            return value.item()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    def _cache_get(self, key) -> Optional[bytes]:
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+        return body
+
+    def _cache_put(self, key, body: bytes):
+        self._cache[key] = body
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    # 아래 핸들러는 스레드 풀에서 실행됩니다.
+
+    @staticmethod
+    def _int_param(params: Dict[str, str], name: str, default: int, maximum: int = None) -> int:
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            raise APIError(400, f"{name} must be an integer")
+        if value < 1:
+            raise APIError(400, f"{name} must be positive")
+        return min(value, maximum) if maximum else value
+
+    def _page(self, filters: Dict[str, Any], params: Dict[str, str]) -> Dict[str, Any]:
+        """keyset 페이지 하나와 다음 페이지 커서를 반환합니다. 첫 페이지에만 전체 개수를 포함합니다."""
+        sort = params.get('sort', 'id')
+        if sort not in ('id', 'year', 'journal', 'categories', 'rank', 'citations'):
+            raise APIError(400, 'sort must be one of id, year, journal, categories, rank, citations')
+        descending = params.get('order', 'desc') != 'asc'
+        limit = self._int_param(params, 'limit', 50, MAX_PAGE_SIZE)
+        after = decode_cursor(params['cursor']) if params.get('cursor') else None
+
+        rows = self.db_manager.get_papers_page(filters, sort, descending, after=after, limit=limit)
+        result = {
+            'papers': [{name: value for name, value in row.items() if name not in ('id', 'key')} for row in rows],
+            'next_cursor': encode_cursor(rows[-1]['key']) if len(rows) == limit else None,
+        }
+        if after is None:
+            result['total'] = self.db_manager.count_papers(filters)
+        return result
+
+    def _filters(self, params: Dict[str, str]) -> Dict[str, Any]:
+        filters = {name: params.get(name)
+                   for name in ('category', 'topic', 'year', 'mesh', 'publication_type', 'affiliation', 'doi')}
+        for name in ('since', 'published_since', 'published_until'):
+            if params.get(name):
+                try:
+                    filters[name] = date.fromisoformat(params[name])
+                except ValueError:
+                    raise APIError(400, f"{name} must be YYYY-MM-DD")
+        return filters
+
+    def _papers(self, path, params: Dict[str, str]):
+        """GET /papers, GET /papers/{pmid}"""
+        if path:
+            paper = self.db_manager.get_paper_by_pmid(path[0])
+            if paper is None:
+                raise APIError(404, f"paper {path[0]} not found")
+            paper['duplicate_pmids'] = self.db_manager.get_duplicate_pmids(path[0])
+            return paper
+        return self._page(self._filters(params), params)
+
+    def _search(self, path, params: Dict[str, str]):
+        """GET /search?q=..."""
+        if not params.get('q', '').strip():
+            raise APIError(400, 'q is required')
+        filters = self._filters(params)
+        filters['search'] = params['q']
+        return self._page(filters, params)
+
+    def _stats(self, path, params: Dict[str, str]):
+        """GET /stats"""
+        return self.db_manager.get_corpus_stats()
+
+    def _trends(self, path, params: Dict[str, str]):
+        """GET /trends?months=12&granularity=month"""
+        months = self._int_param(params, 'months', 12, 120)
+        granularity = params.get('granularity', 'month')
+        if granularity not in GRANULARITIES:
+            raise APIError(400, f"granularity must be one of {', '.join(GRANULARITIES)}")
+        # 읽기 전용 연결에서는 집계를 만들 수 없으므로 빈 결과 대신 오류로 알림 (오류 응답은 캐시하지 않음)
+        if not self.db_manager.ensure_trend_data():
+            raise APIError(503, 'trend data not built; run an ingest or main.py --maintain')
+
+        trends = self.analyzer.analyze_category_trends(months, granularity)
+        emerging = self.analyzer.analyze_emerging_terms(months)
+        return {
+            'granularity': granularity,
+            'months': months,
+            'categories': {
+                str(period): {category: int(count) for category, count in counts.items()}
+                for period, counts in trends.to_dict(orient='index').items()
+            },
+            'emerging_terms': emerging.to_dict(orient='records'),
+        }
@@ -1,8 +1,33 @@
 from typing import List, Dict, Any
-from datetime import datetime
+from datetime import datetime, date
+
+CATEGORY_DISPLAY = {
+    'clinical_study': '🏥 임상연구',
+    'neuroscience': '🧬 신경과학',
+    'biomarker': '🔬 바이오마커',
+    'ai_ml': '🤖 AI/머신러닝',
+    'imaging': '📸 이미징',
+    'cognitive_assessment': '🧪 인지평가',
+    '기타': '📋 기타'
+}
+
+BLOG_FOOTER = """
+## 💡 이용 안내
+
+- **논문 원문**: PubMed 링크를 통해 전문을 확인하실 수 있습니다.
+- **업데이트**: 매일 오전 7시(JST)에 새로운 논문이 자동으로 추가됩니다.
+- **피드백**: 개선 사항이나 오류 발견 시 GitHub 이슈로 알려주세요.
+
+---
+
+*본 블로그는 MCI 연구 학습을 위한 목적으로 운영됩니다.*
+"""
+
+def generate_paper_summary(paper, summaries: Dict[str, str] = None) -> str:
+    """논문의 핵심 요약을 반환합니다. 요약 캐시(PMID → 요약)에 있으면 그것을 사용합니다."""
+    if summaries and paper.pmid in summaries:
+        return summaries[paper.pmid]
 
-def generate_paper_summary(paper) -> str:
-    """논문의 핵심 요약을 생성합니다."""
     abstract = paper.abstract if paper.abstract else "초록 정보가 없습니다."
     
     # 첫 문장과 주요 키워드 추출
@@ -14,6 +39,44 @@ def generate_paper_summary(paper) -> str:
     
     return summary
 
+def latest_papers(papers: List[Any], count: int) -> List[Any]:
+    """수집일(같으면 id) 기준으로 가장 최근 논문 count개를 반환합니다."""
+    return sorted(papers, key=lambda paper: (paper.created_date or date.min, paper.id or 0), reverse=True)[:count]
+
+def top_ranked_papers(papers: List[Any], ranks: Dict[str, float], count: int) -> List[Any]:
+    """인용 그래프 PageRank(PMID → 점수)가 높은 논문 count개를 반환합니다. 순위가 없는 논문은 제외합니다."""
+    ranked = [paper for paper in papers if ranks.get(paper.pmid)]
+    return sorted(ranked, key=lambda paper: (ranks[paper.pmid], paper.id or 0), reverse=True)[:count]
+
+def format_paper_entry(paper, index: int, summaries: Dict[str, str] = None, cited_by: int = None) -> str:
+    """논문 한 편의 마크다운 항목을 생성합니다. cited_by를 주면 피인용 수를 함께 표시합니다."""
+    parts = [f"#### {index}. {paper.title}\n\n"]
+    
+    # 저널 정보
+    journal = f"**📖 저널**: {paper.journal_name}"
+    if paper.journal_volume:
+        journal += f" Vol.{paper.journal_volume}"
+    if paper.journal_issue:
+        journal += f" Issue.{paper.journal_issue}"
+    parts.append(journal + f" ({paper.publication_year})\n\n")
+    
+    # PubMed 링크
+    parts.append(f"**🔗 PubMed**: [{paper.pmid}](https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/)\n\n")
+    
+    if cited_by is not None:
+        parts.append(f"**📈 피인용**: {cited_by}회\n\n")
+    
+    # 논문 요약
+    parts.append(f"**📝 요약**: {generate_paper_summary(paper, summaries)}\n\n")
+    
+    # 연구 카테고리
+    if paper.categories:
+        categories_str = ", ".join([cat.name for cat in paper.categories])
+        parts.append(f"**🏷️ 카테고리**: {categories_str}\n\n")
+    
+    parts.append("---\n\n")
+    return ''.join(parts)
+
 def categorize_papers_by_category(papers: List[Any]) -> Dict[str, List[Any]]:
     """논문을 카테고리별로 분류합니다."""
     categorized = {}
@@ -32,8 +95,9 @@ def categorize_papers_by_category(papers: List[Any]) -> Dict[str, List[Any]]:
     
     return categorized
 
-def generate_blog_post(trend_report: str, date: str, categories: List[str], papers: List[Any] = None) -> str:
-    """개선된 블로그 포스트를 생성합니다."""
+def generate_blog_post(trend_report: str, date: str, categories: List[str], papers: List[Any] = None,
+                       summaries: Dict[str, str] = None, ranks: Dict[str, float] = None) -> str:
+    """개선된 블로그 포스트를 생성합니다. ranks(PMID → PageRank)를 주면 인용 영향력 상위 논문 절을 추가합니다."""
     front_matter = f"""---
 title: "MCI 논문 동향 리포트 ({date})"
 date: {date}
@@ -65,64 +129,34 @@ description: "MCI 관련 최신 논문 요약 및 연구 동향 분석"
 
 """
     
+    parts = [content]
+    
     # 논문을 카테고리별로 분류하여 표시
     if papers and len(papers) > 0:
-        categorized_papers = categorize_papers_by_category(papers[-20:])  # 최신 20개
+        categorized_papers = categorize_papers_by_category(latest_papers(papers, 20))  # 최신 20개
         
-        content += "## 📚 최신 논문 요약\n\n"
+        parts.append("## 📚 최신 논문 요약\n\n")
         
         # 각 카테고리별로 논문 표시
         for category_name, category_papers in categorized_papers.items():
             if category_papers:
                 # 카테고리명을 한국어로 변환
-                category_display = {
-                    'clinical_study': '🏥 임상연구',
-                    'neuroscience': '🧬 신경과학',
-                    'biomarker': '🔬 바이오마커',
-                    'ai_ml': '🤖 AI/머신러닝',
-                    'imaging': '📸 이미징',
-                    'cognitive_assessment': '🧪 인지평가',
-                    '기타': '📋 기타'
-                }.get(category_name, f'📄 {category_name}')
-                
-                content += f"### {category_display}\n\n"
+                category_display = CATEGORY_DISPLAY.get(category_name, f'📄 {category_name}')
+                parts.append(f"### {category_display}\n\n")
                 
                 for i, paper in enumerate(category_papers[:5], 1):  # 카테고리당 최대 5개
-                    content += f"#### {i}. {paper.title}\n\n"
-                    
-                    # 저널 정보
-                    content += f"**📖 저널**: {paper.journal_name}"
-                    if paper.journal_volume:
-                        content += f" Vol.{paper.journal_volume}"
-                    if paper.journal_issue:
-                        content += f" Issue.{paper.journal_issue}"
-                    content += f" ({paper.publication_year})\n\n"
-                    
-                    # PubMed 링크
-                    content += f"**🔗 PubMed**: [{paper.pmid}](https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/)\n\n"
-                    
-                    # 논문 요약
-                    summary = generate_paper_summary(paper)
-                    content += f"**📝 요약**: {summary}\n\n"
-                    
-                    # 연구 카테고리
-                    if paper.categories:
-                        categories_str = ", ".join([cat.name for cat in paper.categories])
-                        content += f"**🏷️ 카테고리**: {categories_str}\n\n"
-                    
-                    content += "---\n\n"
+                    parts.append(format_paper_entry(paper, i, summaries))
+    
+    # 인용 그래프 PageRank 상위 논문
+    if papers and ranks:
+        ranked_papers = top_ranked_papers(papers, ranks, 10)
+        if ranked_papers:
+            parts.append("## 🏆 인용 영향력 상위 논문\n\n")
+            for i, paper in enumerate(ranked_papers, 1):
+                parts.append(format_paper_entry(paper, i, summaries))
     
     # Footer 추가
-    content += """
-## 💡 이용 안내
-
-- **논문 원문**: PubMed 링크를 통해 전문을 확인하실 수 있습니다.
-- **업데이트**: 매일 오전 7시(JST)에 새로운 논문이 자동으로 추가됩니다.
-- **피드백**: 개선 사항이나 오류 발견 시 GitHub 이슈로 알려주세요.
-
----
-
-*본 블로그는 MCI 연구 학습을 위한 목적으로 운영됩니다.*
-"""
+    parts.append(BLOG_FOOTER)
+    content = ''.join(parts)
     
     return front_matter + content
@@ -2,23 +2,26 @@ import os
 import yaml
 import logging
 from typing import List, Dict, Set
-from scripts.logger import setup_logging
+from scripts.logger import setup_logging, LogSummary
+from scripts import metrics
+from scripts.profiling import timed
 
 class PaperCategorizer:
-    def __init__(self):
-        self.logger = setup_logging()
+    def __init__(self, rules_path: str = None):
+        """rules_path를 주지 않으면 config/category_rules.yaml을 사용합니다 (주제별 규칙은 topics 설정 참조)."""
+        self.logger = setup_logging(__name__)
+        self.summary = LogSummary(self.logger, 'Categorization')
+        self.rules_path = rules_path or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)),
+            'config',
+            'category_rules.yaml'
+        )
         self.categories = self._load_category_rules()
         
     def _load_category_rules(self) -> Dict[str, Set[str]]:
         """카테고리 규칙을 로드합니다."""
         try:
-            config_path = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)),
-                'config',
-                'category_rules.yaml'
-            )
-            
-            with open(config_path, 'r', encoding='utf-8') as f:
+            with open(self.rules_path, 'r', encoding='utf-8') as f:
                 rules = yaml.safe_load(f)
             
             # 키워드를 소문자로 변환하여 저장
@@ -33,6 +36,7 @@ class PaperCategorizer:
             self.logger.error(f"Error loading category rules: {str(e)}")
             return {}
             
+    @timed
     def categorize_paper(self, title: str, abstract: str) -> List[str]:
         """논문의 제목과 초록을 기반으로 카테고리를 할당합니다."""
         if not self.categories:
@@ -44,19 +48,31 @@ class PaperCategorizer:
         
         # 각 카테고리의 키워드 확인
         matched_categories = []
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         for category, keywords in self.categories.items():
             for keyword in keywords:
-                if keyword.lower() in text:
+                if keyword in text:
                     matched_categories.append(category)
-                    self.logger.debug(f"Matched category '{category}' with keyword '{keyword}'")
+                    if debug_enabled:
+                        self.logger.debug(f"Matched category '{category}' with keyword '{keyword}'")
                     break  # 한 카테고리당 한 번만 매칭
         
-        if matched_categories:
-            self.logger.info(f"Found {len(matched_categories)} matching categories")
-        else:
-            self.logger.info("No matching categories found")
-            
+        self.record(matched_categories)
         return matched_categories
+
+    def record(self, categories: List[str]):
+        """분류 결과를 배치 요약에 집계합니다. 다른 프로세스에서 분류한 결과도 여기로 모읍니다."""
+        # 건별 로그 대신 배치 요약으로 집계
+        run = metrics.current()
+        self.summary.add('papers')
+        run.inc('papers_categorized')
+        if categories:
+            for category in categories:
+                self.summary.add(category)
+                run.inc('category_assignments', category=category)
+        else:
+            self.summary.add('uncategorized')
+            run.inc('category_assignments', category='uncategorized')
         
     def get_category_stats(self, papers: List[Dict]) -> Dict[str, int]:
         """논문 리스트에서 카테고리별 통계를 계산합니다."""
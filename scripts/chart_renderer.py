@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from scripts.logger import setup_logging, worker_logging
+
+
+def draw_chart(kind: str, data: pd.DataFrame, title: str, xlabel: str = '', ylabel: str = '') -> Figure:
+    """
+    pyplot 전역 상태 없이 Agg 캔버스에 차트를 그립니다.
+    kind: 'line' (인덱스별 시계열), 'bar' (세로 막대), 'barh' (가로 막대)
+    """
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+
+    if kind == 'line':
+        for column in data.columns:
+            ax.plot([str(x) for x in data.index], data[column], marker='o', label=str(column))
+        if len(data.columns) > 0:
+            ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.tick_params(axis='x', labelrotation=45)
+    elif kind == 'bar':
+        ax.bar([str(x) for x in data.index], data.iloc[:, 0])
+        ax.tick_params(axis='x', labelrotation=45)
+    elif kind == 'barh':
+        ax.barh([str(x) for x in data.index][::-1], data.iloc[:, 0][::-1])
+    else:
+        raise ValueError(f"Unknown chart kind: {kind}")
+
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    return fig
+
+
+def _render_to_file(spec: Dict[str, Any], path: str) -> str:
+    """워커 프로세스에서 차트 하나를 그려 파일로 저장합니다."""
+    fig = draw_chart(spec['kind'], spec['data'], spec['title'], spec.get('xlabel', ''), spec.get('ylabel', ''))
+    fig.savefig(path)
+    return path
+
+
+def chart_hash(spec: Dict[str, Any]) -> str:
+    """차트 입력 데이터와 설정의 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    for key in ('kind', 'title', 'xlabel', 'ylabel'):
+        digest.update(str(spec.get(key, '')).encode('utf-8'))
+    data = spec['data']
+    digest.update(json.dumps([str(c) for c in data.columns]).encode('utf-8'))
+    if not data.empty:
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ChartRenderer:
+    """여러 차트를 워커 프로세스 풀에서 렌더링하고, 입력이 바뀌지 않은 차트는 건너뜁니다."""
+
+    MANIFEST_NAME = '.chart_manifest.json'
+
+    def __init__(self, output_dir: str, workers: Optional[int] = None):
+        self.logger = setup_logging(__name__)
+        self.output_dir = output_dir
+        self.workers = workers
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_NAME)
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, str]):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def render(self, specs: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        차트 명세 목록을 렌더링하고 {차트 이름: 파일 경로}를 반환합니다.
+        각 명세는 name, kind, title, data(DataFrame)와 선택적으로 xlabel, ylabel을 가집니다.
+        """
+        manifest = self._load_manifest()
+        paths = {}
+        pending = []
+
+        for spec in specs:
+            path = os.path.join(self.output_dir, f"{spec['name']}.png")
+            paths[spec['name']] = path
+            if spec['data'].empty:
+                self.logger.warning(f"No data available for chart '{spec['name']}'")
+                paths.pop(spec['name'])
+                continue
+            digest = chart_hash(spec)
+            if manifest.get(spec['name']) == digest and os.path.exists(path):
+                continue
+            pending.append((spec, path, digest))
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers, **worker_logging()) as executor:
+                futures = [(spec, digest, executor.submit(_render_to_file, spec, path))
+                           for spec, path, digest in pending]
+                for spec, digest, future in futures:
+                    try:
+                        future.result()
+                        manifest[spec['name']] = digest
+                    except Exception as e:
+                        self.logger.error(f"Error rendering chart '{spec['name']}': {str(e)}")
+                        paths.pop(spec['name'], None)
+            self._save_manifest(manifest)
+
+        self.logger.info(f"Rendered {len(pending)} charts, {len(specs) - len(pending)} unchanged or skipped")
+        return paths
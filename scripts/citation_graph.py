@@ -0,0 +1,242 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+from scipy import sparse
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert
+
+from scripts import metrics
+from scripts.database import Paper, AppState, CitationEdge, CitationFetch, CitationRank
+from scripts.logger import setup_logging
+
+REFS_LINK = 'pubmed_pubmed_refs'
+CITED_IN_LINK = 'pubmed_pubmed_citedin'
+
+
+def pagerank(src: np.ndarray, dst: np.ndarray, n: int, x0: np.ndarray = None, damping: float = 0.85,
+             tolerance: float = 1e-10, max_iterations: int = 100) -> Tuple[np.ndarray, int]:
+    """
+    희소 행렬 거듭제곱법으로 PageRank를 계산합니다. 간선은 src가 dst를 인용하는 방향입니다.
+    나가는 간선이 없는 노드(참고문헌을 모르는 논문)의 점수는 모든 노드에 고르게 나눕니다.
+    x0(이전 점수)를 주면 거기서 시작하므로 간선이 조금 늘었을 때는 몇 번의 반복으로 수렴합니다.
+    (점수, 반복 횟수)를 반환합니다.
+    """
+    out_degree = np.bincount(src, minlength=n)
+    transition = sparse.csr_matrix((1.0 / out_degree[src], (dst, src)), shape=(n, n))
+    dangling = out_degree == 0
+    x = np.full(n, 1.0 / n) if x0 is None else x0 / x0.sum()
+    for iteration in range(1, max_iterations + 1):
+        x_next = damping * (transition @ x + x[dangling].sum() / n) + (1.0 - damping) / n
+        error = np.abs(x_next - x).sum()
+        x = x_next
+        if error < tolerance * n:
+            break
+    return x, iteration
+
+
+class CitationGraph:
+    """
+    elink로 말뭉치 논문의 참고문헌·피인용 관계를 묶음 단위로 받아 citation_edges에 쌓고,
+    간선이 늘면 PageRank와 피인용 수를 다시 계산해 citation_ranks에 저장합니다.
+    조회 기록(citation_fetches)이 refresh_days보다 새로우면 elink를 다시 호출하지 않습니다.
+    """
+
+    EDGES_VERSION_KEY = 'citation_edges_version'
+    RANKS_VERSION_KEY = 'citation_ranks_version'
+
+    def __init__(self, crawler, db_manager, state_dir: str = None):
+        self.logger = setup_logging(__name__)
+        self.crawler = crawler
+        self.db_manager = db_manager
+        self.config = self._load_config()
+        self.batch_size = self.config.get('batch_size', 200)
+        self.workers = self.config.get('workers', 3)
+        self.refresh_days = self.config.get('refresh_days', 30)
+        self.max_papers = self.config.get('max_papers_per_run', 5000)
+        self.damping = self.config.get('damping', 0.85)
+        self.tolerance = self.config.get('tolerance', 1e-10)
+        self.max_iterations = self.config.get('max_iterations', 100)
+        # 다음 계산의 시작점으로 쓰는 전체 노드(말뭉치 밖 PMID 포함) 점수
+        self.state_path = os.path.join(
+            state_dir or os.path.join(os.path.dirname(os.path.abspath(db_manager.db_path)), 'citations'),
+            'pagerank.npz'
+        )
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 citations 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('citations') or {}
+
+    def enrich(self, today: date = None) -> Dict[str, Any]:
+        """
+        조회할 때가 된 논문의 인용 관계를 받아 저장하고 순위를 갱신합니다.
+        묶음별 elink 실패는 오류 수로만 집계하며, 실패한 논문은 다음 실행에서 다시 조회합니다.
+        """
+        today = today or date.today()
+        run = metrics.current()
+        session = self.db_manager.Session()
+        try:
+            pmids = self._due_pmids(session, today)
+        finally:
+            session.close()
+
+        batches = [pmids[start:start + self.batch_size] for start in range(0, len(pmids), self.batch_size)]
+        self.logger.info(f"Fetching citation links for {len(pmids)} papers in {len(batches)} batches")
+        fetched = new_edges = errors = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._fetch_batch, batch): batch for batch in batches}
+            # 저장은 SQLite 쓰기가 하나뿐이도록 이 스레드에서 직렬로 수행
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    refs, cited_in = future.result()
+                    new_edges += self._store_batch(today, batch, refs, cited_in)
+                    fetched += len(batch)
+                except Exception as e:
+                    errors += 1
+                    self.logger.error(f"Citation links for {len(batch)} papers failed: {str(e)}")
+
+        run.inc('citation_papers_fetched', fetched)
+        run.inc('citation_edges_added', new_edges)
+        run.inc('citation_batch_errors', errors)
+        result = {'papers': fetched, 'new_edges': new_edges, 'errors': errors}
+        result.update(self.update_ranks())
+        self.logger.info(f"Citation enrichment: {fetched} papers, {new_edges} new edges, {errors} failed batches")
+        return result
+
+    def _due_pmids(self, session, today: date) -> List[str]:
+        """한 번도 조회하지 않은 논문부터, 조회한 지 refresh_days가 지난 논문 순으로 최대 max_papers개"""
+        stale = today - timedelta(days=self.refresh_days)
+        rows = (session.query(Paper.pmid)
+                .outerjoin(CitationFetch, CitationFetch.pmid == Paper.pmid)
+                .filter(or_(CitationFetch.pmid.is_(None), CitationFetch.fetched_date <= stale))
+                .filter(~Paper.pmid.op('GLOB')('*[^0-9]*'))
+                .order_by(CitationFetch.fetched_date.isnot(None), CitationFetch.fetched_date, Paper.id)
+                .limit(self.max_papers)
+                .all())
+        return [row[0] for row in rows]
+
+    def _fetch_batch(self, pmids: List[str]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """작업 스레드: 묶음의 참고문헌과 피인용 관계를 요청합니다 (요청 속도는 크롤러가 스레드 간에 제한)."""
+        return self.crawler.fetch_links(pmids, REFS_LINK), self.crawler.fetch_links(pmids, CITED_IN_LINK)
+
+    def _store_batch(self, today: date, pmids: List[str], refs: Dict[str, List[str]],
+                     cited_in: Dict[str, List[str]]) -> int:
+        """묶음의 간선과 조회 기록을 한 트랜잭션으로 저장하고 새로 추가된 간선 수를 반환합니다."""
+        edges = {(int(pmid), int(ref)) for pmid in pmids for ref in refs.get(pmid, []) if ref.isdigit()}
+        edges.update((int(citer), int(pmid)) for pmid in pmids for citer in cited_in.get(pmid, []) if citer.isdigit())
+        started = time.perf_counter()
+        session = self.db_manager.Session()
+        try:
+            added = 0
+            if edges:
+                # ORM 일괄 삽입은 rowcount를 돌려주지 않으므로 테이블에 직접 실행
+                added = session.execute(
+                    insert(CitationEdge.__table__).on_conflict_do_nothing(),
+                    [{'citing_pmid': citing, 'cited_pmid': cited} for citing, cited in edges]
+                ).rowcount
+            fetches = insert(CitationFetch)
+            session.execute(
+                fetches.on_conflict_do_update(index_elements=['pmid'], set_={
+                    'fetched_date': fetches.excluded.fetched_date,
+                    'refs_count': fetches.excluded.refs_count,
+                    'cited_by_count': fetches.excluded.cited_by_count,
+                }),
+                [{'pmid': pmid, 'fetched_date': today, 'refs_count': len(refs.get(pmid, [])),
+                  'cited_by_count': len(cited_in.get(pmid, []))} for pmid in pmids]
+            )
+            if added:
+                version = session.get(AppState, self.EDGES_VERSION_KEY)
+                session.merge(AppState(key=self.EDGES_VERSION_KEY,
+                                       value=str(int(version.value) + 1 if version else 1)))
+            session.commit()
+            metrics.current().observe('citation_store_batch_seconds', time.perf_counter() - started)
+            return added
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def update_ranks(self, force: bool = False) -> Dict[str, Any]:
+        """
+        간선이 마지막 계산 이후 늘었을 때만 전체 그래프의 PageRank와 피인용 수를 다시 계산합니다.
+        이전 점수에서 시작하므로 새 간선이 적으면 적은 반복으로 끝납니다.
+        """
+        session = self.db_manager.Session()
+        try:
+            edges_version = session.get(AppState, self.EDGES_VERSION_KEY)
+            ranks_version = session.get(AppState, self.RANKS_VERSION_KEY)
+            edges_version = edges_version.value if edges_version else None
+            if edges_version is None or (not force and ranks_version and ranks_version.value == edges_version):
+                return {'ranked': 0, 'iterations': 0}
+
+            started = time.perf_counter()
+            edges = np.array(session.execute(select(CitationEdge.citing_pmid, CitationEdge.cited_pmid)).fetchall(),
+                             dtype=np.int64).reshape(-1, 2)
+            nodes, index = np.unique(edges, return_inverse=True)
+            index = index.reshape(-1, 2)
+            src, dst = index[:, 0], index[:, 1]
+            scores, iterations = pagerank(src, dst, len(nodes), self._warm_start(nodes), self.damping,
+                                          self.tolerance, self.max_iterations)
+            cited_by = np.bincount(dst, minlength=len(nodes))
+
+            # 정렬에 쓰는 말뭉치 논문의 점수만 DB에 저장
+            corpus = np.array([int(row[0]) for row in session.query(Paper.pmid)
+                               .filter(~Paper.pmid.op('GLOB')('*[^0-9]*'))], dtype=np.int64)
+            positions = np.searchsorted(nodes, corpus)
+            in_graph = positions < len(nodes)
+            in_graph[in_graph] = nodes[positions[in_graph]] == corpus[in_graph]
+            session.query(CitationRank).delete(synchronize_session=False)
+            rows = [{'pmid': str(pmid), 'pagerank': float(scores[position]), 'cited_by': int(cited_by[position])}
+                    for pmid, position in zip(corpus[in_graph], positions[in_graph])]
+            if rows:
+                session.execute(insert(CitationRank), rows)
+            # 순위 버전은 조회 캐시·API ETag의 데이터 버전에 포함되고, 수집 버전은 분석 캐시와 Last-Modified를 갱신
+            session.merge(AppState(key=self.RANKS_VERSION_KEY, value=edges_version))
+            self.db_manager._record_ingest(session)
+            session.commit()
+            self._save_state(nodes, scores)
+
+            seconds = time.perf_counter() - started
+            run = metrics.current()
+            run.set_gauge('citation_graph_nodes', len(nodes))
+            run.set_gauge('citation_graph_edges', len(edges))
+            run.set_gauge('pagerank_iterations', iterations)
+            run.observe('pagerank_seconds', seconds)
+            self.logger.info(f"PageRank over {len(nodes)} nodes / {len(edges)} edges: "
+                             f"{iterations} iterations in {seconds:.2f}s, {len(rows)} corpus papers ranked")
+            return {'ranked': len(rows), 'iterations': iterations}
+        except Exception as e:
+            self.logger.error(f"Error updating citation ranks: {str(e)}")
+            session.rollback()
+            return {'ranked': 0, 'iterations': 0}
+        finally:
+            session.close()
+
+    def _warm_start(self, nodes: np.ndarray) -> Optional[np.ndarray]:
+        """이전 계산의 점수를 현재 노드 순서에 맞춥니다. 새 노드는 평균 점수에서 시작합니다."""
+        try:
+            with np.load(self.state_path) as state:
+                previous_nodes, previous_scores = state['nodes'], state['scores']
+        except (OSError, KeyError, ValueError):
+            return None
+        if not len(previous_nodes):
+            return None
+        x = np.full(len(nodes), 1.0 / len(nodes))
+        positions = np.minimum(np.searchsorted(previous_nodes, nodes), len(previous_nodes) - 1)
+        known = previous_nodes[positions] == nodes
+        x[known] = previous_scores[positions[known]]
+        return x
+
+    def _save_state(self, nodes: np.ndarray, scores: np.ndarray):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = self.state_path + '.tmp.npz'
+        np.savez(tmp_path, nodes=nodes, scores=scores)
+        os.replace(tmp_path, self.state_path)
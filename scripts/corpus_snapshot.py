@@ -0,0 +1,329 @@
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from scripts.database import Paper, Category, Topic, CitationRank, paper_categories, paper_topics, exclude_duplicates
+from scripts.logger import setup_logging
+
+# 스냅샷이 처리할 수 있는 필터와 meta.json의 코드표 이름 (검색어·수집일 등 나머지 조건은 SQL로 조회)
+FACETS = {'category': 'categories', 'year': 'years', 'topic': 'topics'}
+ARRAYS = ('paper_id', 'pmid', 'journal', 'year', 'title_offsets', 'titles', 'pagerank', 'cited_by',
+          'category_bits', 'year_bits', 'topic_bits')
+
+# 바이트별 1의 개수 (numpy 2.0 이전에는 np.bitwise_count가 없음)
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> int:
+    """uint64 비트셋의 1의 개수"""
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+    return int(_POPCOUNT_TABLE[bits.view(np.uint8)].sum(dtype=np.int64))
+
+
+def pack_rows(rows: np.ndarray, n: int) -> np.ndarray:
+    """행 번호 배열을 n비트 비트셋(little-endian uint64 단어)으로 만듭니다."""
+    mask = np.zeros(-(-n // 64) * 64, dtype=bool)
+    mask[rows] = True
+    return np.packbits(mask, bitorder='little').view('<u8')
+
+
+class CorpusSnapshot:
+    """
+    뷰어용 말뭉치 열 지향 스냅샷. 중복을 제외한 논문을 수집순(id)으로 한 행씩 두고
+    저널·연도는 정수 코드로, 제목은 하나의 UTF-8 버퍼와 오프셋으로, 카테고리·연도·주제는 값별 비트셋으로 저장합니다.
+    패싯 필터는 비트셋 AND, 개수는 popcount로 계산하므로 DB 조회 없이 즉시 답합니다.
+
+    배열은 snapshot_dir 아래 버전별 하위 디렉터리의 .npy 파일로, 코드표와 데이터 버전, 그 디렉터리 이름은
+    meta.json으로 저장되어 다음 실행에서는 memmap으로 열기만 합니다.
+    데이터 버전(수집 버전과 인용 순위 버전)이 바뀌면 DB에서 다시 만들므로 PageRank·피인용 수 열도 최신으로 유지됩니다.
+    숫자가 아닌 PMID는 pmid 배열에 -1로 두고 원래 값은 meta.json의 text_pmids(행 번호 → PMID)에 둡니다.
+    """
+
+    def __init__(self, snapshot_dir: str):
+        self.logger = setup_logging(__name__)
+        self.snapshot_dir = snapshot_dir
+        self.meta_path = os.path.join(snapshot_dir, 'meta.json')
+        self.version = None
+        self.meta: Dict[str, Any] = {}
+        self.arrays: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def load(self, db_manager) -> bool:
+        """
+        DB의 데이터 버전에 맞는 스냅샷을 준비합니다. 메모리에 있거나 디스크의 스냅샷이 최신이면 그대로 쓰고,
+        아니면 DB에서 다시 만들어 저장합니다. 실패하면 False를 반환하며, 호출자는 SQL 조회로 대신합니다.
+        """
+        version = db_manager.get_data_version()
+        with self._lock:
+            if self.version == version:
+                return True
+            try:
+                if not self._open(version):
+                    self._build(db_manager, version)
+                    if not db_manager.read_only:
+                        self._save()
+                return True
+            except Exception as e:
+                self.logger.error(f"Error loading corpus snapshot: {str(e)}")
+                self.version = None
+                return False
+
+    def _open(self, version: str) -> bool:
+        """디스크의 스냅샷이 주어진 데이터 버전이면 배열을 memmap으로 엽니다."""
+        if not os.path.exists(self.meta_path):
+            return False
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('data_version') != version or 'dir' not in meta:
+            return False
+        array_dir = os.path.join(self.snapshot_dir, meta['dir'])
+        arrays = {name: np.load(os.path.join(array_dir, f"{name}.npy"), mmap_mode='r') for name in ARRAYS}
+        if len(arrays['paper_id']) != meta['papers']:
+            return False
+        self.meta, self.arrays, self.version = meta, arrays, version
+        self.logger.debug(f"Opened corpus snapshot v{version} ({meta['papers']} papers)")
+        return True
+
+    def _build(self, db_manager, version: str):
+        """DB에서 중복을 제외한 논문을 수집순으로 읽어 열 배열과 비트셋을 만듭니다."""
+        session = db_manager.Session()
+        try:
+            paper_ids, pmids, journal_codes, year_codes, offsets, titles = [], [], [], [], [0], []
+            text_pmids: Dict[str, str] = {}
+            journals: Dict[str, int] = {}
+            years: Dict[str, int] = {}
+            size = 0
+            rows = (exclude_duplicates(session.query(Paper.id, Paper.pmid, Paper.title, Paper.journal_name,
+                                                     Paper.publication_year))
+                    .order_by(Paper.id)
+                    .yield_per(5000))
+            for paper_id, pmid, title, journal, year in rows:
+                if not pmid.isdigit():
+                    # citation_graph·similarity_index와 같이 숫자가 아닌 PMID는 정수 열에 넣지 않음
+                    text_pmids[str(len(pmids))] = pmid
+                paper_ids.append(paper_id)
+                pmids.append(int(pmid) if pmid.isdigit() else -1)
+                journal_codes.append(journals.setdefault(journal, len(journals)) if journal else -1)
+                year_codes.append(years.setdefault(year, len(years)) if year else -1)
+                encoded = (title or '').encode('utf-8')
+                titles.append(encoded)
+                size += len(encoded)
+                offsets.append(size)
+
+            n = len(paper_ids)
+            paper_id = np.array(paper_ids, dtype=np.int64)
+            pmid = np.array(pmids, dtype=np.int64)
+
+            def row_of(ids: np.ndarray) -> np.ndarray:
+                # 중복으로 빠진 논문의 연결 행은 버림
+                positions = np.searchsorted(paper_id, ids)
+                found = positions < n
+                found[found] = paper_id[positions[found]] == ids[found]
+                return positions[found]
+
+            def facet_bits(pairs, codes: Dict[str, int]) -> np.ndarray:
+                by_value: Dict[int, List[int]] = {}
+                for linked_id, value in pairs:
+                    by_value.setdefault(codes.setdefault(value, len(codes)), []).append(linked_id)
+                bits = np.zeros((len(codes), -(-n // 64)), dtype='<u8')
+                for code, linked in by_value.items():
+                    bits[code] = pack_rows(row_of(np.array(linked, dtype=np.int64)), n)
+                return bits
+
+            categories: Dict[str, int] = {}
+            category_bits = facet_bits(
+                session.query(paper_categories.c.paper_id, Category.name)
+                .join(Category, Category.id == paper_categories.c.category_id)
+                .order_by(Category.name), categories)
+            topics: Dict[str, int] = {}
+            topic_bits = facet_bits(
+                session.query(paper_topics.c.paper_id, Topic.key)
+                .join(Topic, Topic.id == paper_topics.c.topic_id)
+                .order_by(Topic.key), topics)
+            year_code = np.array(year_codes, dtype=np.int32)
+            year_bits = np.zeros((len(years), -(-n // 64)), dtype='<u8')
+            for code in range(len(years)):
+                year_bits[code] = pack_rows(np.flatnonzero(year_code == code), n)
+
+            pagerank = np.zeros(n, dtype=np.float64)
+            cited_by = np.zeros(n, dtype=np.int32)
+            ranks = [row for row in session.query(CitationRank.pmid, CitationRank.pagerank, CitationRank.cited_by)
+                     if row[0].isdigit()]
+            if ranks and n:
+                order = np.argsort(pmid)
+                rank_pmids = np.array([row[0] for row in ranks], dtype=np.int64)
+                positions = np.minimum(np.searchsorted(pmid, rank_pmids, sorter=order), n - 1)
+                found = pmid[order[positions]] == rank_pmids
+                pagerank[order[positions[found]]] = np.array([row[1] for row in ranks], dtype=np.float64)[found]
+                cited_by[order[positions[found]]] = np.array([row[2] for row in ranks], dtype=np.int32)[found]
+        finally:
+            session.close()
+
+        arrays = {
+            'paper_id': paper_id,
+            'pmid': pmid,
+            'journal': np.array(journal_codes, dtype=np.int32),
+            'year': year_code.astype(np.int16),
+            'title_offsets': np.array(offsets, dtype=np.int64),
+            'titles': np.frombuffer(b''.join(titles), dtype=np.uint8),
+            'pagerank': pagerank,
+            'cited_by': cited_by,
+            'category_bits': category_bits,
+            'year_bits': year_bits,
+            'topic_bits': topic_bits,
+        }
+        meta = {
+            'data_version': version,
+            'papers': n,
+            'journals': list(journals),
+            'years': list(years),
+            'categories': list(categories),
+            'topics': list(topics),
+            'text_pmids': text_pmids,
+        }
+        # 뷰어의 다른 스레드가 읽는 중일 수 있으므로 한 번에 교체
+        self.meta, self.arrays, self.version = meta, arrays, version
+        self.logger.info(f"Built corpus snapshot v{version}: {n} papers, {len(journals)} journals, "
+                         f"{len(categories)} categories")
+
+    def _save(self):
+        """
+        배열을 이 버전만의 하위 디렉터리에 모두 쓴 뒤, 그 디렉터리를 가리키는 meta.json을 한 번에 교체합니다.
+        meta.json이 바뀌기 전에는 이전 버전의 배열과 meta가 그대로이므로
+        도중에 중단되거나 다른 프로세스가 읽는 중이어도 서로 다른 버전의 배열이 섞이지 않습니다.
+        """
+        array_dir_name = f"v{self.version}-{os.getpid()}"
+        array_dir = os.path.join(self.snapshot_dir, array_dir_name)
+        shutil.rmtree(array_dir, ignore_errors=True)
+        os.makedirs(array_dir)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(array_dir, f"{name}.npy"), array)
+        self.meta = dict(self.meta, dir=array_dir_name)
+        with open(f"{self.meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(f"{self.meta_path}.tmp", self.meta_path)
+        self._remove_stale(array_dir_name)
+
+    def _remove_stale(self, current: str):
+        """
+        현재 버전이 아닌 배열 디렉터리와 이전 형식(최상위 .npy)을 지웁니다.
+        다른 프로세스가 memmap으로 열고 있어 지울 수 없는 파일(Windows)은 다음 저장 때 다시 시도합니다.
+        """
+        for entry in os.listdir(self.snapshot_dir):
+            path = os.path.join(self.snapshot_dir, entry)
+            if entry != current and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif entry.endswith('.npy'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def supports(self, filters: Dict[str, Any] = None, sort: str = 'id') -> bool:
+        """스냅샷만으로 답할 수 있는 조회인지 (수집순 정렬과 패싯 필터만 사용) 확인합니다."""
+        return self.version is not None and sort == 'id' and \
+            all(key in FACETS for key, value in (filters or {}).items() if value)
+
+    def _bits(self, facet: str, value: Any) -> Optional[np.ndarray]:
+        """패싯 값의 비트셋. 값이 스냅샷에 없으면 None"""
+        codes = self.meta[FACETS[facet]]
+        value = str(value)
+        if value not in codes:
+            return None
+        return self.arrays[f"{facet}_bits"][codes.index(value)]
+
+    def mask(self, filters: Dict[str, Any] = None, exclude: str = None) -> np.ndarray:
+        """패싯 필터를 만족하는 행의 비트셋. exclude로 지정한 패싯 조건은 무시합니다."""
+        n = self.meta['papers']
+        mask = np.zeros(-(-n // 64), dtype='<u8')
+        if n:
+            mask[:] = np.uint64(0xFFFFFFFFFFFFFFFF)
+            if n % 64:
+                mask[-1] = np.uint64((1 << (n % 64)) - 1)
+        for facet in FACETS:
+            value = (filters or {}).get(facet)
+            if not value or facet == exclude:
+                continue
+            bits = self._bits(facet, value)
+            if bits is None:
+                return np.zeros_like(mask)
+            mask &= bits
+        return mask
+
+    def count(self, filters: Dict[str, Any] = None) -> int:
+        """필터에 맞는 논문 수"""
+        return popcount(self.mask(filters))
+
+    def facet_counts(self, facet: str, filters: Dict[str, Any] = None) -> Dict[str, int]:
+        """
+        다른 패싯 조건을 적용했을 때 facet의 값별 논문 수 (0편인 값은 제외).
+        해당 패싯 자신의 조건은 빼고 세므로 선택을 바꿨을 때의 결과 수를 미리 보여줄 수 있습니다.
+        """
+        mask = self.mask(filters, exclude=facet)
+        codes = self.meta[FACETS[facet]]
+        bits = self.arrays[f"{facet}_bits"]
+        counts = {value: popcount(bits[code] & mask) for code, value in enumerate(codes)}
+        return {value: count for value, count in counts.items() if count}
+
+    def stats(self) -> Dict[str, Any]:
+        """DatabaseManager.get_corpus_stats와 같은 형식의 통계"""
+        years = sorted(self.meta['years'], reverse=True)
+        return {
+            'total_papers': self.meta['papers'],
+            'journal_count': len(self.meta['journals']),
+            'min_year': years[-1] if years else None,
+            'max_year': years[0] if years else None,
+            'years': years,
+            'category_counts': self.facet_counts('category'),
+            'topic_counts': self.facet_counts('topic'),
+        }
+
+    def title(self, row: int) -> str:
+        offsets = self.arrays['title_offsets']
+        return bytes(self.arrays['titles'][offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def page(self, filters: Dict[str, Any] = None, descending: bool = True, after: tuple = None,
+             before: tuple = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        DatabaseManager.get_papers_page(sort='id')와 같은 형식의 한 페이지.
+        key도 같은 형식((id, id))이므로 이어지는 페이지를 DB에서 조회해도 됩니다.
+        """
+        n = self.meta['papers']
+        rows = np.flatnonzero(np.unpackbits(self.mask(filters).view(np.uint8), bitorder='little')[:n])
+        ids = self.arrays['paper_id'][rows]
+        # 행은 id 오름차순이므로 경계 id로 구간을 자름
+        if after is not None:
+            rows = rows[:np.searchsorted(ids, after[1])] if descending else rows[np.searchsorted(ids, after[1], 'right'):]
+        if before is not None:
+            ids = self.arrays['paper_id'][rows]
+            rows = rows[np.searchsorted(ids, before[1], 'right'):] if descending else rows[:np.searchsorted(ids, before[1])]
+        if descending:
+            rows = rows[::-1]
+        rows = rows[-limit:] if before is not None else rows[:limit]
+
+        journals, years, categories = self.meta['journals'], self.meta['years'], self.meta['categories']
+        text_pmids = self.meta.get('text_pmids') or {}
+        category_bits = self.arrays['category_bits']
+        page = []
+        for row in rows.tolist():
+            word, bit = row >> 6, np.uint64(1 << (row & 63))
+            paper_id = int(self.arrays['paper_id'][row])
+            journal, year = int(self.arrays['journal'][row]), int(self.arrays['year'][row])
+            page.append({
+                'id': paper_id,
+                'pmid': text_pmids.get(str(row)) or str(self.arrays['pmid'][row]),
+                'title': self.title(row),
+                'year': years[year] if year >= 0 else None,
+                'journal': journals[journal] if journal >= 0 else None,
+                'categories': ', '.join(name for code, name in enumerate(categories)
+                                        if category_bits[code, word] & bit),
+                'pagerank': float(self.arrays['pagerank'][row]),
+                'cited_by': int(self.arrays['cited_by'][row]),
+                'key': (paper_id, paper_id),
+            })
+        return page
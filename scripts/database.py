@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Date, ForeignKey, Table
+from sqlalchemy import select, text, inspect, column, func, create_engine, Column, Integer, String, Text, Date, ForeignKey, Table, LargeBinary, BigInteger, Boolean, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import os
+import re
+from pathlib import Path
 from datetime import datetime
 
 Base = declarative_base()
@@ -10,12 +12,35 @@ Base = declarative_base()
 paper_categories = Table(
     'paper_categories',
     Base.metadata,
-    Column('paper_id', Integer, ForeignKey('papers.id')),
-    Column('category_id', Integer, ForeignKey('categories.id'))
+    Column('paper_id', Integer, ForeignKey('papers.id'), index=True),
+    Column('category_id', Integer, ForeignKey('categories.id'), index=True)
+)
+
+# 논문과 수집 주제의 다대다 관계 (주제별 필터는 topic_id로 시작하는 기본 키 인덱스를 사용)
+paper_topics = Table(
+    'paper_topics',
+    Base.metadata,
+    Column('topic_id', Integer, ForeignKey('topics.id'), primary_key=True),
+    Column('paper_id', Integer, ForeignKey('papers.id'), primary_key=True),
+    Index('ix_paper_topics_paper_id', 'paper_id')
+)
+
+# 논문과 출판 유형의 다대다 관계 (유형별 필터는 기본 키 인덱스를 사용)
+paper_publication_types = Table(
+    'paper_publication_types',
+    Base.metadata,
+    Column('publication_type_id', Integer, ForeignKey('publication_types.id'), primary_key=True),
+    Column('paper_id', Integer, ForeignKey('papers.id'), primary_key=True),
+    Index('ix_paper_publication_types_paper_id', 'paper_id')
 )
 
 class Paper(Base):
     __tablename__ = 'papers'
+    # get_papers_page의 연도·저널순 키셋 페이지 ((정렬 값, id) 순서)
+    __table_args__ = (
+        Index('ix_papers_year_id', 'publication_year', 'id'),
+        Index('ix_papers_journal_id', 'journal_name', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     pmid = Column(String(20), unique=True, nullable=False)
@@ -25,11 +50,17 @@ class Paper(Base):
     journal_volume = Column(String(50))
     journal_issue = Column(String(50))
     publication_year = Column(String(4))
+    # created_date는 수집일, publication_date는 발행일(온라인 발행일 우선), entry_date는 PubMed 등록일
     created_date = Column(Date, default=datetime.now().date)
+    publication_date = Column(Date, index=True)
+    entry_date = Column(Date)
+    doi = Column(String(255), index=True)
     
     # 관계 설정
     authors = relationship("Author", secondary="paper_authors")
     categories = relationship("Category", secondary=paper_categories)
+    topics = relationship("Topic", secondary=paper_topics)
+    publication_types = relationship("PublicationType", secondary=paper_publication_types)
 
 class Author(Base):
     __tablename__ = 'authors'
@@ -53,8 +84,267 @@ class Category(Base):
     name = Column(String(50), unique=True, nullable=False)
     description = Column(Text)
 
+class Topic(Base):
+    """config.yaml의 topics에 정의된 수집 주제"""
+    __tablename__ = 'topics'
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(50), unique=True, nullable=False)
+    name = Column(String(255))
+
+class MeshDescriptor(Base):
+    """MeSH 기술어 (UI는 D로 시작하는 MeSH 고유 번호)"""
+    __tablename__ = 'mesh_descriptors'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), unique=True, nullable=False)
+    ui = Column(String(20))
+
+class MeshQualifier(Base):
+    """MeSH 세부 표목 (UI는 Q로 시작)"""
+    __tablename__ = 'mesh_qualifiers'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), unique=True, nullable=False)
+    ui = Column(String(20))
+
+class PaperMeshHeading(Base):
+    """논문의 MeSH 기술어. 기술어별 필터는 기본 키 인덱스를 사용"""
+    __tablename__ = 'paper_mesh_headings'
+
+    descriptor_id = Column(Integer, ForeignKey('mesh_descriptors.id'), primary_key=True)
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True, index=True)
+    major_topic = Column(Boolean, nullable=False, default=False)
+
+class PaperMeshQualifier(Base):
+    """논문의 MeSH 기술어에 붙은 세부 표목"""
+    __tablename__ = 'paper_mesh_qualifiers'
+
+    descriptor_id = Column(Integer, ForeignKey('mesh_descriptors.id'), primary_key=True)
+    qualifier_id = Column(Integer, ForeignKey('mesh_qualifiers.id'), primary_key=True)
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True, index=True)
+    major_topic = Column(Boolean, nullable=False, default=False)
+
+class PublicationType(Base):
+    """출판 유형 (Journal Article, Review, Randomized Controlled Trial 등)"""
+    __tablename__ = 'publication_types'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), unique=True, nullable=False)
+    ui = Column(String(20))
+
+class Affiliation(Base):
+    """저자 소속 기관 문자열"""
+    __tablename__ = 'affiliations'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(Text, unique=True, nullable=False)
+
+class PaperAffiliation(Base):
+    """논문 저자(author_order 순번)의 소속"""
+    __tablename__ = 'paper_affiliations'
+
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    author_order = Column(Integer, primary_key=True)
+    affiliation_id = Column(Integer, ForeignKey('affiliations.id'), primary_key=True, index=True)
+
+class PaperAbstractSection(Base):
+    """구조화 초록의 구획. 본문은 papers.abstract의 [start_offset, end_offset) 범위"""
+    __tablename__ = 'paper_abstract_sections'
+
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    label = Column(String(100))
+    category = Column(String(50), index=True)
+    start_offset = Column(Integer, nullable=False)
+    end_offset = Column(Integer, nullable=False)
+
+class CategoryPeriodCount(Base):
+    """카테고리 × 기간(월/주/분기)별 논문 수 집계 큐브"""
+    __tablename__ = 'category_period_counts'
+
+    granularity = Column(String(10), primary_key=True)
+    period = Column(String(10), primary_key=True)
+    category_id = Column(Integer, ForeignKey('categories.id'), primary_key=True)
+    period_start = Column(Date, nullable=False, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class TermSketch(Base):
+    """월별 용어 문서 빈도를 담은 count-min sketch와 그달의 빈출 후보 용어 목록"""
+    __tablename__ = 'term_sketches'
+
+    month = Column(String(7), primary_key=True)
+    doc_count = Column(Integer, nullable=False, default=0)
+    counts = Column(LargeBinary, nullable=False)
+    top_terms = Column(LargeBinary)
+
+class PaperSignature(Base):
+    """근사 중복 탐지를 위한 논문별 MinHash 시그니처"""
+    __tablename__ = 'paper_signatures'
+
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+class LSHBucket(Base):
+    """MinHash 밴드별 LSH 버킷"""
+    __tablename__ = 'lsh_buckets'
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+
+class PaperDuplicate(Base):
+    """근사 중복으로 판정된 논문과 대표 논문의 연결"""
+    __tablename__ = 'paper_duplicates'
+
+    paper_id = Column(Integer, ForeignKey('papers.id'), primary_key=True)
+    canonical_id = Column(Integer, ForeignKey('papers.id'), nullable=False, index=True)
+    similarity = Column(Float)
+
+class PaperSummary(Base):
+    """요약기 버전별 논문 요약 캐시"""
+    __tablename__ = 'paper_summaries'
+
+    pmid = Column(String(20), primary_key=True)
+    version = Column(String(50), primary_key=True)
+    summary = Column(Text, nullable=False)
+
+class CitationEdge(Base):
+    """elink로 받은 인용 관계 (citing_pmid가 cited_pmid를 인용). 말뭉치 밖 PMID도 포함"""
+    __tablename__ = 'citation_edges'
+
+    citing_pmid = Column(BigInteger, primary_key=True)
+    cited_pmid = Column(BigInteger, primary_key=True, index=True)
+
+class CitationFetch(Base):
+    """논문별 elink 조회 기록. refresh_days가 지나기 전에는 다시 조회하지 않음"""
+    __tablename__ = 'citation_fetches'
+
+    pmid = Column(String(20), primary_key=True)
+    fetched_date = Column(Date, nullable=False, index=True)
+    refs_count = Column(Integer, nullable=False, default=0)
+    cited_by_count = Column(Integer, nullable=False, default=0)
+
+class CitationRank(Base):
+    """말뭉치 논문의 인용 그래프 PageRank와 피인용 수 (정렬용)"""
+    __tablename__ = 'citation_ranks'
+
+    pmid = Column(String(20), primary_key=True)
+    pagerank = Column(Float, nullable=False, index=True)
+    cited_by = Column(Integer, nullable=False, default=0, index=True)
+
+class AppState(Base):
+    """수집 버전, 워터마크 등 애플리케이션 상태를 저장하는 키-값 테이블"""
+    __tablename__ = 'app_state'
+
+    key = Column(String(100), primary_key=True)
+    value = Column(Text)
+
+class PipelineRun(Base):
+    """수집·갱신 실행 기록 (단계별 시간과 계측 값은 JSON으로 저장)"""
+    __tablename__ = 'pipeline_runs'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+    started_at = Column(String(30), nullable=False, index=True)
+    finished_at = Column(String(30))
+    status = Column(String(20), nullable=False)
+    error = Column(Text)
+    duration_seconds = Column(Float)
+    metrics = Column(Text)
+
+def exclude_duplicates(query):
+    """근사 중복으로 판정된 논문을 제외하도록 Paper 쿼리를 제한합니다."""
+    return query.filter(Paper.id.notin_(select(PaperDuplicate.paper_id)))
+
+def trend_date():
+    """
+    트렌드 집계 기준일 SQL 식: 발행일, 발행일이 없는 기존 논문은 수집일.
+    인쇄본 발행일이 수집일보다 늦게 잡힌 경우에는 수집일을 사용합니다 (trend_day와 같은 규칙).
+    """
+    return func.min(func.coalesce(Paper.publication_date, Paper.created_date), Paper.created_date)
+
+def trend_day(publication_date, ingest_date):
+    """trend_date와 같은 규칙으로 수집 중인 논문의 트렌드 집계 기준일을 계산합니다."""
+    return min(publication_date or ingest_date, ingest_date)
+
+# 제목·초록 전문 검색용 FTS5 색인 (papers 테이블을 외부 콘텐츠로 사용하고 트리거로 동기화)
+PAPERS_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+        title, abstract, content='papers', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+        INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.id, old.title, old.abstract);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE ON papers BEGIN
+        INSERT INTO papers_fts(papers_fts, rowid, title, abstract) VALUES ('delete', old.id, old.title, old.abstract);
+        INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+    END""",
+]
+
+def fts_match_expression(search_text):
+    """검색어의 각 단어를 접두어 검색으로 바꾸어 모두 포함하는 FTS5 MATCH 식을 만듭니다."""
+    words = re.findall(r'\w+', search_text.lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+def filter_by_search(query, search_text):
+    """제목·초록에 검색어가 들어 있는 논문만 남기도록 Paper 쿼리를 제한합니다."""
+    expression = fts_match_expression(search_text or '')
+    if not expression:
+        return query
+    matches = (text("SELECT rowid FROM papers_fts WHERE papers_fts MATCH :expression")
+               .bindparams(expression=expression)
+               .columns(column('rowid', Integer)))
+    return query.filter(Paper.id.in_(matches))
+
+def add_missing_columns(engine):
+    """
+    create_all은 기존 테이블에 새로 정의한 열을 추가하지 않으므로, 모델에는 있고 DB에는 없는 열을
+    ALTER TABLE ADD COLUMN으로 추가합니다. 새 열은 기본 키가 아니고 NULL을 허용해야 합니다.
+    추가한 (테이블, 열) 목록을 반환합니다.
+    """
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {col['name'] for col in inspector.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                if col.primary_key or not col.nullable:
+                    raise RuntimeError(f"Cannot add column {table.name}.{col.name} to an existing table")
+                column_type = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {column_type}'))
+                added.append((table.name, col.name))
+    return added
+
 def init_db(db_path):
     """데이터베이스 초기화 및 테이블 생성"""
     engine = create_engine(f'sqlite:///{db_path}')
     Base.metadata.create_all(engine)
+    add_missing_columns(engine)
+
+    # create_all은 기존 테이블에 새로 정의한 인덱스를 만들지 않으므로 따로 확인하여 생성
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    # 기존 DB에 전문 검색 색인이 없으면 만들고 현재 논문으로 채움
+    created = not inspect(engine).has_table('papers_fts')
+    with engine.begin() as conn:
+        for statement in PAPERS_FTS_DDL:
+            conn.execute(text(statement))
+        if created:
+            conn.execute(text("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')"))
     return engine
+
+def open_read_only(db_path, pool_size=5):
+    """스키마를 건드리지 않는 읽기 전용 연결 풀을 엽니다. DB는 init_db로 미리 만들어져 있어야 합니다."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    uri = Path(os.path.abspath(db_path)).as_uri()
+    return create_engine(f'sqlite:///{uri}?mode=ro&uri=true', pool_size=pool_size, max_overflow=pool_size,
+                         connect_args={'check_same_thread': False})
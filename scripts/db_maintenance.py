@@ -0,0 +1,191 @@
+import os
+import time
+from typing import Any, Dict, List
+
+import yaml
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from scripts import metrics
+from scripts.logger import setup_logging
+from scripts.summarizer import SUMMARIZER_VERSION
+
+# 참조하는 논문이 없어진 행을 지우는 쿼리 (이름 → SQL). 카테고리는 트렌드 큐브 행을 먼저 지움
+ORPHAN_CLEANUP = {
+    'authors': "DELETE FROM authors WHERE id NOT IN (SELECT author_id FROM paper_authors)",
+    'category_period_counts': "DELETE FROM category_period_counts WHERE category_id NOT IN "
+                              "(SELECT category_id FROM paper_categories WHERE category_id IS NOT NULL)",
+    'categories': "DELETE FROM categories WHERE id NOT IN "
+                  "(SELECT category_id FROM paper_categories WHERE category_id IS NOT NULL)",
+    'mesh_descriptors': "DELETE FROM mesh_descriptors WHERE id NOT IN (SELECT descriptor_id FROM paper_mesh_headings)",
+    'mesh_qualifiers': "DELETE FROM mesh_qualifiers WHERE id NOT IN (SELECT qualifier_id FROM paper_mesh_qualifiers)",
+    'publication_types': "DELETE FROM publication_types WHERE id NOT IN "
+                         "(SELECT publication_type_id FROM paper_publication_types)",
+    'affiliations': "DELETE FROM affiliations WHERE id NOT IN (SELECT affiliation_id FROM paper_affiliations)",
+    'paper_summaries': "DELETE FROM paper_summaries WHERE version != :summarizer_version "
+                       "OR pmid NOT IN (SELECT pmid FROM papers)",
+}
+
+
+class DatabaseMaintenance:
+    """
+    SQLite 유지보수: 고아 행 정리, 트렌드 집계 생성, 증분 VACUUM, ANALYZE/PRAGMA optimize, 무결성 검사, 테이블·인덱스 크기 보고.
+    VACUUM은 트랜잭션 밖에서만 실행되므로 모든 명령을 autocommit 연결에서 실행합니다.
+    수집과 동시에 실행하지 않도록 호출한 쪽에서 실행 잠금을 잡아야 합니다.
+    """
+
+    def __init__(self, db_manager):
+        self.logger = setup_logging(__name__)
+        self.db_manager = db_manager
+        self.config = self._load_config()
+        self.vacuum_pages = self.config.get('vacuum_pages')
+        self.full_integrity_check = self.config.get('full_integrity_check', False)
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 maintenance 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('maintenance') or {}
+
+    def _connect(self):
+        return self.db_manager.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+
+    def run(self) -> Dict[str, Any]:
+        """
+        모든 유지보수 단계를 순서대로 실행하고 결과를 반환합니다.
+        각 단계는 현재 실행(metrics)의 단계로 기록되며, 무결성 검사 실패는 예외로 알립니다.
+        """
+        run = metrics.current()
+        report: Dict[str, Any] = {'size_before': self.file_size()}
+        with run.stage('maintain_orphans'):
+            report['orphans_deleted'] = self.cleanup_orphans()
+        with run.stage('maintain_trends'):
+            # 버전이 바뀐 트렌드 큐브·용어 sketch를 읽기 전용 API가 쓸 수 있도록 미리 생성
+            report['trends_built'] = self.db_manager.ensure_trend_data()
+        with run.stage('maintain_vacuum'):
+            report['vacuum'] = self.incremental_vacuum()
+        with run.stage('maintain_analyze'):
+            self.analyze()
+        with run.stage('maintain_integrity'):
+            report['integrity'] = self.integrity_check()
+        report['size_after'] = self.file_size()
+        report['objects'] = self.size_report()
+
+        run.set_gauge('db_file_bytes', report['size_after'])
+        for name, count in report['orphans_deleted'].items():
+            run.inc('orphan_rows_deleted', count, table=name)
+        for item in report['objects']:
+            if item['bytes'] is not None:
+                run.set_gauge('db_object_bytes', item['bytes'], object=item['name'])
+        if report['integrity'] != ['ok']:
+            raise RuntimeError(f"Integrity check failed: {'; '.join(report['integrity'][:5])}")
+        return report
+
+    def file_size(self) -> int:
+        """DB 파일과 WAL 파일 크기의 합 (바이트)"""
+        path = self.db_manager.db_path
+        return sum(os.path.getsize(p) for p in (path, f"{path}-wal") if os.path.exists(p))
+
+    def cleanup_orphans(self) -> Dict[str, int]:
+        """어떤 논문도 참조하지 않는 저자·카테고리·MeSH·유형·소속과 현재 요약기 버전이 아닌 요약 캐시를 지웁니다."""
+        deleted = {}
+        with self._connect() as conn:
+            with conn.begin():
+                for name, statement in ORPHAN_CLEANUP.items():
+                    deleted[name] = conn.execute(text(statement),
+                                                 {'summarizer_version': SUMMARIZER_VERSION}).rowcount
+        self.logger.info("Orphan cleanup: " + ', '.join(f"{name}={count}" for name, count in deleted.items()))
+        return deleted
+
+    def incremental_vacuum(self) -> Dict[str, Any]:
+        """
+        auto_vacuum이 꺼진 DB는 INCREMENTAL로 바꾸고 한 번 전체 VACUUM합니다 (모드 변경은 VACUUM 후에 적용).
+        이후에는 빈 페이지만 파일 끝에서 잘라내므로 전체 VACUUM처럼 DB를 다시 쓰지 않습니다.
+        """
+        with self._connect() as conn:
+            mode = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+            free_before = conn.execute(text("PRAGMA freelist_count")).scalar()
+            if mode != 2:
+                started = time.perf_counter()
+                conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+                conn.execute(text("VACUUM"))
+                self.logger.info(f"Enabled incremental auto-vacuum (full VACUUM {time.perf_counter() - started:.1f}s)")
+            else:
+                pages = f"({int(self.vacuum_pages)})" if self.vacuum_pages else ''
+                # 페이지는 문장을 step한 횟수만큼만 반환되는데 sqlite3의 execute는 한 번만 step하므로
+                # 끝까지 실행하는 executescript를 사용
+                conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum{pages};")
+            free_after = conn.execute(text("PRAGMA freelist_count")).scalar()
+            page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        freed = max(free_before - free_after, 0)
+        self.logger.info(f"Vacuum released {freed} pages ({freed * page_size / 1024:.0f} KiB), "
+                         f"{free_after} free pages left")
+        return {'mode_changed': mode != 2, 'pages_freed': freed, 'free_pages': free_after}
+
+    def analyze(self):
+        """쿼리 플래너 통계를 갱신합니다. PRAGMA optimize는 통계가 오래된 인덱스만 다시 분석합니다."""
+        with self._connect() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.execute(text("PRAGMA optimize"))
+        self.logger.info("ANALYZE and PRAGMA optimize finished")
+
+    def integrity_check(self) -> List[str]:
+        """
+        quick_check(기본) 또는 integrity_check로 B-tree를, FTS5 integrity-check로 전문 검색 색인을 확인합니다.
+        문제가 없으면 ['ok']를 반환합니다.
+        """
+        pragma = 'integrity_check' if self.full_integrity_check else 'quick_check'
+        with self._connect() as conn:
+            problems = [row[0] for row in conn.execute(text(f"PRAGMA {pragma}"))]
+            try:
+                conn.execute(text("INSERT INTO papers_fts(papers_fts) VALUES ('integrity-check')"))
+            except OperationalError as e:
+                problems = [p for p in problems if p != 'ok'] + [f"papers_fts: {e.orig}"]
+        if problems != ['ok']:
+            self.logger.error(f"Integrity check found {len(problems)} problems: {problems[:5]}")
+        else:
+            self.logger.info(f"Integrity check ({pragma}) ok")
+        return problems
+
+    def size_report(self) -> List[Dict[str, Any]]:
+        """
+        테이블·인덱스별 크기(dbstat 가상 테이블)와 테이블 행 수를 크기 내림차순으로 반환합니다.
+        SQLite가 dbstat 없이 빌드되었으면 크기는 None입니다.
+        """
+        with self._connect() as conn:
+            objects = conn.execute(text(
+                "SELECT name, type, tbl_name FROM sqlite_master WHERE type IN ('table', 'index') "
+                "AND name NOT LIKE 'sqlite_%' OR name LIKE 'sqlite_autoindex_%'"
+            )).fetchall()
+            try:
+                sizes = dict(conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).fetchall())
+            except OperationalError:
+                sizes = None
+            report = []
+            for name, kind, table in objects:
+                rows = None
+                if kind == 'table':
+                    try:
+                        rows = conn.execute(text(f'SELECT COUNT(*) FROM "{name}"')).scalar()
+                    except OperationalError:
+                        # FTS5 가상 테이블 등은 크기만 보고
+                        pass
+                report.append({'name': name, 'type': kind, 'table': table, 'rows': rows,
+                               'bytes': sizes.get(name, 0) if sizes is not None else None})
+        report.sort(key=lambda item: item['bytes'] or 0, reverse=True)
+        return report
+
+
+def format_size_report(report: Dict[str, Any]) -> str:
+    """유지보수 결과를 터미널용 표로 만듭니다."""
+    lines = [f"DB size: {report['size_before'] / 1048576:.1f} MiB -> {report['size_after'] / 1048576:.1f} MiB",
+             "Orphans deleted: " + ', '.join(f"{name}={count}" for name, count in report['orphans_deleted'].items()),
+             f"Trend data: {'ready' if report['trends_built'] else 'not built'}",
+             f"Integrity: {'; '.join(report['integrity'])}",
+             '',
+             f"{'name':<40} {'type':<6} {'rows':>10} {'size':>10}"]
+    for item in report['objects']:
+        size = f"{item['bytes'] / 1024:.0f} KiB" if item['bytes'] is not None else '-'
+        rows = f"{item['rows']}" if item['rows'] is not None else ''
+        lines.append(f"{item['name']:<40} {item['type']:<6} {rows:>10} {size:>10}")
+    return '\n'.join(lines)
@@ -1,80 +1,625 @@
+from sqlalchemy import func, literal_column, select, tuple_
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
+import os
+import json
+import time
 import logging
-from typing import List, Dict, Any
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Set, Tuple
 from datetime import datetime
 
-from scripts.database import Paper, Author, Category, init_db
-from scripts.logger import setup_logging
+from scripts.database import (Paper, Author, PaperAuthor, Category, AppState, PaperDuplicate, PipelineRun, Topic,
+                              CitationRank, MeshDescriptor, MeshQualifier, PaperMeshHeading, PaperMeshQualifier,
+                              PublicationType, Affiliation, PaperAffiliation, PaperAbstractSection,
+                              paper_categories, paper_topics, paper_publication_types, exclude_duplicates,
+                              filter_by_search, trend_day, init_db, open_read_only)
+from scripts.logger import setup_logging, LogSummary
+from scripts import metrics
+from scripts.profiling import timed
 from scripts.categorizer import PaperCategorizer
+from scripts.topics import load_topics
+from scripts.trend_cube import TrendCube
+from scripts.term_trends import TermTrendEngine
+from scripts.near_duplicates import NearDuplicateIndex
+from scripts.similarity_index import SimilarityIndex
+from scripts.corpus_snapshot import CorpusSnapshot
+
+# 저자 순서: author_order가 없는 이전 논문은 저장 순서(paper_authors의 rowid)로 정렬
+AUTHOR_ORDER = (PaperAuthor.author_order, literal_column('paper_authors.rowid'))
+# 조회 결과(인용 순위 정렬·PageRank 열 포함) 캐시를 무효화하는 버전 키 (citation_graph.CitationGraph.RANKS_VERSION_KEY)
+DATA_VERSION_KEYS = ('ingest_version', 'citation_ranks_version')
 
 class DatabaseManager:
-    def __init__(self, db_path: str):
-        self.logger = setup_logging()
-        self.engine = init_db(db_path)
+    def __init__(self, db_path: str, read_only: bool = False, pool_size: int = 5):
+        """
+        read_only이면 스키마 생성·마이그레이션 없이 읽기 전용 연결 풀만 엽니다.
+        조회 전용 서비스에서 여러 스레드가 동시에 읽을 때 사용합니다.
+        """
+        self.logger = setup_logging(__name__)
+        self.summary = LogSummary(self.logger, 'Paper ingest')
+        self.read_only = read_only
+        self.db_path = db_path
+        self.engine = open_read_only(db_path, pool_size) if read_only else init_db(db_path)
         self.Session = sessionmaker(bind=self.engine)
         self.categorizer = PaperCategorizer()
+        self.trend_cube = TrendCube()
+        self.term_trends = TermTrendEngine()
+        self.near_duplicates = NearDuplicateIndex()
+        self.similarity_index = SimilarityIndex(os.path.join(os.path.dirname(os.path.abspath(db_path)), 'similarity'))
+        self.corpus_snapshot = CorpusSnapshot(os.path.join(os.path.dirname(os.path.abspath(db_path)), 'snapshot'))
+        self._ingest_ready = False
+        self.default_topic = load_topics()[0]['key']
+        self._topic_ids = {} if read_only else self.sync_topics()
+
+    def sync_topics(self) -> Dict[str, int]:
+        """
+        설정된 주제를 topics 테이블에 반영하고 주제 key → id를 반환합니다.
+        주제 연결이 하나도 없는 기존 DB는 모든 논문을 기본 주제에 연결합니다 (단일 주제 시절 데이터).
+        """
+        session = self.Session()
+        try:
+            for topic in load_topics():
+                row = session.query(Topic).filter_by(key=topic['key']).first()
+                if row is None:
+                    session.add(Topic(key=topic['key'], name=topic['name']))
+                else:
+                    row.name = topic['name']
+            session.flush()
+            topic_ids = dict(session.query(Topic.key, Topic.id).all())
 
+            if session.execute(select(paper_topics.c.paper_id).limit(1)).first() is None:
+                backfilled = session.execute(paper_topics.insert().from_select(
+                    ['topic_id', 'paper_id'], select(topic_ids[self.default_topic], Paper.id)
+                )).rowcount
+                if backfilled:
+                    self.logger.info(f"Linked {backfilled} existing papers to default topic {self.default_topic}")
+            session.commit()
+            return topic_ids
+        except Exception as e:
+            self.logger.error(f"Error syncing topics: {str(e)}")
+            session.rollback()
+            return {}
+        finally:
+            session.close()
+
+    def _topic_id(self, session, key: str) -> int:
+        """주제 key의 id. 설정에 없는 주제면 새로 만듭니다."""
+        topic_id = self._topic_ids.get(key)
+        if topic_id is None:
+            topic = session.query(Topic).filter_by(key=key).first()
+            if topic is None:
+                topic = Topic(key=key, name=key)
+                session.add(topic)
+                session.flush()
+            topic_id = self._topic_ids[key] = topic.id
+        return topic_id
+
+    def link_topics(self, pmid_topics: Dict[str, List[str]]) -> int:
+        """이미 저장된 논문을 PMID별 주제에 연결합니다. 있는 연결은 건너뛰며, 새로 만든 연결 수를 반환합니다."""
+        if not pmid_topics:
+            return 0
+        session = self.Session()
+        try:
+            paper_ids = {}
+            pmids = list(pmid_topics)
+            for start in range(0, len(pmids), 500):
+                paper_ids.update(session.query(Paper.pmid, Paper.id).filter(Paper.pmid.in_(pmids[start:start + 500])))
+            existing = set()
+            ids = list(paper_ids.values())
+            for start in range(0, len(ids), 500):
+                existing.update(session.query(paper_topics.c.paper_id, paper_topics.c.topic_id)
+                                .filter(paper_topics.c.paper_id.in_(ids[start:start + 500])))
+
+            links = []
+            for pmid, paper_id in paper_ids.items():
+                for key in pmid_topics[pmid]:
+                    topic_id = self._topic_id(session, key)
+                    if (paper_id, topic_id) not in existing:
+                        existing.add((paper_id, topic_id))
+                        links.append({'paper_id': paper_id, 'topic_id': topic_id})
+            if links:
+                session.execute(paper_topics.insert(), links)
+                self._record_ingest(session)
+            session.commit()
+            metrics.current().inc('topic_links_added', len(links))
+            return len(links)
+        except Exception as e:
+            self.logger.error(f"Error linking topics: {str(e)}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+
+    @timed
     def add_paper(self, paper_data: Dict[str, Any]) -> bool:
         """새로운 논문 정보를 데이터베이스에 추가합니다."""
+        self._before_ingest()
+        added = self._add_paper(paper_data) == 'added'
+        if added:
+            self._after_ingest()
+        return added
+
+    def _add_paper(self, paper_data: Dict[str, Any]) -> str:
+        """
+        논문 한 편을 자체 트랜잭션으로 저장합니다. 배치 후처리는 _after_ingest에서 수행합니다.
+        결과를 'added', 'existing', 'failed' 중 하나로 반환합니다.
+        """
         session = self.Session()
         try:
             # 이미 존재하는 논문인지 확인
-            existing_paper = session.query(Paper).filter_by(pmid=paper_data['pmid']).first()
+            existing_paper = session.query(Paper.id).filter_by(pmid=paper_data['pmid']).first()
             if existing_paper:
-                self.logger.info(f"Paper with PMID {paper_data['pmid']} already exists")
-                return False
+                self.summary.add('existing')
+                metrics.current().inc('papers_skipped', reason='existing')
+                self.logger.debug(f"Paper with PMID {paper_data['pmid']} already exists")
+                return 'existing'
+
+            cube_increments = []
+            duplicate = self._insert_paper(session, paper_data, cube_increments)
+            self.trend_cube.increment_batch(session, cube_increments)
+            self._record_ingest(session)
+            session.commit()
+            self._observe_added(paper_data, duplicate)
+            self.logger.debug(f"Successfully added paper with PMID {paper_data['pmid']}")
+            return 'added'
 
-            # 새 논문 객체 생성
-            # 논문 카테고리 분류
+        except SQLAlchemyError as e:
+            self.summary.add('failed')
+            metrics.current().inc('papers_failed')
+            self.logger.error(f"Database error while adding paper: {str(e)}")
+            session.rollback()
+            return 'failed'
+        except Exception as e:
+            self.summary.add('failed')
+            metrics.current().inc('papers_failed')
+            self.logger.error(f"Unexpected error while adding paper: {str(e)}")
+            session.rollback()
+            return 'failed'
+        finally:
+            session.close()
+
+    def _insert_paper(self, session, paper_data: Dict[str, Any], cube_increments: list):
+        """
+        세션에 논문과 카테고리·저자·주제·근사 중복 색인을 추가합니다. 커밋은 호출한 쪽에서 합니다.
+        paper_data에 'categories'가 있으면 이미 분류된 것으로 보고 그대로 사용합니다.
+        'topics'가 없으면 기본 주제에 연결합니다.
+        트렌드 큐브 증분은 cube_increments에 모아 두며 호출한 쪽에서 한 번에 반영합니다.
+        근사 중복이면 (대표 논문 id, 유사도)를, 아니면 None을 반환합니다.
+        """
+        # 논문 카테고리 분류
+        if 'categories' in paper_data:
+            categories = paper_data['categories']
+            self.categorizer.record(categories)
+        else:
             categories = self.categorizer.categorize_paper(
                 paper_data['title'],
                 paper_data['abstract']
             )
-            
-            # 논문 객체 생성
-            new_paper = Paper(
-                pmid=paper_data['pmid'],
-                title=paper_data['title'],
-                abstract=paper_data['abstract'],
-                journal_name=paper_data['journal']['name'],
-                journal_volume=paper_data['journal']['volume'],
-                journal_issue=paper_data['journal']['issue'],
-                publication_year=paper_data['journal']['year']
-            )
-            
-            # 카테고리 추가
-            for category_name in categories:
-                category = session.query(Category).filter_by(name=category_name).first()
-                if not category:
-                    category = Category(name=category_name)
-                    session.add(category)
-                new_paper.categories.append(category)
-
-            # 저자 정보 추가
-            for idx, author_name in enumerate(paper_data['authors'], 1):
-                author = session.query(Author).filter_by(name=author_name).first()
-                if not author:
-                    author = Author(name=author_name)
-                    session.add(author)
-                new_paper.authors.append(author)
-
-            session.add(new_paper)
+
+        # 논문 객체 생성
+        ingest_date = datetime.now().date()
+        new_paper = Paper(
+            pmid=paper_data['pmid'],
+            title=paper_data['title'],
+            abstract=paper_data['abstract'],
+            journal_name=paper_data['journal']['name'],
+            journal_volume=paper_data['journal']['volume'],
+            journal_issue=paper_data['journal']['issue'],
+            publication_year=paper_data['journal']['year'],
+            created_date=ingest_date,
+            publication_date=paper_data.get('publication_date'),
+            entry_date=paper_data.get('entry_date'),
+            doi=paper_data.get('doi')
+        )
+
+        # 카테고리 추가
+        for category_name in categories:
+            category = session.query(Category).filter_by(name=category_name).first()
+            if not category:
+                category = Category(name=category_name)
+                session.add(category)
+            new_paper.categories.append(category)
+
+        # 저자 정보 추가: 같은 이름이 한 논문에 두 번 나오면 (동명 공저자 등) paper_authors 기본 키가 겹치므로
+        # 첫 순번으로 한 번만 연결하고, 뒤에 나온 저자의 소속도 그 순번에 붙임
+        author_orders = {}
+        authors = []
+        for idx, author_name in enumerate(paper_data['authors'], 1):
+            if author_name in author_orders:
+                continue
+            author_orders[author_name] = idx
+            author = session.query(Author).filter_by(name=author_name).first()
+            if not author:
+                author = Author(name=author_name)
+                session.add(author)
+            authors.append((idx, author))
+
+        session.add(new_paper)
+        session.flush()
+        session.add_all(PaperAuthor(paper_id=new_paper.id, author_id=author.id, author_order=idx)
+                        for idx, author in authors)
+        self._insert_metadata(session, new_paper.id, paper_data, author_orders)
+
+        # 주제 연결 (여러 주제에서 검색된 논문도 한 번만 저장)
+        for key in dict.fromkeys(paper_data.get('topics') or [self.default_topic]):
+            session.execute(paper_topics.insert().values(topic_id=self._topic_id(session, key), paper_id=new_paper.id))
+
+        # 근사 중복 여부 확인 (중복이면 트렌드 집계에서 제외)
+        duplicate = self.near_duplicates.check_and_index(
+            session, new_paper.id, paper_data['title'], paper_data['abstract']
+        )
+
+        # 트렌드 큐브는 이 논문이 속한 기간(발행일 기준)만 증분 갱신
+        if duplicate is None:
+            cube_increments.append((trend_day(paper_data.get('publication_date'), ingest_date),
+                                    [category.id for category in new_paper.categories]))
+        return duplicate
+
+    def _insert_metadata(self, session, paper_id: int, paper_data: Dict[str, Any], author_orders: Dict[str, int]):
+        """파서가 추출한 MeSH·출판 유형·소속·구조화 초록 구획을 정규화 테이블에 추가합니다."""
+        headings = {}
+        qualifiers = {}
+        for term in paper_data.get('mesh_terms') or []:
+            descriptor_id = self._vocabulary_id(session, MeshDescriptor, term['descriptor'], term.get('ui'))
+            headings[descriptor_id] = headings.get(descriptor_id, False) or term['major']
+            for qualifier in term['qualifiers']:
+                key = (descriptor_id, self._vocabulary_id(session, MeshQualifier, qualifier['name'], qualifier.get('ui')))
+                qualifiers[key] = qualifiers.get(key, False) or qualifier['major']
+        if headings:
+            session.execute(PaperMeshHeading.__table__.insert(), [
+                {'paper_id': paper_id, 'descriptor_id': descriptor_id, 'major_topic': major}
+                for descriptor_id, major in headings.items()
+            ])
+        if qualifiers:
+            session.execute(PaperMeshQualifier.__table__.insert(), [
+                {'paper_id': paper_id, 'descriptor_id': descriptor_id, 'qualifier_id': qualifier_id,
+                 'major_topic': major}
+                for (descriptor_id, qualifier_id), major in qualifiers.items()
+            ])
+
+        type_ids = dict.fromkeys(self._vocabulary_id(session, PublicationType, item['name'], item.get('ui'))
+                                 for item in paper_data.get('publication_types') or [])
+        if type_ids:
+            session.execute(paper_publication_types.insert(), [
+                {'paper_id': paper_id, 'publication_type_id': type_id} for type_id in type_ids
+            ])
+
+        affiliations = {
+            (author_orders[author_name], self._vocabulary_id(session, Affiliation, name))
+            for author_name, names in zip(paper_data['authors'], paper_data.get('affiliations') or [])
+            for name in names
+        }
+        if affiliations:
+            session.execute(PaperAffiliation.__table__.insert(), [
+                {'paper_id': paper_id, 'author_order': order, 'affiliation_id': affiliation_id}
+                for order, affiliation_id in sorted(affiliations)
+            ])
+
+        sections = paper_data.get('abstract_sections') or []
+        if sections:
+            session.execute(PaperAbstractSection.__table__.insert(), [
+                {'paper_id': paper_id, 'position': position, 'label': section['label'],
+                 'category': section['category'], 'start_offset': section['start'], 'end_offset': section['end']}
+                for position, section in enumerate(sections)
+            ])
+
+    def _vocabulary_id(self, session, model, name: str, ui: str = None) -> int:
+        """
+        이름이 고유한 어휘 테이블(MeSH, 출판 유형, 소속)의 id를 찾고 없으면 추가합니다.
+        찾은 id는 세션에 캐시하므로 한 배치 안에서 같은 용어를 다시 조회하지 않습니다.
+        """
+        cache = session.info.setdefault('vocabulary_ids', {})
+        key = (model.__tablename__, name)
+        if key not in cache:
+            row_id = session.query(model.id).filter(model.name == name).scalar()
+            if row_id is None:
+                row = model(name=name, ui=ui) if ui is not None else model(name=name)
+                session.add(row)
+                session.flush()
+                row_id = row.id
+            cache[key] = row_id
+        return cache[key]
+
+    def get_papers_missing_metadata(self, after_id: int = 0, limit: int = 200) -> List[tuple]:
+        """발행일이 없는(메타데이터 파싱 이전에 저장된) 논문의 (id, pmid)를 after_id 다음부터 id 순으로 반환합니다."""
+        session = self.Session()
+        try:
+            return [tuple(row) for row in session.query(Paper.id, Paper.pmid)
+                    .filter(Paper.publication_date.is_(None), Paper.id > after_id)
+                    .order_by(Paper.id).limit(limit)]
+        except Exception as e:
+            self.logger.error(f"Error retrieving papers without metadata: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    def update_paper_metadata(self, papers: List[Dict[str, Any]]) -> int:
+        """
+        다시 받은 논문 상세로 이미 저장된 논문의 발행일·DOI·MeSH·출판 유형·소속·초록 구획과 저자 순번을 채웁니다.
+        정규화 테이블의 기존 행은 지우고 다시 넣으며, 구획 오프셋이 어긋나지 않도록 초록이 저장된 것과 같을 때만 구획을 넣습니다.
+        발행일이 바뀌면 트렌드 기준일도 바뀌므로 트렌드 집계를 무효화합니다 (ensure_trend_data가 다시 만듦).
+        갱신한 논문 수를 반환하며, 실패하면 되돌린 뒤 예외를 다시 발생시킵니다 (호출한 쪽이 워터마크를 유지).
+        """
+        session = self.Session()
+        try:
+            by_pmid = {paper_data['pmid']: paper_data for paper_data in papers}
+            stored = (session.query(Paper)
+                      .filter(Paper.pmid.in_(list(by_pmid)), Paper.publication_date.is_(None)).all())
+            updated = 0
+            for paper in stored:
+                paper_data = by_pmid[paper.pmid]
+                paper.publication_date = paper_data.get('publication_date')
+                paper.entry_date = paper_data.get('entry_date')
+                paper.doi = paper_data.get('doi')
+
+                author_orders = {}
+                for idx, author_name in enumerate(paper_data['authors'], 1):
+                    author_orders.setdefault(author_name, idx)
+                links = (session.query(PaperAuthor, Author.name)
+                         .join(Author, Author.id == PaperAuthor.author_id)
+                         .filter(PaperAuthor.paper_id == paper.id))
+                for link, author_name in links:
+                    if author_name in author_orders:
+                        link.author_order = author_orders[author_name]
+
+                for model in (PaperMeshHeading, PaperMeshQualifier, PaperAffiliation, PaperAbstractSection):
+                    session.query(model).filter(model.paper_id == paper.id).delete(synchronize_session=False)
+                session.execute(paper_publication_types.delete().where(paper_publication_types.c.paper_id == paper.id))
+                if paper_data['abstract'] != paper.abstract:
+                    paper_data = dict(paper_data, abstract_sections=[])
+                self._insert_metadata(session, paper.id, paper_data, author_orders)
+                updated += 1
+
+            if updated:
+                session.query(AppState).filter(
+                    AppState.key.in_([self.trend_cube.BUILT_KEY, self.term_trends.BUILT_KEY])
+                ).delete(synchronize_session=False)
+                self._record_ingest(session)
             session.commit()
-            self.logger.info(f"Successfully added paper with PMID {paper_data['pmid']}")
-            return True
+            return updated
+        except Exception as e:
+            self.logger.error(f"Error updating paper metadata: {str(e)}")
+            session.rollback()
+            raise
+        finally:
+            session.close()
 
-        except SQLAlchemyError as e:
-            self.logger.error(f"Database error while adding paper: {str(e)}")
+    def _observe_added(self, paper_data: Dict[str, Any], duplicate):
+        """커밋된 논문을 용어 스케치와 유사도 색인 대기열에 반영합니다."""
+        if duplicate is None:
+            day = trend_day(paper_data.get('publication_date'), datetime.now().date())
+            self.term_trends.observe(day, paper_data['title'], paper_data['abstract'])
+            if str(paper_data['pmid']).isdigit():
+                self.similarity_index.add(paper_data['pmid'], paper_data['title'], paper_data['abstract'])
+        else:
+            self.summary.add('near_duplicate')
+            metrics.current().inc('papers_near_duplicate')
+        self.summary.add('added')
+        metrics.current().inc('papers_inserted')
+
+    @timed
+    def add_paper_batch(self, papers: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        여러 논문을 한 트랜잭션으로 저장합니다. 이미 있는 PMID는 한 번의 조회로 걸러냅니다.
+        배치 중 오류가 나면 전체를 되돌리고 논문별 트랜잭션으로 다시 저장합니다.
+        (추가된 논문 수, 저장에 실패한 논문 수)를 반환하며, 실패가 있으면 호출한 쪽에서 다시 수집하도록 처리합니다.
+        _before_ingest/_after_ingest와 요약 로그 flush는 호출한 쪽에서 합니다.
+        """
+        if not papers:
+            return 0, 0
+        run = metrics.current()
+        started = time.perf_counter()
+        session = self.Session()
+        try:
+            existing = {row[0] for row in session.query(Paper.pmid)
+                        .filter(Paper.pmid.in_([paper['pmid'] for paper in papers])).all()}
+            inserted = []
+            cube_increments = []
+            for paper_data in papers:
+                if paper_data['pmid'] in existing:
+                    self.summary.add('existing')
+                    run.inc('papers_skipped', reason='existing')
+                    continue
+                existing.add(paper_data['pmid'])
+                inserted.append((paper_data, self._insert_paper(session, paper_data, cube_increments)))
+
+            if inserted:
+                self.trend_cube.increment_batch(session, cube_increments)
+                self._record_ingest(session)
+            session.commit()
+            for paper_data, duplicate in inserted:
+                self._observe_added(paper_data, duplicate)
+            run.observe('db_write_batch_seconds', time.perf_counter() - started)
+            return len(inserted), 0
+
+        except Exception as e:
+            self.logger.error(f"Batch insert of {len(papers)} papers failed, retrying one by one: {str(e)}")
+            run.inc('db_batch_fallbacks')
             session.rollback()
-            return False
+        finally:
+            session.close()
+
+        results = [self._add_paper(paper_data) for paper_data in papers]
+        return results.count('added'), results.count('failed')
+
+    def add_papers(self, papers: List[Dict[str, Any]], batch_size: int = 200) -> int:
+        """여러 논문을 batch_size개씩 묶어 추가하고 배치 요약 로그를 남깁니다. 추가된 논문 수를 반환합니다."""
+        self._before_ingest()
+        added_count = 0
+        for start in range(0, len(papers), batch_size):
+            added_count += self.add_paper_batch(papers[start:start + batch_size])[0]
+
+        if added_count:
+            self._after_ingest()
+        self.categorizer.summary.flush()
+        self.summary.flush()
+        return added_count
+
+    def _before_ingest(self):
+        """처음 수집할 때 한 번, 아직 색인되지 않은 기존 논문을 근사 중복 색인과 유사도 색인에 추가합니다."""
+        if self._ingest_ready:
+            return
+        session = self.Session()
+        try:
+            if self.near_duplicates.index_missing(session):
+                # 새로 발견된 중복을 반영하도록 집계를 다시 만들게 함
+                session.query(AppState).filter(
+                    AppState.key.in_([self.trend_cube.BUILT_KEY, self.term_trends.BUILT_KEY])
+                ).delete(synchronize_session=False)
+                self._record_ingest(session)
+                session.commit()
+
+            # 유사도 색인에 없는 기존 논문 추가: PMID만 비교하고 빠진 논문의 제목·초록만 읽음
+            pmids = [pmid for pmid, in exclude_duplicates(session.query(Paper.pmid)).yield_per(10000)]
+            missing = self.similarity_index.missing_pmids(pmids)
+            for start in range(0, len(missing), 500):
+                self.similarity_index.sync(session.query(Paper.pmid, Paper.title, Paper.abstract)
+                                           .filter(Paper.pmid.in_(missing[start:start + 500])))
+            self._ingest_ready = True
         except Exception as e:
-            self.logger.error(f"Unexpected error while adding paper: {str(e)}")
+            self.logger.error(f"Error preparing ingest indexes: {str(e)}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def _after_ingest(self):
+        """논문 저장 후 배치 단위로 처리할 작업을 수행합니다."""
+        session = self.Session()
+        try:
+            self.term_trends.flush(session)
+        except Exception as e:
+            self.logger.error(f"Error updating term sketches: {str(e)}")
+            session.rollback()
+        finally:
+            session.close()
+
+        try:
+            self.similarity_index.flush()
+        except Exception as e:
+            self.logger.error(f"Error updating similarity index: {str(e)}")
+
+        # 버전이 바뀌었거나 중복 재색인으로 무효화된 트렌드 집계는 읽기 전용 조회 전에 여기서 다시 만듦
+        self.ensure_trend_data()
+
+    def ensure_trend_data(self) -> bool:
+        """
+        트렌드 큐브와 용어 sketch가 현재 버전으로 만들어져 있는지 반환합니다.
+        쓰기 가능한 연결이면 없는 것을 먼저 만들고, 읽기 전용 연결(API 서버)에서는 확인만 합니다.
+        """
+        session = self.Session()
+        try:
+            engines = (self.trend_cube, self.term_trends)
+            missing = [engine for engine in engines if not engine.is_built(session)]
+            if self.read_only or not missing:
+                return not missing
+            for engine in missing:
+                engine.rebuild(session)
+            # 집계가 바뀌었으므로 수집 버전을 올려 분석 캐시와 API ETag를 무효화
+            self._record_ingest(session)
+            session.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error building trend data: {str(e)}")
             session.rollback()
             return False
         finally:
             session.close()
 
+    def _record_ingest(self, session):
+        """수집 버전을 올려 분석 결과 캐시가 무효화되도록 합니다."""
+        version = session.get(AppState, 'ingest_version')
+        if version is None:
+            session.add(AppState(key='ingest_version', value='1'))
+        else:
+            version.value = str(int(version.value) + 1)
+        session.merge(AppState(key='last_ingest_at', value=datetime.now().isoformat(timespec='seconds')))
+
+    def get_data_version(self) -> str:
+        """
+        조회 결과 캐시·ETag용 데이터 버전. 수집 버전과 인용 순위 버전을 합친 값이므로
+        논문이 추가되거나 PageRank·피인용 수가 다시 계산되면 달라집니다.
+        """
+        session = self.Session()
+        try:
+            values = dict(session.query(AppState.key, AppState.value).filter(AppState.key.in_(DATA_VERSION_KEYS)))
+            return '-'.join(values.get(key, '0') for key in DATA_VERSION_KEYS)
+        except Exception as e:
+            self.logger.error(f"Error retrieving data version: {str(e)}")
+            return '0'
+        finally:
+            session.close()
+
+    def get_state(self, key: str, default: str = None) -> str:
+        """애플리케이션 상태 값을 조회합니다."""
+        session = self.Session()
+        try:
+            state = session.get(AppState, key)
+            return state.value if state is not None else default
+        except Exception as e:
+            self.logger.error(f"Error retrieving state {key}: {str(e)}")
+            return default
+        finally:
+            session.close()
+
+    def set_state(self, key: str, value: str):
+        """애플리케이션 상태 값을 저장합니다."""
+        session = self.Session()
+        try:
+            session.merge(AppState(key=key, value=value))
+            session.commit()
+        except Exception as e:
+            self.logger.error(f"Error saving state {key}: {str(e)}")
+            session.rollback()
+        finally:
+            session.close()
+
+    def record_pipeline_run(self, report: Dict[str, Any]) -> int:
+        """실행 기록을 저장하고 id를 반환합니다. 실패는 호출한 쪽에서 처리합니다."""
+        session = self.Session()
+        try:
+            run = PipelineRun(
+                name=report['name'],
+                started_at=report['started_at'],
+                finished_at=report['finished_at'],
+                status=report['status'],
+                error=report['error'],
+                duration_seconds=report['duration_seconds'],
+                metrics=json.dumps({key: report[key] for key in ('stages', 'counters', 'gauges', 'histograms')},
+                                   ensure_ascii=False),
+            )
+            session.add(run)
+            session.commit()
+            return run.id
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_pipeline_runs(self, name: str = None, limit: int = 30) -> List[Dict[str, Any]]:
+        """최근 실행 기록을 최신순으로 반환합니다."""
+        session = self.Session()
+        try:
+            query = session.query(PipelineRun)
+            if name:
+                query = query.filter(PipelineRun.name == name)
+            return [{
+                'id': run.id,
+                'name': run.name,
+                'started_at': run.started_at,
+                'finished_at': run.finished_at,
+                'status': run.status,
+                'error': run.error,
+                'duration_seconds': run.duration_seconds,
+                **json.loads(run.metrics or '{}'),
+            } for run in query.order_by(PipelineRun.id.desc()).limit(limit)]
+        except Exception as e:
+            self.logger.error(f"Error retrieving pipeline runs: {str(e)}")
+            return []
+        finally:
+            session.close()
+
     def get_all_categories(self) -> List[str]:
         """모든 카테고리 목록을 반환합니다."""
         session = self.Session()
@@ -86,6 +631,49 @@ class DatabaseManager:
             return []
         finally:
             session.close()
+
+    def get_publication_types(self) -> List[str]:
+        """논문에 연결된 출판 유형 이름을 논문 수 내림차순으로 반환합니다."""
+        session = self.Session()
+        try:
+            count = func.count(paper_publication_types.c.paper_id)
+            return [name for name, _ in (session.query(PublicationType.name, count)
+                                         .join(paper_publication_types,
+                                               paper_publication_types.c.publication_type_id == PublicationType.id)
+                                         .group_by(PublicationType.name)
+                                         .order_by(count.desc()))]
+        except Exception as e:
+            self.logger.error(f"Error retrieving publication types: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    def get_mesh_descriptors(self, limit: int = 200) -> List[str]:
+        """가장 많은 논문에 달린 MeSH 기술어 limit개를 반환합니다."""
+        session = self.Session()
+        try:
+            count = func.count(PaperMeshHeading.paper_id)
+            return [name for name, _ in (session.query(MeshDescriptor.name, count)
+                                         .join(PaperMeshHeading, PaperMeshHeading.descriptor_id == MeshDescriptor.id)
+                                         .group_by(MeshDescriptor.name)
+                                         .order_by(count.desc())
+                                         .limit(limit))]
+        except Exception as e:
+            self.logger.error(f"Error retrieving MeSH descriptors: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    def get_all_topics(self) -> List[Dict[str, str]]:
+        """수집 주제 목록(key, name)을 반환합니다."""
+        session = self.Session()
+        try:
+            return [{'key': key, 'name': name} for key, name in session.query(Topic.key, Topic.name).order_by(Topic.id)]
+        except Exception as e:
+            self.logger.error(f"Error retrieving topics: {str(e)}")
+            return []
+        finally:
+            session.close()
             
     def get_paper_by_pmid(self, pmid: str) -> Dict[str, Any]:
         """PMID로 논문 정보를 조회합니다."""
@@ -95,11 +683,58 @@ class DatabaseManager:
             if not paper:
                 return None
 
+            authors = [name for name, in session.query(Author.name)
+                       .join(PaperAuthor, PaperAuthor.author_id == Author.id)
+                       .filter(PaperAuthor.paper_id == paper.id)
+                       .order_by(*AUTHOR_ORDER)]
+
+            # MeSH 기술어별 세부 표목 (주요 주제는 major로 표시)
+            mesh_terms = {}
+            for descriptor, major in (session.query(MeshDescriptor.name, PaperMeshHeading.major_topic)
+                                      .join(PaperMeshHeading, PaperMeshHeading.descriptor_id == MeshDescriptor.id)
+                                      .filter(PaperMeshHeading.paper_id == paper.id)
+                                      .order_by(MeshDescriptor.name)):
+                mesh_terms[descriptor] = {'descriptor': descriptor, 'major': major, 'qualifiers': []}
+            for descriptor, qualifier, major in (session.query(MeshDescriptor.name, MeshQualifier.name,
+                                                               PaperMeshQualifier.major_topic)
+                                                 .join(PaperMeshQualifier,
+                                                       PaperMeshQualifier.descriptor_id == MeshDescriptor.id)
+                                                 .join(MeshQualifier, MeshQualifier.id == PaperMeshQualifier.qualifier_id)
+                                                 .filter(PaperMeshQualifier.paper_id == paper.id)
+                                                 .order_by(MeshQualifier.name)):
+                if descriptor in mesh_terms:
+                    mesh_terms[descriptor]['qualifiers'].append({'name': qualifier, 'major': major})
+
+            affiliations = list(dict.fromkeys(
+                name for name, in session.query(Affiliation.name)
+                .join(PaperAffiliation, PaperAffiliation.affiliation_id == Affiliation.id)
+                .filter(PaperAffiliation.paper_id == paper.id)
+                .order_by(PaperAffiliation.author_order, Affiliation.id)
+            ))
+            sections = [
+                {'label': label, 'category': category, 'text': (paper.abstract or '')[start:end]}
+                for label, category, start, end in (session.query(PaperAbstractSection.label,
+                                                                  PaperAbstractSection.category,
+                                                                  PaperAbstractSection.start_offset,
+                                                                  PaperAbstractSection.end_offset)
+                                                    .filter(PaperAbstractSection.paper_id == paper.id)
+                                                    .order_by(PaperAbstractSection.position))
+            ]
+
             return {
                 'pmid': paper.pmid,
                 'title': paper.title,
                 'abstract': paper.abstract,
-                'authors': [author.name for author in paper.authors],
+                'abstract_sections': sections,
+                'authors': authors,
+                'affiliations': affiliations,
+                'categories': [category.name for category in paper.categories],
+                'topics': [topic.key for topic in paper.topics],
+                'doi': paper.doi,
+                'publication_date': paper.publication_date.isoformat() if paper.publication_date else None,
+                'entry_date': paper.entry_date.isoformat() if paper.entry_date else None,
+                'publication_types': [publication_type.name for publication_type in paper.publication_types],
+                'mesh_terms': list(mesh_terms.values()),
                 'journal': {
                     'name': paper.journal_name,
                     'volume': paper.journal_volume,
@@ -114,16 +749,69 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def get_all_papers(self):
-        """모든 논문 정보를 조회합니다."""
+    def get_paper_titles(self, pmids: List[str]) -> Dict[str, str]:
+        """PMID 목록의 제목을 한 번에 조회합니다. 중복으로 묶인 논문은 제외합니다."""
+        session = self.Session()
+        try:
+            rows = exclude_duplicates(session.query(Paper.pmid, Paper.title)).filter(Paper.pmid.in_(pmids)).all()
+            return dict(rows)
+        except Exception as e:
+            self.logger.error(f"Error retrieving paper titles: {str(e)}")
+            return {}
+        finally:
+            session.close()
+
+    def get_last_paper_id(self) -> int:
+        """가장 최근에 저장된 논문의 id (수집 순서 워터마크용). 논문이 없으면 0"""
+        session = self.Session()
+        try:
+            return session.query(func.max(Paper.id)).scalar() or 0
+        finally:
+            session.close()
+
+    def get_existing_pmids(self, pmids: List[str]) -> Set[str]:
+        """PMID 목록 중 이미 저장된 것을 반환합니다. 조회 실패는 호출한 쪽에서 처리합니다."""
+        session = self.Session()
+        try:
+            existing = set()
+            for start in range(0, len(pmids), 500):
+                chunk = pmids[start:start + 500]
+                existing.update(row[0] for row in session.query(Paper.pmid).filter(Paper.pmid.in_(chunk)))
+            return existing
+        finally:
+            session.close()
+
+    def get_duplicate_pmids(self, pmid: str) -> List[str]:
+        """대표 논문에 묶인 근사 중복 논문들의 PMID 목록을 반환합니다."""
+        session = self.Session()
+        try:
+            canonical = session.query(Paper.id).filter_by(pmid=pmid).scalar()
+            if canonical is None:
+                return []
+            rows = (session.query(Paper.pmid)
+                    .join(PaperDuplicate, PaperDuplicate.paper_id == Paper.id)
+                    .filter(PaperDuplicate.canonical_id == canonical)
+                    .all())
+            return [row[0] for row in rows]
+        except Exception as e:
+            self.logger.error(f"Error retrieving duplicates of PMID {pmid}: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    def get_all_papers(self, collapse_duplicates: bool = True):
+        """모든 논문 정보를 조회합니다. 기본적으로 근사 중복 논문은 대표 논문으로 합쳐 제외합니다."""
         session = self.Session()
         try:
             from sqlalchemy.orm import joinedload
             # relationships를 함께 로드
-            papers = session.query(Paper).options(
+            query = session.query(Paper).options(
                 joinedload(Paper.categories),
                 joinedload(Paper.authors)
-            ).all()
+            )
+            if collapse_duplicates:
+                query = exclude_duplicates(query)
+            papers = query.all()
             
             return papers
         except Exception as e:
@@ -132,3 +820,249 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def _category_names_expr(self):
+        """
+        논문별 카테고리 이름을 이름순으로 쉼표로 이은 상관 서브쿼리 표현식.
+        group_concat은 순서를 보장하지 않으므로 정렬한 서브쿼리에서 이어 붙입니다 (카테고리순 정렬·키셋 키가 안정적).
+        """
+        names = (select(Category.name)
+                 .join(paper_categories, paper_categories.c.category_id == Category.id)
+                 .where(paper_categories.c.paper_id == Paper.id)
+                 .order_by(Category.name)
+                 .correlate(Paper)
+                 .subquery())
+        return select(func.group_concat(names.c.name, ', ')).scalar_subquery()
+
+    def _citation_expr(self, column):
+        """논문의 인용 순위 값(PageRank 또는 피인용 수) 상관 서브쿼리. 순위가 없는 논문은 0"""
+        return func.coalesce(select(column).where(CitationRank.pmid == Paper.pmid).scalar_subquery(), 0)
+
+    def _filtered_papers_query(self, session, columns, filters: Dict[str, Any] = None):
+        """목록·개수 조회에 공통으로 쓰는 필터 조건을 적용합니다."""
+        filters = filters or {}
+        query = exclude_duplicates(session.query(*columns))
+        if filters.get('category'):
+            category_ids = (select(paper_categories.c.paper_id)
+                            .join(Category, Category.id == paper_categories.c.category_id)
+                            .where(Category.name == filters['category']))
+            query = query.filter(Paper.id.in_(category_ids))
+        if filters.get('topic'):
+            # paper_topics 기본 키(topic_id, paper_id)로 주제의 논문 id만 읽음
+            topic_ids = (select(paper_topics.c.paper_id)
+                         .join(Topic, Topic.id == paper_topics.c.topic_id)
+                         .where(Topic.key == filters['topic']))
+            query = query.filter(Paper.id.in_(topic_ids))
+        if filters.get('after_id') is not None:
+            query = query.filter(Paper.id > filters['after_id'])
+        if filters.get('until_id') is not None:
+            query = query.filter(Paper.id <= filters['until_id'])
+        if filters.get('year'):
+            query = query.filter(Paper.publication_year == str(filters['year']))
+        if filters.get('since'):
+            query = query.filter(Paper.created_date >= filters['since'])
+        if filters.get('published_since'):
+            query = query.filter(Paper.publication_date >= filters['published_since'])
+        if filters.get('published_until'):
+            query = query.filter(Paper.publication_date <= filters['published_until'])
+        if filters.get('doi'):
+            query = query.filter(Paper.doi == filters['doi'])
+        if filters.get('mesh'):
+            # paper_mesh_headings 기본 키(descriptor_id, paper_id)로 기술어의 논문 id만 읽음
+            mesh_ids = (select(PaperMeshHeading.paper_id)
+                        .join(MeshDescriptor, MeshDescriptor.id == PaperMeshHeading.descriptor_id)
+                        .where(MeshDescriptor.name == filters['mesh']))
+            query = query.filter(Paper.id.in_(mesh_ids))
+        if filters.get('publication_type'):
+            type_ids = (select(paper_publication_types.c.paper_id)
+                        .join(PublicationType, PublicationType.id == paper_publication_types.c.publication_type_id)
+                        .where(PublicationType.name == filters['publication_type']))
+            query = query.filter(Paper.id.in_(type_ids))
+        if filters.get('affiliation'):
+            # 소속 문자열은 기관마다 한 행이므로 부분 일치 검색은 affiliations 테이블만 훑음
+            affiliation_ids = (select(PaperAffiliation.paper_id)
+                               .join(Affiliation, Affiliation.id == PaperAffiliation.affiliation_id)
+                               .where(Affiliation.name.like(f"%{filters['affiliation']}%")))
+            query = query.filter(Paper.id.in_(affiliation_ids))
+        if filters.get('search'):
+            query = filter_by_search(query, filters['search'])
+        return query
+
+    def iter_paper_records(self, filters: Dict[str, Any] = None, batch_size: int = 1000,
+                           include_abstract: bool = True, order: str = 'id') -> Iterator[Dict[str, Any]]:
+        """
+        필터링된 논문을 하나씩 내보냅니다. order: 'id'(수집순), 'rank'(PageRank 내림차순), 'citations'(피인용 수 내림차순)
+        인용 순위로 정렬하면 레코드에 pagerank·cited_by 열이 추가됩니다.
+        서버 측 커서(yield_per)로 batch_size만큼씩 읽고, 저자는 묶음마다 한 번에 조회하므로
+        전체 말뭉치를 내보내도 메모리 사용량이 일정합니다.
+        """
+        session = self.Session()
+        try:
+            columns = [Paper.id, Paper.pmid, Paper.title, Paper.journal_name, Paper.journal_volume,
+                       Paper.journal_issue, Paper.publication_year, Paper.created_date, Paper.publication_date,
+                       Paper.doi, self._category_names_expr()]
+            if include_abstract:
+                columns.append(Paper.abstract)
+            ranked = order in ('rank', 'citations')
+            if ranked:
+                pagerank = self._citation_expr(CitationRank.pagerank)
+                cited_by = self._citation_expr(CitationRank.cited_by)
+                columns += [pagerank, cited_by]
+            query = self._filtered_papers_query(session, columns, filters)
+            if ranked:
+                primary = pagerank if order == 'rank' else cited_by
+                query = query.order_by(primary.desc(), Paper.id)
+            else:
+                query = query.order_by(Paper.id)
+            rows = iter(query.yield_per(batch_size))
+
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                authors = {}
+                author_rows = (session.query(PaperAuthor.paper_id, Author.name)
+                               .join(Author, Author.id == PaperAuthor.author_id)
+                               .filter(PaperAuthor.paper_id.in_([row[0] for row in batch]))
+                               .order_by(PaperAuthor.paper_id, *AUTHOR_ORDER))
+                for paper_id, name in author_rows:
+                    authors.setdefault(paper_id, []).append(name)
+
+                for row in batch:
+                    record = {
+                        'pmid': row[1],
+                        'title': row[2],
+                        'journal': row[3],
+                        'volume': row[4],
+                        'issue': row[5],
+                        'year': row[6],
+                        'created_date': row[7].isoformat() if row[7] else None,
+                        'publication_date': row[8].isoformat() if row[8] else None,
+                        'doi': row[9],
+                        'categories': row[10] or '',
+                        'authors': '; '.join(authors.get(row[0], [])),
+                    }
+                    if include_abstract:
+                        record['abstract'] = row[11]
+                    if ranked:
+                        record['pagerank'] = row[-2]
+                        record['cited_by'] = row[-1]
+                    yield record
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error streaming papers: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    @timed
+    def get_papers_page(self, filters: Dict[str, Any] = None, sort: str = 'id', descending: bool = True,
+                        after: tuple = None, before: tuple = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        필터링된 논문 목록의 한 페이지를 keyset 방식으로 조회합니다.
+        after/before에는 이전 페이지 행의 'key'를 넘기며, 결과는 항상 정렬 순서대로 반환합니다.
+        sort: 'id'(수집순), 'year', 'journal', 'categories', 'rank'(인용 PageRank), 'citations'(피인용 수)
+        """
+        session = self.Session()
+        try:
+            category_names = self._category_names_expr()
+            pagerank = self._citation_expr(CitationRank.pagerank)
+            cited_by = self._citation_expr(CitationRank.cited_by)
+            sort_expr = {
+                'id': Paper.id,
+                'year': func.coalesce(Paper.publication_year, ''),
+                'journal': func.coalesce(Paper.journal_name, ''),
+                'categories': func.coalesce(category_names, ''),
+                'rank': pagerank,
+                'citations': cited_by,
+            }[sort]
+            key = tuple_(sort_expr, Paper.id)
+
+            query = self._filtered_papers_query(session, [
+                Paper.id, Paper.pmid, Paper.title, Paper.publication_year, Paper.journal_name,
+                category_names, pagerank, cited_by, sort_expr
+            ], filters)
+
+            # before로 조회할 때는 역순으로 가져와 뒤집음
+            backward = before is not None
+            if after is not None:
+                query = query.filter(key < tuple(after) if descending else key > tuple(after))
+            if backward:
+                query = query.filter(key > tuple(before) if descending else key < tuple(before))
+            ascending_order = descending == backward
+            order = [sort_expr.asc(), Paper.id.asc()] if ascending_order else [sort_expr.desc(), Paper.id.desc()]
+            rows = query.order_by(*order).limit(limit).all()
+            if backward:
+                rows.reverse()
+
+            return [
+                {
+                    'id': paper_id,
+                    'pmid': pmid,
+                    'title': title,
+                    'year': year,
+                    'journal': journal,
+                    'categories': categories or '',
+                    'pagerank': rank,
+                    'cited_by': citations,
+                    'key': (sort_value, paper_id)
+                }
+                for paper_id, pmid, title, year, journal, categories, rank, citations, sort_value in rows
+            ]
+        except Exception as e:
+            self.logger.error(f"Error retrieving papers page: {str(e)}")
+            return []
+        finally:
+            session.close()
+
+    @timed
+    def count_papers(self, filters: Dict[str, Any] = None) -> int:
+        """필터 조건에 맞는 논문 수를 반환합니다."""
+        session = self.Session()
+        try:
+            return self._filtered_papers_query(session, [func.count(Paper.id)], filters).scalar()
+        except Exception as e:
+            self.logger.error(f"Error counting papers: {str(e)}")
+            return 0
+        finally:
+            session.close()
+
+    def get_corpus_stats(self) -> Dict[str, Any]:
+        """전체 논문을 불러오지 않고 집계 쿼리만으로 통계를 계산합니다."""
+        session = self.Session()
+        try:
+            total, journals, min_year, max_year = exclude_duplicates(session.query(
+                func.count(Paper.id),
+                func.count(func.distinct(Paper.journal_name)),
+                func.min(func.nullif(Paper.publication_year, '')),
+                func.max(func.nullif(Paper.publication_year, ''))
+            )).one()
+            years = [row[0] for row in exclude_duplicates(session.query(Paper.publication_year))
+                     .filter(Paper.publication_year.isnot(None), Paper.publication_year != '')
+                     .distinct()
+                     .order_by(Paper.publication_year.desc())
+                     .all()]
+            category_counts = dict(exclude_duplicates(session.query(Category.name, func.count(Paper.id)))
+                                   .join(paper_categories, paper_categories.c.paper_id == Paper.id)
+                                   .join(Category, Category.id == paper_categories.c.category_id)
+                                   .group_by(Category.name)
+                                   .all())
+            topic_counts = dict(exclude_duplicates(session.query(Topic.key, func.count(Paper.id)))
+                                .join(paper_topics, paper_topics.c.paper_id == Paper.id)
+                                .join(Topic, Topic.id == paper_topics.c.topic_id)
+                                .group_by(Topic.key)
+                                .all())
+            return {
+                'total_papers': total,
+                'journal_count': journals,
+                'min_year': min_year,
+                'max_year': max_year,
+                'years': years,
+                'category_counts': category_counts,
+                'topic_counts': topic_counts
+            }
+        except Exception as e:
+            self.logger.error(f"Error computing corpus stats: {str(e)}")
+            return {'total_papers': 0, 'journal_count': 0, 'min_year': None, 'max_year': None,
+                    'years': [], 'category_counts': {}, 'topic_counts': {}}
+        finally:
+            session.close()
@@ -0,0 +1,180 @@
+import csv
+import glob
+import gzip
+import io
+import os
+import shutil
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+import yaml
+
+from scripts import metrics
+from scripts.logger import setup_logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 출력은 선택 기능
+    pa = pq = None
+
+EXPORT_COLUMNS = ['pmid', 'title', 'journal', 'volume', 'issue', 'year', 'created_date', 'categories', 'authors',
+                  'abstract']
+WATERMARK_KEY = 'export_watermark'
+
+
+class PaperExporter:
+    """
+    마지막 내보내기 이후 저장된 논문만 내보내기마다 한 파일씩 CSV(선택적으로 gzip)와 Parquet 데이터셋으로 내보냅니다.
+    워터마크는 내보낸 마지막 논문 id이며, 논문은 DB 커서에서 chunk_size개씩 읽어 쓰므로
+    한 번의 내보내기 비용은 말뭉치 크기가 아니라 새로 들어온 논문 수에 비례합니다.
+    """
+
+    def __init__(self, db_manager, base_path: str = None):
+        self.logger = setup_logging(__name__)
+        self.db_manager = db_manager
+        self.base_path = base_path or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        config = self._load_config()
+        self.config = config.get('export') or {}
+        self.csv_output = os.path.join(self.base_path, config['paths'].get('csv_output', 'data/mci_daily.csv'))
+        self.gzip = self.config.get('gzip', True)
+        self.chunk_size = self.config.get('chunk_size', 5000)
+        self.parquet_dir = os.path.join(self.base_path, self.config.get('parquet_dir', 'data/exports/parquet'))
+        self.parquet = self.config.get('parquet', True)
+        self.keep_days = self.config.get('parquet_keep_days')
+        if self.parquet and pq is None:
+            self.logger.warning("pyarrow is not installed; Parquet export is disabled")
+            self.parquet = False
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일에서 paths와 export 섹션을 읽습니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f)
+
+    def csv_path(self, day: date, after_id: int, until_id: int) -> str:
+        """
+        paths.csv_output을 기준으로 한 내보내기 구간별 파일 경로
+        (예: data/mci_daily_2025-01-31_0000000101-0000000250.csv.gz, Parquet 파트 이름과 같은 구간)
+        """
+        stem, extension = os.path.splitext(self.csv_output)
+        return f"{stem}_{day.isoformat()}_{after_id + 1:010d}-{until_id:010d}{extension}" + ('.gz' if self.gzip else '')
+
+    def export(self, today: date = None) -> Dict[str, Any]:
+        """
+        워터마크 이후의 논문을 내보내고 워터마크를 옮깁니다.
+        CSV와 Parquet 모두 임시 파일에 쓴 뒤 이름을 바꿔 한 번에 나타나고, 그 뒤에만 워터마크를 저장하므로
+        중간에 실패하면 다음 실행에서 같은 구간을 다시 내보냅니다. 파일 이름을 바꾼 뒤 워터마크 저장 전에 중단되었다면
+        다음 실행의 구간은 같은 첫 id에서 시작해 이전 파일을 포함하므로, 새 파일을 둔 뒤 이전 파일을 지웁니다.
+        """
+        today = today or date.today()
+        started = time.perf_counter()
+        after_id = int(self.db_manager.get_state(WATERMARK_KEY, '0'))
+        until_id = self.db_manager.get_last_paper_id()
+        if until_id <= after_id:
+            self.logger.info("Export: no papers since the last export")
+            return {'papers': 0, 'after_id': after_id, 'until_id': after_id, 'files': []}
+
+        # 구간 상한을 고정해 내보내는 도중 저장된 논문은 다음 실행으로 넘김 (근사 중복 논문은 제외)
+        records = self.db_manager.iter_paper_records({'after_id': after_id, 'until_id': until_id},
+                                                     batch_size=self.chunk_size)
+        csv_path = self.csv_path(today, after_id, until_id)
+        parquet_path = os.path.join(self.parquet_dir, f"ingest_date={today.isoformat()}",
+                                    f"part-{after_id + 1:010d}-{until_id:010d}.parquet")
+        csv_tmp = f"{csv_path}.tmp"
+        parquet_tmp = f"{parquet_path}.tmp"
+        exported = 0
+        try:
+            os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+            parquet_writer = None
+            if self.parquet:
+                os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+                parquet_writer = pq.ParquetWriter(parquet_tmp, self._parquet_schema())
+            try:
+                with self._open_csv(csv_tmp) as f:
+                    # 레코드의 나머지 열(발행일·DOI 등)은 기존 내보내기 파일의 열 구성을 유지하도록 제외
+                    writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, lineterminator='\n',
+                                            extrasaction='ignore')
+                    writer.writeheader()
+                    for chunk in self._chunks(records):
+                        writer.writerows(chunk)
+                        if parquet_writer is not None:
+                            parquet_writer.write_table(pa.Table.from_pylist(chunk, schema=self._parquet_schema()))
+                        exported += len(chunk)
+            finally:
+                if parquet_writer is not None:
+                    parquet_writer.close()
+        except Exception:
+            for path in (csv_tmp, parquet_tmp):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        finally:
+            records.close()
+
+        # 완성된 임시 파일만 최종 이름으로 바꿈 (구간의 논문이 모두 근사 중복이면 파일을 만들지 않음)
+        files = []
+        if exported:
+            os.replace(csv_tmp, csv_path)
+            files.append(csv_path)
+        else:
+            os.remove(csv_tmp)
+        if self.parquet:
+            if exported:
+                os.replace(parquet_tmp, parquet_path)
+                files.append(parquet_path)
+            else:
+                os.remove(parquet_tmp)
+        for path in self._stale_parts(after_id):
+            if path not in files:
+                self.logger.warning(f"Replacing export from an interrupted run: {path}")
+                os.remove(path)
+        if self.parquet:
+            self._prune_parquet(today)
+
+        self.db_manager.set_state(WATERMARK_KEY, str(until_id))
+        seconds = time.perf_counter() - started
+        run = metrics.current()
+        run.inc('papers_exported', exported)
+        run.observe('export_seconds', seconds)
+        self.logger.info(f"Exported {exported} papers (ids {after_id + 1}-{until_id}) in {seconds:.1f}s: "
+                         f"{', '.join(files)}")
+        return {'papers': exported, 'after_id': after_id, 'until_id': until_id, 'files': files}
+
+    def _stale_parts(self, after_id: int) -> List[str]:
+        """
+        after_id 다음 id에서 시작하는 기존 CSV·Parquet 파일 (워터마크를 저장하기 전에 중단된 내보내기가 남긴 것).
+        날짜와 끝 id는 그때의 실행에 따라 다를 수 있으므로 첫 id로만 찾습니다.
+        """
+        stem, extension = os.path.splitext(self.csv_output)
+        start = f"{after_id + 1:010d}"
+        pattern = f"{glob.escape(stem)}_*_{start}-*{extension}" + ('.gz' if self.gzip else '')
+        return (glob.glob(pattern) +
+                glob.glob(os.path.join(glob.escape(self.parquet_dir), 'ingest_date=*', f"part-{start}-*.parquet")))
+
+    def _open_csv(self, path: str):
+        if self.gzip:
+            return io.TextIOWrapper(gzip.open(path, 'wb'), encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    def _chunks(self, records: Iterator[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _parquet_schema():
+        return pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+
+    def _prune_parquet(self, today: date):
+        """parquet_keep_days보다 오래된 날짜 파티션을 지워 데이터셋을 일정 기간으로 유지합니다."""
+        if not self.keep_days or not os.path.isdir(self.parquet_dir):
+            return
+        cutoff = (today - timedelta(days=self.keep_days)).isoformat()
+        for name in os.listdir(self.parquet_dir):
+            if name.startswith('ingest_date=') and name[len('ingest_date='):] < cutoff:
+                shutil.rmtree(os.path.join(self.parquet_dir, name), ignore_errors=True)
@@ -0,0 +1,343 @@
+import html
+import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, selectinload
+
+from scripts.blog_generator import CATEGORY_DISPLAY
+from scripts.database import Paper, Category, PaperSummary, paper_categories, exclude_duplicates
+from scripts.logger import setup_logging, worker_logging
+from scripts.summarizer import SUMMARIZER_VERSION
+from scripts.term_trends import STOPWORDS, tokenize, is_term_token
+
+CHUNK_SIZE = 1000
+DOC_SHARD_SIZE = 1000
+CATEGORY_PAGE_SIZE = 500
+# 검색 인덱스 샤드 한 파일의 목표 크기 (바이트). 넘치면 용어 앞부분을 한 글자 늘려 다시 나눔
+SEARCH_SHARD_BYTES = 16 * 1024
+PREFIX_PATTERN = re.compile(r'[^a-z0-9]')
+
+PAGE_STYLE = """
+body { font-family: -apple-system, 'Segoe UI', 'Malgun Gothic', sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; line-height: 1.6; }
+a { color: #1a5fb4; text-decoration: none; }
+.meta { color: #555; }
+.paper { border-bottom: 1px solid #ddd; padding: 0.5em 0; }
+input[type=search] { width: 100%; font-size: 1.2em; padding: 0.4em; }
+"""
+
+
+def split_shards(postings: Dict[str, List[int]], max_bytes: int = SEARCH_SHARD_BYTES) -> Dict[str, List[str]]:
+    """
+    용어를 샤드 key(용어 앞부분, 영숫자 외 문자는 '_')별로 나눕니다. 샤드 크기가 max_bytes를 넘으면
+    key를 한 글자 늘려 다시 나누므로, 용어는 manifest에서 자신의 앞부분과 일치하는 가장 긴 key의 샤드에 있습니다.
+    key와 길이가 같은 용어는 더 나눌 수 없으므로 크기와 관계없이 그 key의 샤드에 남습니다.
+    """
+    normalized = {term: PREFIX_PATTERN.sub('_', term) for term in postings}
+    sizes = {term: len(term) + 4 + sum(len(str(paper_id)) + 1 for paper_id in ids) for term, ids in postings.items()}
+    shards = {}
+
+    def split(prefix: str, terms: List[str]):
+        groups = defaultdict(list)
+        for term in terms:
+            groups[normalized[term][:len(prefix) + 1]].append(term)
+        for key, group in groups.items():
+            if key == prefix or sum(sizes[term] for term in group) <= max_bytes:
+                shards[key] = group
+            else:
+                split(key, group)
+
+    split('', list(postings))
+    return shards
+
+
+def paper_path(pmid: str) -> str:
+    """논문 페이지의 상대 경로를 반환합니다 (디렉토리당 파일 수를 줄이기 위해 PMID 끝 두 자리로 분산)."""
+    return f"papers/{pmid[-2:]}/{pmid}.html"
+
+
+def index_terms(paper: Paper) -> set:
+    """검색 인덱스에 넣을 제목·초록·저자 용어를 추출합니다."""
+    terms = {token for token in tokenize(f"{paper.title or ''} {paper.abstract or ''}") if is_term_token(token)}
+    for author in paper.authors:
+        terms.update(token for token in tokenize(author.name) if len(token) >= 2)
+    return terms
+
+
+def _page(title: str, body: str, depth: int) -> str:
+    root = '../' * depth
+    return (f"<!DOCTYPE html>\n<html lang=\"ko\"><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title><link rel=\"stylesheet\" href=\"{root}style.css\"></head>"
+            f"<body><p><a href=\"{root}index.html\">🧠 MCI 논문 리포트</a></p>\n{body}\n</body></html>\n")
+
+
+def _render_paper(paper: Paper, summary: Optional[str]) -> str:
+    parts = [f"<h1>{html.escape(paper.title)}</h1>"]
+    journal = html.escape(paper.journal_name or '')
+    if paper.journal_volume:
+        journal += f" Vol.{html.escape(paper.journal_volume)}"
+    if paper.journal_issue:
+        journal += f" Issue.{html.escape(paper.journal_issue)}"
+    parts.append(f"<p class=\"meta\">📖 {journal} ({html.escape(paper.publication_year or '')}) · "
+                 f"🔗 <a href=\"https://pubmed.ncbi.nlm.nih.gov/{paper.pmid}/\">PMID {paper.pmid}</a></p>")
+    if paper.authors:
+        parts.append(f"<p>👥 {html.escape(', '.join(author.name for author in paper.authors))}</p>")
+    if paper.categories:
+        links = ', '.join(
+            f"<a href=\"../../categories/{category.name}-1.html\">"
+            f"{html.escape(CATEGORY_DISPLAY.get(category.name, category.name))}</a>"
+            for category in paper.categories
+        )
+        parts.append(f"<p>🏷️ {links}</p>")
+    if summary:
+        parts.append(f"<h2>📝 요약</h2><p>{html.escape(summary)}</p>")
+    if paper.abstract:
+        parts.append(f"<h2>초록</h2><p>{html.escape(paper.abstract)}</p>")
+    return _page(paper.title, '\n'.join(parts), depth=2)
+
+
+def render_chunk(db_path: str, output_dir: str, paper_ids: List[int]) -> Tuple[Dict[str, List[int]], List[list]]:
+    """
+    워커 프로세스에서 논문 묶음의 페이지를 쓰고,
+    (용어 → 논문 id 목록, [id, pmid, 제목, 연도, 저널] 목록)을 반환합니다.
+    """
+    engine = create_engine(f'sqlite:///{db_path}')
+    session = sessionmaker(bind=engine)()
+    try:
+        papers = (session.query(Paper)
+                  .options(selectinload(Paper.authors), selectinload(Paper.categories))
+                  .filter(Paper.id.in_(paper_ids))
+                  .all())
+        summaries = dict(session.query(PaperSummary.pmid, PaperSummary.summary)
+                         .filter(PaperSummary.version == SUMMARIZER_VERSION,
+                                 PaperSummary.pmid.in_([paper.pmid for paper in papers]))
+                         .all())
+
+        postings = defaultdict(list)
+        docs = []
+        for paper in papers:
+            path = os.path.join(output_dir, paper_path(paper.pmid))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(_render_paper(paper, summaries.get(paper.pmid)))
+            for term in index_terms(paper):
+                postings[term].append(paper.id)
+            docs.append([paper.id, paper.pmid, paper.title, paper.publication_year, paper.journal_name])
+        return dict(postings), docs
+    finally:
+        session.close()
+        engine.dispose()
+
+
+SEARCH_SCRIPT = r"""
+const shards = {}, docShards = {}, pending = {};
+let shardKeys = null, maxKeyLength = 0;
+window.mciSearchManifest = keys => {
+  shardKeys = new Set(keys);
+  maxKeyLength = keys.reduce((n, key) => Math.max(n, key.length), 0);
+};
+window.mciSearchShard = (key, data) => { shards[key] = data; };
+window.mciDocShard = (key, data) => { docShards[key] = data; };
+function load(src, ready) {
+  if (ready()) return Promise.resolve();
+  if (!pending[src]) pending[src] = new Promise(resolve => {
+    const s = document.createElement('script'); s.src = src; s.onload = resolve; s.onerror = resolve;
+    document.head.appendChild(s);
+  });
+  return pending[src];
+}
+const normalize = term => term.replace(/[^a-z0-9]/g, '_');
+// manifest에서 용어 앞부분과 일치하는 가장 긴 샤드 key
+function shardFor(term) {
+  const key = normalize(term);
+  for (let n = Math.min(key.length, maxKeyLength); n > 0; n--) {
+    if (shardKeys.has(key.slice(0, n))) return key.slice(0, n);
+  }
+  return null;
+}
+// 입력 중인 마지막 용어(접두어)로 시작하는 용어가 있을 수 있는 샤드들
+function prefixShards(prefix) {
+  const key = normalize(prefix), keys = [...shardKeys].filter(k => k.startsWith(key)), own = shardFor(prefix);
+  return own === null || keys.includes(own) ? keys : keys.concat([own]);
+}
+const loadShard = key => load('search/t-' + key + '.js', () => key in shards);
+function postings({term, prefix}) {
+  if (!prefix) return new Set(((shards[shardFor(term)] || {})[term]) || []);
+  const ids = new Set();
+  for (const key of prefixShards(term)) {
+    for (const [t, list] of Object.entries(shards[key] || {})) {
+      if (t.startsWith(term)) list.forEach(id => ids.add(id));
+    }
+  }
+  return ids;
+}
+// 색인과 같은 규칙으로 용어를 고름: 불용어·숫자는 색인되지 않고, 두 글자 용어는 저자 이름에만 있음
+function queryTerms(query) {
+  const words = query.toLowerCase().match(/[\p{L}\p{N}][\p{L}\p{N}_-]*/gu) || [];
+  const typing = words.length > 0 && !/\s$/.test(query);
+  return words
+    .filter(t => t.length >= 2 && !STOPWORDS.has(t) && !/^\d+$/.test(t))
+    .map((t, i, list) => ({term: t, prefix: typing && t.length >= 3 && i === list.length - 1 && t === words[words.length - 1]}));
+}
+async function search(query) {
+  await load('search/manifest.js', () => shardKeys !== null);
+  if (shardKeys === null) return [];
+  let terms = queryTerms(query);
+  const shardNames = new Set();
+  for (const t of terms) {
+    if (t.prefix) prefixShards(t.term).forEach(k => shardNames.add(k));
+    else if (shardFor(t.term) !== null) shardNames.add(shardFor(t.term));
+  }
+  await Promise.all([...shardNames].map(loadShard));
+  terms = terms.filter(t => t.term.length >= 3 || t.term in (shards[shardFor(t.term)] || {}));
+  if (!terms.length) return [];
+  let result = null;
+  for (const t of terms) {
+    const ids = postings(t);
+    result = result === null ? ids : new Set([...result].filter(id => ids.has(id)));
+  }
+  const top = [...result].sort((a, b) => b - a).slice(0, 100);
+  const keys = [...new Set(top.map(id => Math.floor(id / DOC_SHARD_SIZE)))];
+  await Promise.all(keys.map(k => load('search/docs-' + k + '.js', () => k in docShards)));
+  return [result.size, top.map(id => docShards[Math.floor(id / DOC_SHARD_SIZE)][id]).filter(Boolean)];
+}
+const escapeHTML = value => String(value ?? '').replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})[c]);
+const box = document.getElementById('q'), out = document.getElementById('results');
+let timer = null;
+box.addEventListener('input', () => {
+  clearTimeout(timer);
+  timer = setTimeout(async () => {
+    const found = await search(box.value);
+    if (!found.length) { out.innerHTML = ''; return; }
+    const [total, docs] = found;
+    out.innerHTML = '<p class="meta">' + total + '편</p>' + docs.map(d =>
+      '<div class="paper"><a href="' + escapeHTML(d[4]) + '">' + escapeHTML(d[1]) + '</a>' +
+      '<div class="meta">' + escapeHTML(d[3]) + ' · ' + escapeHTML(d[2]) + ' · PMID ' + escapeHTML(d[0]) +
+      '</div></div>').join('');
+  }, 150);
+});
+"""
+
+
+class HTMLReportGenerator:
+    """
+    DB에서 논문·카테고리 페이지를 병렬로 렌더링하고,
+    용어 앞부분으로 나눈 크기 제한 역색인 샤드와 샤드 목록(manifest)을 미리 만들어
+    오프라인 검색을 지원하는 정적 HTML 리포트를 생성합니다.
+    """
+
+    def __init__(self, db_manager, db_path: str, output_dir: str, workers: Optional[int] = None):
+        self.logger = setup_logging(__name__)
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self.output_dir = output_dir
+        self.workers = workers
+
+    def generate(self) -> int:
+        """리포트를 생성하고 포함된 논문 수를 반환합니다."""
+        os.makedirs(os.path.join(self.output_dir, 'search'), exist_ok=True)
+        session = self.db_manager.Session()
+        try:
+            paper_ids = [row[0] for row in exclude_duplicates(session.query(Paper.id)).order_by(Paper.id).all()]
+            memberships = (exclude_duplicates(session.query(Category.name, Paper.id))
+                           .join(paper_categories, paper_categories.c.paper_id == Paper.id)
+                           .join(Category, Category.id == paper_categories.c.category_id)
+                           .order_by(Category.name, Paper.id.desc())
+                           .all())
+        finally:
+            session.close()
+
+        # 논문 페이지 렌더링과 용어 추출을 워커 프로세스에 분배
+        postings = defaultdict(list)
+        docs = {}
+        chunks = [paper_ids[i:i + CHUNK_SIZE] for i in range(0, len(paper_ids), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=self.workers, **worker_logging()) as executor:
+            futures = [executor.submit(render_chunk, self.db_path, self.output_dir, chunk) for chunk in chunks]
+            for future in futures:
+                chunk_postings, chunk_docs = future.result()
+                for term, ids in chunk_postings.items():
+                    postings[term].extend(ids)
+                for paper_id, pmid, title, year, journal in chunk_docs:
+                    docs[paper_id] = [pmid, title, journal, year, paper_path(pmid)]
+
+        self._write_search_index(postings, docs)
+        categories = self._write_category_pages(memberships, docs)
+        self._write_index(len(docs), categories)
+        self.logger.info(f"HTML report generated for {len(docs)} papers in {self.output_dir}")
+        return len(docs)
+
+    def _write_js(self, path: str, callback: str, key, data):
+        """file:// 에서도 불러올 수 있도록 JSON 데이터를 콜백 호출 스크립트로 감싸 저장합니다."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{callback}({json.dumps(key)},")
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            f.write(");\n")
+
+    def _write_search_index(self, postings: Dict[str, List[int]], docs: Dict[int, list]):
+        search_dir = os.path.join(self.output_dir, 'search')
+        # 이전 생성에서 남은 샤드가 manifest와 섞이지 않도록 비움
+        for name in os.listdir(search_dir):
+            os.remove(os.path.join(search_dir, name))
+        shards = split_shards(postings)
+        for key, terms in shards.items():
+            # 파일 이름에 접두사를 붙여 con·aux 같은 Windows 예약 이름을 피함
+            self._write_js(os.path.join(search_dir, f"t-{key}.js"), 'mciSearchShard', key,
+                           {term: sorted(postings[term]) for term in terms})
+        with open(os.path.join(search_dir, 'manifest.js'), 'w', encoding='utf-8') as f:
+            f.write(f"mciSearchManifest({json.dumps(sorted(shards))});\n")
+
+        doc_shards = defaultdict(dict)
+        for paper_id, doc in docs.items():
+            doc_shards[paper_id // DOC_SHARD_SIZE][paper_id] = doc
+        for key, shard in doc_shards.items():
+            self._write_js(os.path.join(search_dir, f"docs-{key}.js"), 'mciDocShard', key, shard)
+        self.logger.info(f"Search index: {len(postings)} terms in {len(shards)} shards")
+
+    def _write_category_pages(self, memberships, docs: Dict[int, list]) -> Dict[str, int]:
+        by_category = defaultdict(list)
+        for name, paper_id in memberships:
+            if paper_id in docs:
+                by_category[name].append(docs[paper_id])
+
+        category_dir = os.path.join(self.output_dir, 'categories')
+        os.makedirs(category_dir, exist_ok=True)
+        for name, entries in by_category.items():
+            display = CATEGORY_DISPLAY.get(name, name)
+            page_count = (len(entries) + CATEGORY_PAGE_SIZE - 1) // CATEGORY_PAGE_SIZE
+            for page in range(page_count):
+                chunk = entries[page * CATEGORY_PAGE_SIZE:(page + 1) * CATEGORY_PAGE_SIZE]
+                items = '\n'.join(
+                    f"<div class=\"paper\"><a href=\"../{path}\">{html.escape(title)}</a>"
+                    f"<div class=\"meta\">{html.escape(year or '')} · {html.escape(journal or '')} · PMID {pmid}</div></div>"
+                    for pmid, title, journal, year, path in chunk
+                )
+                nav = ' '.join(
+                    f"<a href=\"{name}-{i}.html\">{i}</a>" if i != page + 1 else f"<b>{i}</b>"
+                    for i in range(1, page_count + 1)
+                )
+                body = f"<h1>{html.escape(display)} ({len(entries)}편)</h1><p>{nav}</p>\n{items}"
+                with open(os.path.join(category_dir, f"{name}-{page + 1}.html"), 'w', encoding='utf-8') as f:
+                    f.write(_page(display, body, depth=1))
+        return {name: len(entries) for name, entries in by_category.items()}
+
+    def _write_index(self, total: int, categories: Dict[str, int]):
+        with open(os.path.join(self.output_dir, 'style.css'), 'w', encoding='utf-8') as f:
+            f.write(PAGE_STYLE)
+
+        category_links = '\n'.join(
+            f"<li><a href=\"categories/{name}-1.html\">{html.escape(CATEGORY_DISPLAY.get(name, name))}</a> ({count}편)</li>"
+            for name, count in sorted(categories.items(), key=lambda item: item[1], reverse=True)
+        )
+        body = (f"<h1>🧠 MCI 논문 리포트</h1>"
+                f"<p class=\"meta\">총 {total}편 · 생성일 {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>"
+                f"<input type=\"search\" id=\"q\" placeholder=\"제목, 초록, 저자 검색\" autofocus>"
+                f"<div id=\"results\"></div><h2>🏷️ 카테고리</h2><ul>{category_links}</ul>"
+                f"<script>const DOC_SHARD_SIZE = {DOC_SHARD_SIZE};"
+                f"const STOPWORDS = new Set({json.dumps(sorted(STOPWORDS))});{SEARCH_SCRIPT}</script>")
+        with open(os.path.join(self.output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(_page('MCI 논문 리포트', body, depth=0))
@@ -0,0 +1,382 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+import yaml
+
+from scripts import metrics
+from scripts.categorizer import PaperCategorizer
+from scripts.logger import setup_logging, worker_logging
+from scripts.pubmed_parser import PubMedXMLParser
+from scripts.topics import load_topics
+
+# 각 큐에서 상류 단계가 끝났음을 알리는 표식
+_DONE = object()
+
+# 파서 프로세스마다 분류 규칙 파일별로 한 번만 만드는 분류기
+_categorizers: Dict[Optional[str], PaperCategorizer] = {}
+
+
+def _categorizer_for(rules_path: Optional[str]) -> PaperCategorizer:
+    categorizer = _categorizers.get(rules_path)
+    if categorizer is None:
+        categorizer = _categorizers[rules_path] = PaperCategorizer(rules_path)
+    return categorizer
+
+
+def parse_and_categorize(xml_content: str, topic_rules: Dict[str, str] = None,
+                         pmid_topics: Dict[str, List[str]] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    파서 프로세스: efetch XML 한 묶음을 파싱하고 각 논문의 카테고리를 미리 분류합니다.
+    topic_rules는 주제 key → 분류 규칙 경로(첫 항목이 기본 주제), pmid_topics는 PMID → 검색된 주제 목록입니다.
+    여러 주제에서 검색된 논문은 각 주제의 규칙으로 분류한 카테고리의 합집합을 가집니다.
+    파싱된 논문 목록과 파싱에 실패한 논문 수를 반환합니다.
+    """
+    topic_rules = topic_rules or {None: None}
+    default_topics = list(topic_rules)[:1]
+    pmid_topics = pmid_topics or {}
+
+    papers = []
+    failed = 0
+    for article in ET.fromstring(xml_content).iter('PubmedArticle'):
+        paper_info = PubMedXMLParser.parse_article(article)
+        if paper_info:
+            topics = pmid_topics.get(paper_info['pmid']) or default_topics
+            categories = []
+            for topic in topics:
+                for category in _categorizer_for(topic_rules.get(topic)).categorize_paper(
+                        paper_info['title'], paper_info['abstract']):
+                    if category not in categories:
+                        categories.append(category)
+            paper_info['categories'] = categories
+            if topics != [None]:
+                paper_info['topics'] = topics
+            papers.append(paper_info)
+        else:
+            failed += 1
+    return papers, failed
+
+
+class StageStats:
+    """파이프라인 단계별 처리량 집계 (여러 작업 스레드가 함께 기록)"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.batches = 0
+        self.papers = 0
+        self.busy_seconds = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, papers: int, seconds: float):
+        with self._lock:
+            self.batches += 1
+            self.papers += papers
+            self.busy_seconds += seconds
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        """처리량과 가동률을 계산합니다. 가동률이 가장 높은 단계가 병목입니다."""
+        return {
+            'workers': self.workers,
+            'batches': self.batches,
+            'papers': self.papers,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'papers_per_second': round(self.papers / wall_seconds, 1) if wall_seconds else 0.0,
+            'utilization': round(self.busy_seconds / (wall_seconds * self.workers), 3) if wall_seconds else 0.0,
+        }
+
+
+class IngestPipeline:
+    """
+    PubMed 수집을 검색 → 상세 조회 → 파싱·분류 → 저장 단계로 나누어 동시에 실행합니다.
+    단계 사이는 크기가 제한된 큐로 연결되어 느린 단계가 앞 단계를 멈추게 하므로(backpressure)
+    메모리 사용량이 일정하고, 전체 시간은 가장 느린 단계의 시간에 가까워집니다.
+    설정된 모든 주제를 한 번에 검색하고, 여러 주제에 걸친 PMID는 한 번만 조회·저장합니다.
+    """
+
+    def __init__(self, crawler, db_manager):
+        self.logger = setup_logging(__name__)
+        self.crawler = crawler
+        self.db_manager = db_manager
+        self.config = self._load_config()
+        self.fetch_workers = self.config.get('fetch_workers', 3)
+        self.parse_workers = self.config.get('parse_workers') or min(4, os.cpu_count() or 1)
+        self.queue_size = self.config.get('queue_size', 8)
+        self.write_batch = self.config.get('write_batch', 200)
+        self.overlap_days = self.config.get('overlap_days', 1)
+        self.max_window_days = self.config.get('max_window_days', 7)
+        self.initial_days = self.config.get('initial_days', 1)
+        self.topics = load_topics()
+        self.topic_rules = {topic['key']: topic['category_rules'] for topic in self.topics}
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 pipeline 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('pipeline') or {}
+
+    def run(self, days_back: int = 1, start_date: str = None, end_date: str = None,
+            term: Optional[str] = None) -> Dict[str, Any]:
+        """
+        파이프라인을 끝까지 실행하고 단계별 처리량과 추가된 논문 수를 반환합니다.
+        term을 주면 모든 주제 대신 그 검색식 하나로 기본 주제를 수집합니다.
+        검색이 실패하면 받은 만큼 저장한 뒤 그 예외를 다시 발생시킵니다.
+        개별 묶음의 조회·파싱·저장 실패는 단계 오류 수로만 집계됩니다.
+        """
+        if term:
+            queries = [(self.topics[0]['key'], term)]
+        else:
+            queries = [(topic['key'], self.crawler.build_query(days_back, start_date, end_date, topic['keywords']))
+                       for topic in self.topics]
+        self._search_error = None
+        self._skipped_existing = 0
+        self._pmid_topics: Dict[str, List[str]] = {}
+        self.logger.info(f"Starting ingest pipeline for topics: {', '.join(key for key, _ in queries)}")
+
+        fetch_queue = queue.Queue(maxsize=self.queue_size)
+        parse_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+        stats = {
+            'search': StageStats('search', 1),
+            'fetch': StageStats('fetch', self.fetch_workers),
+            'parse': StageStats('parse', self.parse_workers),
+            'write': StageStats('write', 1),
+        }
+
+        started = time.perf_counter()
+        self.db_manager._before_ingest()
+        with ProcessPoolExecutor(max_workers=self.parse_workers, **worker_logging()) as parse_pool:
+            threads = [threading.Thread(target=self._search_stage, name='ingest-search',
+                                        args=(queries, fetch_queue, stats['search']))]
+            threads += self._worker_group('fetch', self.fetch_workers, self._fetch_stage,
+                                          fetch_queue, parse_queue, stats['fetch'])
+            threads += self._worker_group('parse', self.parse_workers, self._parse_stage,
+                                          parse_queue, write_queue, stats['parse'], parse_pool)
+            for thread in threads:
+                thread.start()
+
+            # 저장은 SQLite 쓰기가 하나뿐이도록 호출한 스레드에서 직렬로 수행
+            added = self._write_stage(write_queue, stats['write'])
+            for thread in threads:
+                thread.join()
+
+        if added:
+            self.db_manager._after_ingest()
+        self.db_manager.categorizer.summary.flush()
+        self.db_manager.summary.flush()
+
+        wall_seconds = time.perf_counter() - started
+        result = {
+            'found': len(self._pmid_topics),
+            'skipped_existing': self._skipped_existing,
+            'added': added,
+            'wall_seconds': round(wall_seconds, 3),
+            'stages': {name: stage.report(wall_seconds) for name, stage in stats.items()},
+        }
+        run = metrics.current()
+        run.set_gauge('papers_found', result['found'])
+        for name, report in result['stages'].items():
+            run.set_gauge('ingest_stage_papers_per_second', report['papers_per_second'], stage=name)
+            run.set_gauge('ingest_stage_utilization', report['utilization'], stage=name)
+            run.inc('ingest_stage_errors', report['errors'], stage=name)
+            self.logger.info(
+                f"Stage {name}: {report['papers']} papers in {report['batches']} batches, "
+                f"{report['papers_per_second']} papers/s, utilization {report['utilization']:.0%} "
+                f"x{report['workers']}, errors {report['errors']}"
+            )
+        self.logger.info(f"Ingest pipeline finished: {result['found']} found, "
+                         f"{self._skipped_existing} already stored, {added} added in {wall_seconds:.1f}s")
+        if self._search_error is not None:
+            raise self._search_error
+        return result
+
+    def crawl_windows(self, today: date = None) -> List[Tuple[date, date]]:
+        """
+        수집 워터마크(crawl_watermark, 마지막으로 끝까지 수집한 날짜) 이후 구간을
+        max_window_days일 단위로 나눕니다. PubMed 생성일 검색은 날짜 단위이므로
+        overlap_days만큼 겹쳐 검색하고, 이미 저장된 PMID는 상세 조회 전에 걸러냅니다.
+        """
+        today = today or date.today()
+        watermark = self.db_manager.get_state('crawl_watermark')
+        if watermark:
+            start = min(date.fromisoformat(watermark), today) - timedelta(days=self.overlap_days)
+        else:
+            start = today - timedelta(days=self.initial_days)
+
+        windows = []
+        while True:
+            end = min(start + timedelta(days=self.max_window_days - 1), today)
+            windows.append((start, end))
+            if end >= today:
+                return windows
+            start = end + timedelta(days=1)
+
+    def run_incremental(self, today: date = None) -> Dict[str, Any]:
+        """
+        워터마크 이후 놓친 구간을 오래된 것부터 차례로 수집하고, 구간마다 워터마크를 앞으로 옮깁니다.
+        구간 수집이 실패하거나 어느 단계에서든 오류가 난 묶음이 있으면 워터마크는 마지막으로 완전히 성공한 구간에
+        남고, 남은 구간은 다음 실행이 그 구간부터 다시 수집합니다 (이미 저장된 PMID는 건너뜀).
+        """
+        windows = self.crawl_windows(today)
+        if len(windows) > 1:
+            self.logger.info(f"Catching up {len(windows)} crawl windows from {windows[0][0]} to {windows[-1][1]}")
+
+        total = {'found': 0, 'skipped_existing': 0, 'added': 0, 'windows': [], 'stages': {}, 'complete': True}
+        for start, end in windows:
+            result = self.run(start_date=start.strftime('%Y/%m/%d'), end_date=end.strftime('%Y/%m/%d'))
+            for key in ('found', 'skipped_existing', 'added'):
+                total[key] += result[key]
+            total['windows'].append({'start': start.isoformat(), 'end': end.isoformat(), 'found': result['found'],
+                                     'added': result['added']})
+            total['stages'] = result['stages']
+            failed = {name: stats['errors'] for name, stats in result['stages'].items() if stats['errors']}
+            if failed:
+                # fetch·parse·write 오류는 run()이 예외로 올리지 않으므로 여기서 워터마크를 멈춰 유실을 막음
+                self.logger.warning(f"Crawl window {start}..{end} had errors "
+                                    f"({', '.join(f'{name}={count}' for name, count in failed.items())}); "
+                                    f"keeping watermark for retry on the next run")
+                total['complete'] = False
+                break
+            self.db_manager.set_state('crawl_watermark', end.isoformat())
+        metrics.current().set_gauge('crawl_windows', len(windows))
+        return total
+
+    def _worker_group(self, name: str, count: int, target, inbox: queue.Queue, outbox: queue.Queue,
+                      stage: StageStats, *extra) -> List[threading.Thread]:
+        """같은 단계의 작업 스레드들을 만듭니다. 마지막으로 끝난 스레드가 다음 단계에 종료를 알립니다."""
+        remaining = [count]
+        lock = threading.Lock()
+
+        def run():
+            try:
+                target(inbox, outbox, stage, *extra)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_DONE)
+
+        return [threading.Thread(target=run, name=f"ingest-{name}-{i}") for i in range(count)]
+
+    @staticmethod
+    def _drain(inbox: queue.Queue):
+        """종료 표식을 받을 때까지 항목을 꺼냅니다. 같은 단계의 다른 스레드도 멈추도록 표식을 되돌려 놓습니다."""
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                inbox.put(_DONE)
+                return
+            yield item
+
+    def _search_stage(self, queries: List[Tuple[str, str]], fetch_queue: queue.Queue, stage: StageStats):
+        """
+        모든 주제의 esearch 결과를 PMID → 주제 목록으로 모은 뒤, 중복 없이 efetch 크기의 묶음으로 나누어 넘깁니다.
+        주제 간 중복을 efetch 전에 없애기 위해 검색이 모두 끝난 뒤 조회를 시작합니다 (검색은 보통 몇 페이지).
+        """
+        pmid_topics = self._pmid_topics
+        try:
+            for topic_key, term in queries:
+                self.logger.info(f"Searching topic {topic_key}: {term}")
+                pages = self.crawler.iter_pmids(term)
+                while True:
+                    started = time.perf_counter()
+                    pmids = next(pages, None)
+                    if pmids is None:
+                        break
+                    stage.record(len(pmids), time.perf_counter() - started)
+                    for pmid in pmids:
+                        pmid_topics.setdefault(pmid, []).append(topic_key)
+        except Exception as e:
+            stage.error()
+            self._search_error = e
+            self.logger.error(f"PubMed search failed: {str(e)}")
+
+        chunk_size = self.crawler.efetch_chunk_size
+        try:
+            metrics.current().inc('papers_multi_topic', sum(1 for topics in pmid_topics.values() if len(topics) > 1))
+            pmids = list(pmid_topics)
+            # 겹쳐 검색한 구간 등으로 이미 저장된 논문은 efetch하지 않고 주제 연결만 추가
+            existing = self.db_manager.get_existing_pmids(pmids)
+            if existing:
+                self._skipped_existing += len(existing)
+                metrics.current().inc('papers_skipped', len(existing), reason='already_stored')
+                self.db_manager.link_topics({pmid: pmid_topics[pmid] for pmid in existing})
+                pmids = [pmid for pmid in pmids if pmid not in existing]
+            for start in range(0, len(pmids), chunk_size):
+                fetch_queue.put(pmids[start:start + chunk_size])
+        except Exception as e:
+            stage.error()
+            self._search_error = self._search_error or e
+            self.logger.error(f"Dispatching search results failed: {str(e)}")
+        finally:
+            fetch_queue.put(_DONE)
+
+    def _fetch_stage(self, fetch_queue: queue.Queue, parse_queue: queue.Queue, stage: StageStats):
+        for pmids in self._drain(fetch_queue):
+            started = time.perf_counter()
+            try:
+                xml_content = self.crawler.fetch_details(pmids)
+            except Exception as e:
+                stage.error()
+                self.logger.error(f"Fetching {len(pmids)} papers failed: {str(e)}")
+                continue
+            stage.record(len(pmids), time.perf_counter() - started)
+            parse_queue.put((pmids, xml_content))
+
+    def _parse_stage(self, parse_queue: queue.Queue, write_queue: queue.Queue, stage: StageStats,
+                     parse_pool: ProcessPoolExecutor):
+        for pmids, xml_content in self._drain(parse_queue):
+            started = time.perf_counter()
+            pmid_topics = {pmid: self._pmid_topics[pmid] for pmid in pmids if pmid in self._pmid_topics}
+            try:
+                papers, failed = parse_pool.submit(parse_and_categorize, xml_content, self.topic_rules,
+                                                   pmid_topics).result()
+            except Exception as e:
+                stage.error()
+                self.logger.error(f"Parsing efetch response failed: {str(e)}")
+                continue
+            run = metrics.current()
+            run.inc('papers_parsed', len(papers))
+            run.inc('parse_errors', failed)
+            run.observe('parse_batch_seconds', time.perf_counter() - started)
+            stage.record(len(papers), time.perf_counter() - started)
+            write_queue.put(papers)
+
+    def _write_stage(self, write_queue: queue.Queue, stage: StageStats) -> int:
+        """파싱된 논문을 write_batch개씩 모아 한 트랜잭션으로 저장합니다."""
+        added = 0
+        buffer = []
+        done = False
+        while not done:
+            papers = write_queue.get()
+            if papers is _DONE:
+                done = True
+            else:
+                buffer.extend(papers)
+            while len(buffer) >= self.write_batch or (done and buffer):
+                batch, buffer = buffer[:self.write_batch], buffer[self.write_batch:]
+                started = time.perf_counter()
+                try:
+                    batch_added, failed = self.db_manager.add_paper_batch(batch)
+                except Exception as e:
+                    stage.error()
+                    self.logger.error(f"Storing {len(batch)} papers failed: {str(e)}")
+                    continue
+                added += batch_added
+                # 저장하지 못한 논문이 있으면 오류로 집계해 증분 수집 워터마크가 이 구간을 넘지 않게 함
+                for _ in range(failed):
+                    stage.error()
+                stage.record(len(batch), time.perf_counter() - started)
+        return added
@@ -1,23 +1,158 @@
+import atexit
+import gzip
 import logging
+import logging.handlers
+import multiprocessing
 import os
-from datetime import datetime
+import queue
+import shutil
+import threading
+from collections import Counter
+from typing import Any, Dict
+
+import yaml
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+_setup_lock = threading.Lock()
+# 메인 프로세스의 파일·콘솔 handler와 워커 프로세스 로그를 받는 큐 (worker_logging 첫 호출 때 생성)
+_handlers = ()
+_worker_queue = None
+# 워커 프로세스에서는 listener를 따로 띄우지 않음을 표시
+_IN_WORKER = object()
+
+
+def _load_logging_config() -> Dict[str, Any]:
+    """config.yaml의 logging 섹션을 로드합니다."""
+    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return (yaml.safe_load(f) or {}).get('logging') or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str):
+    """로테이션된 로그 파일을 gzip으로 압축합니다."""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _start_listener() -> logging.handlers.QueueListener:
+    """큐 기반 로깅을 구성하고 백그라운드 writer 스레드를 시작합니다."""
+    config = _load_logging_config()
 
-def setup_logging():
     # 로그 디렉토리 생성
     log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     os.makedirs(log_dir, exist_ok=True)
 
-    # 로그 파일명 설정 (날짜별)
-    log_file = os.path.join(log_dir, f'mci_paper_{datetime.now().strftime("%Y%m%d")}.log')
-
-    # 로깅 설정
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # 자정마다 로테이션하고 지난 파일은 압축 보관
+    file_handler = logging.handlers.TimedRotatingFileHandler(
+        os.path.join(log_dir, 'mci_paper.log'),
+        when='midnight',
+        backupCount=config.get('backup_count', 14),
+        encoding='utf-8'
     )
+    if config.get('compress', True):
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setLevel(config.get('console_level', 'INFO'))
+    stream_handler.setFormatter(formatter)
+
+    # 호출 스레드는 큐에 넣기만 하고, 포맷팅과 디스크 쓰기는 listener 스레드가 담당
+    global _handlers
+    _handlers = (file_handler, stream_handler)
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _set_levels(config)
+
+    listener = logging.handlers.QueueListener(log_queue, *_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def _set_levels(config: Dict[str, Any]):
+    """루트와 로거별 레벨을 설정합니다."""
+    logging.getLogger().setLevel(config.get('level', 'INFO'))
+    for logger_name, level in (config.get('levels') or {}).items():
+        logging.getLogger(logger_name).setLevel(level)
+
+
+def _init_worker(log_queue):
+    """
+    ProcessPoolExecutor 워커 초기화: fork로 물려받은 프로세스 내부 큐 handler를 버리고
+    메인 프로세스의 listener가 읽는 multiprocessing 큐로 로그를 보냅니다.
+    """
+    global _listener
+    with _setup_lock:
+        _listener = _IN_WORKER
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    _set_levels(_load_logging_config())
+
+
+def worker_logging() -> Dict[str, Any]:
+    """
+    워커 프로세스의 로그가 메인 프로세스의 로그 파일·콘솔에 기록되도록 하는 ProcessPoolExecutor 인자.
+    사용 예: ProcessPoolExecutor(max_workers=4, **worker_logging())
+    """
+    global _worker_queue
+    setup_logging()
+    with _setup_lock:
+        if _worker_queue is None and _listener is not _IN_WORKER:
+            _worker_queue = multiprocessing.Queue()
+            listener = logging.handlers.QueueListener(_worker_queue, *_handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+    if _worker_queue is None:
+        # 워커 안에서 다시 풀을 만드는 경우: 자식은 이 워커의 큐 handler를 그대로 물려받음
+        return {}
+    return {'initializer': _init_worker, 'initargs': (_worker_queue,)}
+
+
+def setup_logging(name: str = None) -> logging.Logger:
+    """로깅을 한 번만 초기화하고 지정한 이름의 로거를 반환합니다."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            _listener = _start_listener()
+
+    return logging.getLogger(name or __name__)
+
+
+class LogSummary:
+    """건별 이벤트를 집계했다가 배치 단위 요약 로그 한 줄로 기록합니다."""
+
+    def __init__(self, logger: logging.Logger, label: str):
+        self.logger = logger
+        self.label = label
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, event: str, count: int = 1):
+        with self._lock:
+            self.counts[event] += count
 
-    return logging.getLogger(__name__)
+    def flush(self, level: int = logging.INFO):
+        """집계된 이벤트를 기록하고 카운터를 초기화합니다."""
+        with self._lock:
+            if not self.counts:
+                return
+            items = ', '.join(f"{event}={count}" for event, count in self.counts.most_common())
+            self.counts.clear()
+        self.logger.log(level, f"{self.label} summary: {items}")
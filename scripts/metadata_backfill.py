@@ -0,0 +1,82 @@
+import os
+from typing import Any, Dict
+from xml.etree import ElementTree as ET
+
+import yaml
+
+from scripts import metrics
+from scripts.logger import setup_logging
+from scripts.pubmed_parser import PubMedXMLParser
+
+WATERMARK_KEY = 'metadata_backfill_id'
+
+
+class MetadataBackfill:
+    """
+    발행일·DOI·MeSH·출판 유형·소속을 파싱하기 전에 저장된 논문(publication_date가 없는 논문)을
+    efetch로 batch_size편씩 다시 받아 채웁니다.
+    워터마크는 처리한 마지막 논문 id이므로 중단된 실행은 이어서 진행하고,
+    PubMed에도 발행일이 없거나 PubMed에서 빠진(철회 등) 논문은 매번 다시 조회하지 않습니다.
+    """
+
+    def __init__(self, crawler, db_manager):
+        self.logger = setup_logging(__name__)
+        self.crawler = crawler
+        self.db_manager = db_manager
+        self.config = self._load_config()
+        self.batch_size = self.config.get('batch_size', crawler.efetch_chunk_size)
+        self.max_papers = self.config.get('max_papers_per_run', 5000)
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 metadata_backfill 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('metadata_backfill') or {}
+
+    def run(self, max_papers: int = None) -> Dict[str, int]:
+        """
+        워터마크 다음의 메타데이터 없는 논문을 최대 max_papers편까지 채웁니다.
+        efetch·XML 파싱·저장에서 예외가 나면 워터마크를 그 묶음 앞에 둔 채 멈추므로 다음 실행에서 다시 시도합니다.
+        efetch가 정상 응답했지만 일부 또는 전부의 논문이 없으면 확인한 것으로 보고 워터마크를 옮깁니다.
+        """
+        run = metrics.current()
+        limit = max_papers or self.max_papers
+        after_id = int(self.db_manager.get_state(WATERMARK_KEY, '0'))
+        result = {'papers': 0, 'updated': 0, 'not_found': 0, 'errors': 0}
+
+        while result['papers'] < limit:
+            batch = self.db_manager.get_papers_missing_metadata(after_id, min(self.batch_size, limit - result['papers']))
+            if not batch:
+                break
+            pmids = [pmid for _, pmid in batch if str(pmid).isdigit()]
+            updated = 0
+            if pmids:
+                try:
+                    # parse_paper_details는 XML 오류를 빈 목록으로 바꾸므로 직접 파싱해 실패와 "논문 없음"을 구분
+                    xml_content = self.crawler.fetch_details(pmids)
+                    records = [paper for paper in map(PubMedXMLParser.parse_article,
+                                                      ET.fromstring(xml_content).iter('PubmedArticle')) if paper]
+                    updated = self.db_manager.update_paper_metadata(records) if records else 0
+                except Exception as e:
+                    # 워터마크를 옮기지 않고 다음 실행에서 이 묶음부터 다시 시도
+                    self.logger.error(f"Metadata backfill of ids after {after_id} failed: {str(e)}")
+                    result['errors'] += 1
+                    run.inc('metadata_backfill_errors')
+                    break
+                not_found = len(pmids) - len({paper['pmid'] for paper in records} & set(pmids))
+                if not_found:
+                    self.logger.debug(f"{not_found} papers of the batch after id {after_id} are not in PubMed")
+                result['not_found'] += not_found
+            after_id = batch[-1][0]
+            self.db_manager.set_state(WATERMARK_KEY, str(after_id))
+            result['papers'] += len(batch)
+            result['updated'] += updated
+            run.inc('metadata_backfill_papers', len(batch))
+            run.inc('metadata_backfill_updated', updated)
+
+        if result['updated']:
+            # update_paper_metadata가 무효화한 트렌드 집계를 새 발행일 기준으로 다시 만듦
+            self.db_manager.ensure_trend_data()
+        self.logger.info(f"Metadata backfill: {result['updated']} of {result['papers']} papers updated "
+                         f"(up to id {after_id}, {result['not_found']} not in PubMed, {result['errors']} errors)")
+        return result
@@ -0,0 +1,312 @@
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import yaml
+
+from scripts.logger import setup_logging
+
+# 요청·쿼리 지연 분포용 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRIC_PREFIX = 'mci_pipeline'
+
+_active_lock = threading.Lock()
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """고정 버킷 지연 히스토그램 (Prometheus 누적 버킷 형식으로 내보냄)"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative['+Inf'] = self.count
+        return {'buckets': cumulative, 'sum': round(self.sum, 6), 'count': self.count}
+
+
+class RunMetrics:
+    """
+    실행 한 번의 단계별 소요 시간, 카운터, 게이지, 지연 히스토그램을 모읍니다.
+    크롤러·파서·분류기·DB·분석기가 여러 스레드에서 함께 기록하므로 모든 갱신은 잠금 안에서 합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self.status = 'running'
+        self.error = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.gauges: Dict[Tuple[str, Tuple], float] = {}
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """블록 실행 시간을 히스토그램 name에 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        단계 실행 시간과 성공 여부를 기록합니다. 예외는 기록한 뒤 그대로 다시 발생시키므로
+        선택적 단계라면 호출한 쪽에서 잡아야 합니다.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self._end_stage(name, started, f"{type(e).__name__}: {e}")
+            raise
+        self._end_stage(name, started, None)
+
+    def _end_stage(self, name: str, started: float, error: Optional[str]):
+        with self._lock:
+            self.stages[name] = {
+                'seconds': round(time.perf_counter() - started, 4),
+                'status': 'failed' if error else 'ok',
+                'error': error,
+            }
+
+    def finish(self, status: str = None, error: str = None):
+        """실행을 마칩니다. status를 주지 않으면 실패한 단계가 있을 때 degraded로 기록합니다."""
+        self.finished_at = datetime.now()
+        self.error = error
+        if status is None:
+            status = 'degraded' if any(stage['status'] == 'failed' for stage in self.stages.values()) else 'ok'
+        self.status = status
+
+    @property
+    def duration_seconds(self) -> float:
+        return time.perf_counter() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 리포트·DB 저장용 표현"""
+        def series(items):
+            return [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in items]
+
+        with self._lock:
+            return {
+                'name': self.name,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'finished_at': self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+                'status': self.status,
+                'error': self.error,
+                'duration_seconds': round(self.duration_seconds, 4),
+                'stages': dict(self.stages),
+                'counters': series(sorted(self.counters.items())),
+                'gauges': series(sorted(self.gauges.items())),
+                'histograms': series((key, histogram.to_dict())
+                                     for key, histogram in sorted(self.histograms.items())),
+            }
+
+
+# 실행 중이 아닐 때도 계측 코드가 그대로 동작하도록 기본 수집기를 둡니다 (발행되지 않음).
+_active = RunMetrics('idle')
+
+
+def current() -> RunMetrics:
+    """현재 실행의 수집기를 반환합니다."""
+    return _active
+
+
+def start_run(name: str) -> RunMetrics:
+    """새 실행을 시작하고 이후 계측이 이 실행에 기록되도록 합니다."""
+    global _active
+    with _active_lock:
+        _active = RunMetrics(name)
+        return _active
+
+
+def end_run(run: RunMetrics):
+    """run이 현재 실행이면 기본 수집기로 되돌립니다."""
+    global _active
+    with _active_lock:
+        if _active is run:
+            _active = RunMetrics('idle')
+
+
+def _prometheus_name(name: str) -> str:
+    return f"{METRIC_PREFIX}_" + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _prometheus_labels(labels: Dict[str, str], extra: Dict[str, str] = None) -> str:
+    labels = dict(labels, **(extra or {}))
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+def format_prometheus(report: Dict[str, Any]) -> str:
+    """
+    실행 리포트를 node_exporter textfile collector 형식으로 바꿉니다.
+    값은 모두 마지막 실행 기준이므로 카운터도 게이지로 내보냅니다.
+    """
+    lines = []
+
+    def family(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    run_labels = {'run': report['name']}
+    finished = datetime.fromisoformat(report['finished_at'] or report['started_at'])
+
+    name = _prometheus_name('last_run_timestamp_seconds')
+    family(name, 'gauge', 'Unix time the last run finished.')
+    lines.append(f"{name}{_prometheus_labels(run_labels)} {finished.timestamp():.0f}")
+    name = _prometheus_name('last_run_success')
+    family(name, 'gauge', '1 if the last run finished without a fatal error.')
+    lines.append(f"{name}{_prometheus_labels(run_labels)} {0 if report['status'] == 'failed' else 1}")
+    name = _prometheus_name('last_run_duration_seconds')
+    family(name, 'gauge', 'Wall time of the last run.')
+    lines.append(f"{name}{_prometheus_labels(run_labels)} {report['duration_seconds']}")
+
+    if report['stages']:
+        name = _prometheus_name('stage_duration_seconds')
+        family(name, 'gauge', 'Wall time of each stage in the last run.')
+        for stage, data in report['stages'].items():
+            lines.append(f"{name}{_prometheus_labels(run_labels, {'stage': stage})} {data['seconds']}")
+        name = _prometheus_name('stage_success')
+        family(name, 'gauge', '1 if the stage finished without an error.')
+        for stage, data in report['stages'].items():
+            lines.append(f"{name}{_prometheus_labels(run_labels, {'stage': stage})} {int(data['status'] == 'ok')}")
+
+    for section in ('counters', 'gauges'):
+        seen = set()
+        for item in report[section]:
+            name = _prometheus_name(item['name'])
+            if name not in seen:
+                seen.add(name)
+                family(name, 'gauge', f"{item['name']} in the last run.")
+            lines.append(f"{name}{_prometheus_labels(run_labels, item['labels'])} {item['value']}")
+
+    seen = set()
+    for item in report['histograms']:
+        name = _prometheus_name(item['name'])
+        if name not in seen:
+            seen.add(name)
+            family(name, 'histogram', f"{item['name']} distribution in the last run.")
+        labels = dict(run_labels, **item['labels'])
+        for bound, count in item['value']['buckets'].items():
+            lines.append(f"{name}_bucket{_prometheus_labels(labels, {'le': bound})} {count}")
+        lines.append(f"{name}_sum{_prometheus_labels(labels)} {item['value']['sum']}")
+        lines.append(f"{name}_count{_prometheus_labels(labels)} {item['value']['count']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsPublisher:
+    """끝난 실행을 pipeline_runs 테이블, JSON 리포트, Prometheus textfile로 내보냅니다."""
+
+    def __init__(self, db_manager, base_path: str = None):
+        self.logger = setup_logging(__name__)
+        self.db_manager = db_manager
+        self.base_path = base_path or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.config = self._load_config()
+        self.report_dir = os.path.join(self.base_path, self.config.get('report_dir', 'output/metrics'))
+        # 실행 종류마다 따로 쓰는 textfile의 기준 경로 (예: output/metrics/mci_pipeline_daily_update.prom)
+        self.textfile = os.path.join(self.base_path, self.config.get('textfile', 'output/metrics/mci_pipeline.prom'))
+        self.keep_reports = self.config.get('keep_reports', 90)
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 metrics 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('metrics') or {}
+
+    def textfile_path(self, run_name: str) -> str:
+        """
+        실행 이름별 Prometheus textfile 경로. 실행 종류(수집·유지보수·인용 등)마다 파일이 따로 있어야
+        한 종류의 실행이 다른 종류의 마지막 지표를 덮어쓰지 않고 node_exporter가 모두 수집합니다.
+        """
+        stem, extension = os.path.splitext(self.textfile)
+        return f"{stem}_{run_name}{extension}"
+
+    def publish(self, run: RunMetrics) -> Dict[str, Any]:
+        """각 출력은 독립적으로 시도하며, 하나가 실패해도 나머지는 기록합니다."""
+        report = run.to_dict()
+        try:
+            report['id'] = self.db_manager.record_pipeline_run(report)
+        except Exception as e:
+            self.logger.error(f"Error saving pipeline run: {str(e)}")
+
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            stamp = run.started_at.strftime('%Y%m%d-%H%M%S')
+            self._write_atomic(os.path.join(self.report_dir, f"{run.name}_{stamp}.json"),
+                               json.dumps(report, indent=2, ensure_ascii=False))
+            self._prune_reports(run.name)
+        except Exception as e:
+            self.logger.error(f"Error writing metrics report: {str(e)}")
+
+        try:
+            os.makedirs(os.path.dirname(self.textfile), exist_ok=True)
+            self._write_atomic(self.textfile_path(run.name), format_prometheus(report))
+            # 예전 단일 textfile이 남아 있으면 같은 시계열이 두 파일에 생기므로 지움
+            if os.path.exists(self.textfile):
+                os.remove(self.textfile)
+        except Exception as e:
+            self.logger.error(f"Error writing Prometheus textfile: {str(e)}")
+
+        self.logger.info(f"Run {run.name} {report['status']} in {report['duration_seconds']:.1f}s: " +
+                         ', '.join(f"{stage}={data['seconds']:.1f}s" for stage, data in report['stages'].items()))
+        return report
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        """수집기가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _prune_reports(self, name: str):
+        reports = sorted(f for f in os.listdir(self.report_dir) if f.startswith(f"{name}_") and f.endswith('.json'))
+        for old in reports[:-self.keep_reports] if self.keep_reports else []:
+            os.remove(os.path.join(self.report_dir, old))
@@ -0,0 +1,115 @@
+import hashlib
+import zlib
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, tuple_
+
+from scripts.database import Paper, PaperSignature, LSHBucket, PaperDuplicate
+from scripts.logger import setup_logging
+from scripts.term_trends import tokenize
+
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(20240801)
+_PERM_A = _rng.randint(1, 2 ** 31 - 1, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, 2 ** 31 - 1, size=NUM_PERM).astype(np.uint64)
+
+
+def shingles(title: str, abstract: str) -> np.ndarray:
+    """제목과 초록의 단어 3-gram shingle을 32비트 해시 배열로 반환합니다."""
+    tokens = tokenize(f"{title or ''} {abstract or ''}")
+    if len(tokens) < SHINGLE_SIZE:
+        grams = tokens
+    else:
+        grams = [' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+    return np.unique(np.array([zlib.crc32(gram.encode('utf-8')) for gram in grams], dtype=np.uint64))
+
+
+def minhash_signature(shingle_hashes: np.ndarray) -> np.ndarray:
+    """shingle 해시 집합의 MinHash 시그니처(NUM_PERM개의 uint32)를 계산합니다."""
+    hashed = (np.outer(_PERM_A, shingle_hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def band_buckets(signature: np.ndarray):
+    """시그니처를 밴드로 나누어 (밴드 번호, 버킷 해시) 목록을 반환합니다."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH로 새 논문이 기존 논문의 근사 중복인지 확인하고 중복 클러스터를 기록합니다."""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.logger = setup_logging(__name__)
+        self.threshold = threshold
+
+    def check_and_index(self, session, paper_id: int, title: str, abstract: str) -> Optional[Tuple[int, float]]:
+        """
+        논문을 색인하고, 근사 중복이면 (대표 논문 id, 유사도)를 반환합니다.
+        호출자의 트랜잭션 안에서 실행됩니다.
+        """
+        shingle_hashes = shingles(title, abstract)
+        if len(shingle_hashes) == 0:
+            return None
+
+        signature = minhash_signature(shingle_hashes)
+        buckets = band_buckets(signature)
+
+        match = self._find_match(session, signature, buckets)
+        if match is not None:
+            canonical_id, similarity = match
+            session.add(PaperDuplicate(paper_id=paper_id, canonical_id=canonical_id, similarity=similarity))
+
+        session.add(PaperSignature(paper_id=paper_id, signature=signature.tobytes()))
+        session.add_all([LSHBucket(band=band, bucket=bucket, paper_id=paper_id) for band, bucket in buckets])
+        return match
+
+    def _find_match(self, session, signature: np.ndarray, buckets) -> Optional[Tuple[int, float]]:
+        """같은 버킷을 공유하는 후보 중 유사도가 가장 높은 논문의 대표 논문을 찾습니다."""
+        candidate_ids = select(LSHBucket.paper_id).where(
+            tuple_(LSHBucket.band, LSHBucket.bucket).in_(buckets)
+        ).distinct()
+        candidates = (session.query(PaperSignature.paper_id, PaperSignature.signature)
+                      .filter(PaperSignature.paper_id.in_(candidate_ids))
+                      .all())
+        if not candidates:
+            return None
+
+        matrix = np.frombuffer(b''.join(blob for _, blob in candidates), dtype=np.uint32).reshape(-1, NUM_PERM)
+        similarities = (matrix == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+
+        best_id = candidates[best][0]
+        duplicate = session.get(PaperDuplicate, best_id)
+        canonical_id = duplicate.canonical_id if duplicate is not None else best_id
+        return canonical_id, float(similarities[best])
+
+    def index_missing(self, session) -> int:
+        """아직 시그니처가 없는 기존 논문을 id 순서대로 색인하고, 새로 발견된 중복 수를 반환합니다."""
+        missing = (session.query(Paper.id, Paper.title, Paper.abstract)
+                   .filter(Paper.id.notin_(select(PaperSignature.paper_id)))
+                   .order_by(Paper.id)
+                   .all())
+        duplicates = 0
+        for paper_id, title, abstract in missing:
+            if self.check_and_index(session, paper_id, title, abstract) is not None:
+                duplicates += 1
+            session.flush()
+        session.commit()
+        if missing:
+            self.logger.info(f"Indexed {len(missing)} papers for near-duplicate detection ({duplicates} duplicates)")
+        return duplicates
@@ -0,0 +1,253 @@
+import argparse
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from scripts.logger import setup_logging
+from scripts import metrics
+
+# @timed로 표시한 함수: (모듈 이름, qualname) → 원래 함수
+_registry: Dict[Tuple[str, str], Callable] = {}
+_timings: Dict[str, List[float]] = {}
+_timings_lock = threading.Lock()
+_enabled = False
+
+# 스택 맨 위가 이 표준 라이브러리 함수들이면 대기 중인 스레드로 보고 샘플에서 제외 (큐·소켓·잠금 대기).
+# 같은 이름의 애플리케이션 함수(get, poll 등)가 빠지지 않도록 (파일 경로 끝, 함수 이름)으로 맞춥니다.
+IDLE_FUNCTIONS = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'), ('queue.py', 'get'),
+    ('selectors.py', 'select'), ('socket.py', 'accept'), ('socket.py', 'readinto'),
+    ('socketserver.py', 'serve_forever'), ('concurrent/futures/thread.py', '_worker'),
+    ('multiprocessing/connection.py', 'poll'), ('multiprocessing/connection.py', '_poll'),
+    ('multiprocessing/connection.py', '_recv'), ('multiprocessing/connection.py', '_recv_bytes'),
+    ('multiprocessing/connection.py', 'wait'), ('multiprocessing/queues.py', '_feed'),
+    ('tkinter/__init__.py', 'mainloop'),
+}
+_IDLE_NAMES = {name for _, name in IDLE_FUNCTIONS}
+
+
+def is_idle_frame(frame) -> bool:
+    """프레임이 IDLE_FUNCTIONS의 대기 함수인지 확인합니다."""
+    code = frame.f_code
+    if code.co_name not in _IDLE_NAMES:
+        return False
+    filename = code.co_filename.replace(os.sep, '/')
+    return any(code.co_name == name and (filename == suffix or filename.endswith('/' + suffix))
+               for suffix, name in IDLE_FUNCTIONS)
+
+
+def timed(func: Callable) -> Callable:
+    """
+    핫 패스 함수를 타이밍 대상으로 등록합니다.
+    함수를 감싸지 않고 그대로 돌려주므로 꺼져 있을 때는 호출 비용이 전혀 늘지 않으며,
+    enable_timings()가 클래스·모듈 속성을 타이밍 래퍼로 교체합니다.
+    """
+    _registry[(func.__module__, func.__qualname__)] = func
+    return func
+
+
+def _record(name: str, seconds: float):
+    with _timings_lock:
+        entry = _timings.get(name)
+        if entry is None:
+            entry = _timings[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+    metrics.current().observe('function_seconds', seconds, function=name)
+
+
+def _wrap(func: Callable, name: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter() - started)
+    return wrapper
+
+
+def _resolve(module_name: str, qualname: str):
+    """등록된 함수가 속한 (클래스 또는 모듈, 속성 이름, 현재 속성 값)을 찾습니다."""
+    module = sys.modules.get(module_name)
+    if module is None or '<locals>' in qualname:
+        return None
+    *owner_path, attr = qualname.split('.')
+    owner = module
+    for part in owner_path:
+        owner = getattr(owner, part)
+    return owner, attr, vars(owner).get(attr)
+
+
+def _replace(module_name: str, qualname: str, func: Callable):
+    resolved = _resolve(module_name, qualname)
+    if resolved is None:
+        return
+    owner, attr, current = resolved
+    if isinstance(current, staticmethod):
+        func = staticmethod(func)
+    elif isinstance(current, classmethod):
+        func = classmethod(func)
+    setattr(owner, attr, func)
+
+
+def enable_timings():
+    """등록된 함수들을 타이밍 래퍼로 교체합니다. 이미 임포트된 모듈에만 적용됩니다."""
+    global _enabled
+    if _enabled:
+        return
+    for (module_name, qualname), func in _registry.items():
+        _replace(module_name, qualname, _wrap(func, qualname))
+    _enabled = True
+
+
+def disable_timings():
+    """enable_timings로 교체한 속성을 원래 함수로 되돌립니다."""
+    global _enabled
+    if not _enabled:
+        return
+    for (module_name, qualname), func in _registry.items():
+        _replace(module_name, qualname, func)
+    _enabled = False
+
+
+def timing_report() -> Dict[str, Dict[str, float]]:
+    """함수별 호출 수, 총 시간, 평균, 최대 시간 (총 시간 내림차순)"""
+    with _timings_lock:
+        items = sorted(_timings.items(), key=lambda item: item[1][1], reverse=True)
+        return {name: {'calls': calls, 'total_seconds': round(total, 6),
+                       'mean_seconds': round(total / calls, 6) if calls else 0.0, 'max_seconds': round(peak, 6)}
+                for name, (calls, total, peak) in items}
+
+
+class StackSampler:
+    """
+    모든 스레드의 호출 스택을 주기적으로 수집하는 샘플링 프로파일러.
+    결과는 flamegraph.pl·speedscope가 읽는 collapsed stack 형식(프레임;프레임 샘플수)으로 씁니다.
+    """
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (not self.include_idle and is_idle_frame(frame)):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    name = getattr(code, 'co_qualname', code.co_name)
+                    stack.append(f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """진입점 공통 프로파일링 옵션을 추가합니다."""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', nargs='?', const='', default=None, metavar='PREFIX',
+                       help='프로파일을 PREFIX.pstats / .collapsed / .timings.json으로 저장 '
+                            '(기본: output/profiles/<진입점>_<시각>)')
+    group.add_argument('--profile-mode', choices=['cprofile', 'sample'], default='cprofile',
+                       help='cprofile: 결정적 프로파일 + 스택 샘플링, sample: 스택 샘플링만 (오버헤드 최소)')
+    group.add_argument('--profile-interval', type=float, default=0.005, help='스택 샘플링 간격(초)')
+    group.add_argument('--profile-idle', action='store_true', help='대기 중인 스레드 스택도 샘플에 포함')
+
+
+def split_profile_arguments(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """다른 인자 파서보다 먼저 프로파일링 옵션만 떼어냅니다."""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_profile_arguments(parser)
+    return parser.parse_known_args(argv)
+
+
+@contextmanager
+def profile_session(options: argparse.Namespace, entry_point: str):
+    """
+    options.profile이 지정되면 블록 실행을 프로파일링합니다. 지정되지 않으면 아무 일도 하지 않습니다.
+    cProfile은 블록을 실행하는 스레드만, 스택 샘플러는 모든 스레드(워커 포함)를 측정합니다.
+    """
+    if options.profile is None:
+        yield
+        return
+
+    logger = setup_logging(__name__)
+    prefix = options.profile or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output', 'profiles',
+        f"{entry_point}_{datetime.now():%Y%m%d-%H%M%S}"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+
+    enable_timings()
+    sampler = StackSampler(options.profile_interval, options.profile_idle)
+    profiler = cProfile.Profile() if options.profile_mode == 'cprofile' else None
+    sampler.start()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        wall_seconds = time.perf_counter() - started
+        sampler.stop()
+        disable_timings()
+        _write_profile(logger, prefix, profiler, sampler, wall_seconds)
+
+
+def _write_profile(logger, prefix: str, profiler: Optional[cProfile.Profile], sampler: StackSampler,
+                   wall_seconds: float):
+    outputs = []
+    if profiler:
+        profiler.dump_stats(f"{prefix}.pstats")
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+        with open(f"{prefix}.txt", 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+        outputs += [f"{prefix}.pstats", f"{prefix}.txt"]
+
+    sampler.write_collapsed(f"{prefix}.collapsed")
+    report: Dict[str, Any] = {'wall_seconds': round(wall_seconds, 4), 'samples': sum(sampler.samples.values()),
+                              'functions': timing_report()}
+    with open(f"{prefix}.timings.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    outputs += [f"{prefix}.collapsed", f"{prefix}.timings.json"]
+
+    logger.info(f"Profile written ({wall_seconds:.1f}s): {', '.join(outputs)}")
+    for name, timing in list(report['functions'].items())[:10]:
+        logger.info(f"  {name}: {timing['calls']} calls, {timing['total_seconds']:.3f}s total, "
+                    f"{timing['max_seconds'] * 1000:.1f}ms max")
@@ -1,20 +1,33 @@
 import os
+import threading
+import time
 import yaml
 import requests
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from xml.etree import ElementTree as ET
 from scripts.logger import setup_logging
+from scripts import metrics
+from scripts.topics import load_topics
 
 class PubMedCrawler:
     def __init__(self):
-        self.logger = setup_logging()
+        self.logger = setup_logging(__name__)
         self.config = self._load_config()
         self.base_url = self.config['pubmed']['api_base_url']
         self.max_requests = self.config['pubmed']['max_requests_per_day']
         self.retry_attempts = self.config['pubmed']['retry_attempts']
         self.retry_delay = self.config['pubmed']['retry_delay']
+        self.api_key = self.config['pubmed'].get('api_key')
+        self.esearch_page_size = self.config['pubmed'].get('esearch_page_size', 1000)
+        self.efetch_chunk_size = self.config['pubmed'].get('efetch_chunk_size', 200)
+
+        # E-utilities 허용 요청 속도 (API 키가 있으면 초당 10회, 없으면 3회)를 스레드 간에 공유
+        self.min_interval = 1.0 / (10 if self.api_key else 3)
+        self._rate_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._local = threading.local()
 
     def _load_config(self) -> Dict[str, Any]:
         """설정 파일을 로드합니다."""
@@ -23,22 +36,71 @@ class PubMedCrawler:
             return yaml.safe_load(f)
 
     def _load_keywords(self) -> List[str]:
-        """검색 키워드를 로드합니다."""
-        keywords_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'keywords.txt')
-        with open(keywords_path, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f if line.strip()]
+        """기본 주제(topics의 첫 항목)의 검색 키워드를 로드합니다."""
+        return load_topics()[0]['keywords']
 
-    def search_papers(self, days_back: int = 1, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
+    def _session(self) -> requests.Session:
+        """스레드별 HTTP 세션 (연결 재사용)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _wait_for_rate_limit(self):
+        """모든 스레드의 요청 간격이 min_interval 이상이 되도록 대기합니다."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _request(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
         """
-        논문을 검색합니다.
-        
-        Args:
-            days_back: 몇 일 전까지의 논문을 검색할지 지정 (start_date, end_date가 지정되지 않은 경우에만 사용)
-            start_date: 검색 시작 날짜 (YYYY/MM/DD 형식)
-            end_date: 검색 종료 날짜 (YYYY/MM/DD 형식)
+        E-utilities를 호출합니다. 429와 5xx, 연결 오류는 retry_attempts회까지 재시도하며
+        429의 Retry-After가 있으면 따르고, 없으면 지수적으로 늘어나는 간격(최대 retry_delay초)으로 기다립니다.
         """
-        """최근 논문들을 검색합니다."""
-        keywords = self._load_keywords()
+        params = dict(params, tool=self.config['pubmed'].get('tool_name'), email=self.config['pubmed'].get('email'))
+        if self.api_key:
+            params['api_key'] = self.api_key
+        url = f"{self.base_url}/{endpoint}"
+        method = 'post' if endpoint in ('efetch.fcgi', 'elink.fcgi') else 'get'
+
+        run = metrics.current()
+        for attempt in range(self.retry_attempts + 1):
+            self._wait_for_rate_limit()
+            started = time.perf_counter()
+            try:
+                if method == 'post':
+                    # PMID 목록이 길면 URL 길이 제한을 넘으므로 POST로 전송
+                    response = self._session().post(url, data=params, timeout=60)
+                else:
+                    response = self._session().get(url, params=params, timeout=60)
+                run.observe('http_request_seconds', time.perf_counter() - started, endpoint=endpoint)
+                run.inc('http_requests', endpoint=endpoint, status=response.status_code)
+                run.inc('http_bytes_downloaded', len(response.content), endpoint=endpoint)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                error = requests.exceptions.HTTPError(f"{response.status_code} from {endpoint}", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                run.inc('http_requests', endpoint=endpoint, status=type(e).__name__)
+                retry_after, error = None, e
+
+            if attempt == self.retry_attempts:
+                raise error
+            run.inc('http_retries', endpoint=endpoint)
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else min(self.retry_delay, 2 ** attempt)
+            self.logger.warning(f"{endpoint} failed ({error}), retrying in {delay:.0f}s "
+                                f"({attempt + 1}/{self.retry_attempts})")
+            time.sleep(delay)
+
+    def build_query(self, days_back: int = 1, start_date: str = None, end_date: str = None,
+                    keywords: List[str] = None) -> str:
+        """키워드와 날짜 범위로 PubMed 검색식을 만듭니다. keywords를 주지 않으면 기본 주제의 키워드를 씁니다."""
+        keywords = keywords or self._load_keywords()
         query = ' OR '.join(f'"{keyword}"' for keyword in keywords)
         
         # 날짜 범위 설정
@@ -48,42 +110,84 @@ class PubMedCrawler:
             end = datetime.now()
             start = end - timedelta(days=days_back)
             date_range = f"{start.strftime('%Y/%m/%d')}:{end.strftime('%Y/%m/%d')}[Date - Create]"
-        
-        try:
-            # PubMed 검색 API 호출
-            search_url = f"{self.base_url}/esearch.fcgi"
-            params = {
+        return f"({query}) AND {date_range}"
+
+    def iter_pmids(self, term: str) -> Iterator[List[str]]:
+        """esearch를 retstart로 페이지 넘기며 PMID 목록을 페이지 단위로 내보냅니다."""
+        retstart = 0
+        while True:
+            response = self._request('esearch.fcgi', {
                 'db': 'pubmed',
-                'term': f"({query}) AND {date_range}",
+                'term': term,
                 'retmode': 'json',
-                'retmax': 100
-            }
-            
-            self.logger.info(f"Searching PubMed with query: {query}")
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
-            
-            search_results = response.json()
-            pmids = search_results['esearchresult']['idlist']
-            
+                'retstart': retstart,
+                'retmax': self.esearch_page_size
+            })
+            result = response.json()['esearchresult']
+            pmids = result['idlist']
             if not pmids:
-                self.logger.info("No new papers found")
-                return []
-            
-            # 논문 상세 정보 가져오기
-            self.logger.info(f"Found {len(pmids)} papers. Fetching details...")
-            fetch_url = f"{self.base_url}/efetch.fcgi"
-            params = {
-                'db': 'pubmed',
-                'id': ','.join(pmids),
-                'retmode': 'xml',
-            }
-            
-            response = requests.get(fetch_url, params=params)
-            response.raise_for_status()
+                return
+            yield pmids
+            retstart += len(pmids)
+            if retstart >= int(result.get('count', 0)):
+                return
+
+    def fetch_details(self, pmids: List[str]) -> str:
+        """efetch로 PMID 묶음의 상세 정보 XML을 가져옵니다."""
+        response = self._request('efetch.fcgi', {
+            'db': 'pubmed',
+            'id': ','.join(pmids),
+            'retmode': 'xml',
+        })
+        return response.text
+
+    def fetch_links(self, pmids: List[str], linkname: str) -> Dict[str, List[str]]:
+        """
+        elink로 PMID 묶음의 연결 PMID를 가져옵니다 (pubmed_pubmed_refs: 인용한 논문, pubmed_pubmed_citedin: 인용된 논문).
+        id를 쉼표로 잇지 않고 반복해서 보내야 PMID별 linkset을 따로 받습니다.
+        """
+        response = self._request('elink.fcgi', {
+            'dbfrom': 'pubmed',
+            'db': 'pubmed',
+            'cmd': 'neighbor',
+            'linkname': linkname,
+            'retmode': 'json',
+            'id': list(pmids),
+        })
+        links = {pmid: [] for pmid in pmids}
+        for linkset in response.json().get('linksets', []):
+            ids = linkset.get('ids', [])
+            if len(ids) != 1:
+                continue
+            for linksetdb in linkset.get('linksetdbs', []):
+                if linksetdb.get('linkname') == linkname:
+                    links[str(ids[0])] = [str(link) for link in linksetdb.get('links', [])]
+        return links
+
+    def search_papers(self, days_back: int = 1, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
+        """
+        논문을 검색합니다. 결과 전체를 순서대로 받아 파싱하며,
+        대량 수집에는 단계를 겹쳐 실행하는 IngestPipeline을 사용합니다.
+        
+        Args:
+            days_back: 몇 일 전까지의 논문을 검색할지 지정 (start_date, end_date가 지정되지 않은 경우에만 사용)
+            start_date: 검색 시작 날짜 (YYYY/MM/DD 형식)
+            end_date: 검색 종료 날짜 (YYYY/MM/DD 형식)
+        """
+        term = self.build_query(days_back, start_date, end_date)
+        
+        try:
+            self.logger.info(f"Searching PubMed with query: {term}")
+            papers = []
+            for pmids in self.iter_pmids(term):
+                for start in range(0, len(pmids), self.efetch_chunk_size):
+                    chunk = pmids[start:start + self.efetch_chunk_size]
+                    self.logger.info(f"Fetching details for {len(chunk)} papers...")
+                    papers.extend(self.parse_paper_details(self.fetch_details(chunk)))
             
-            # XML 응답을 파싱하여 필요한 정보 추출
-            return self.parse_paper_details(response.text)
+            if not papers:
+                self.logger.info("No new papers found")
+            return papers
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error during PubMed API request: {str(e)}")
@@ -105,6 +209,8 @@ class PubMedCrawler:
                 paper_info = PubMedXMLParser.parse_article(article)
                 if paper_info:
                     results.append(paper_info)
+            metrics.current().inc('papers_parsed', len(results))
+            metrics.current().inc('parse_errors', len(articles) - len(results))
             
             self.logger.info(f"Successfully parsed {len(results)} papers")
             return results
@@ -1,9 +1,17 @@
+import re
+from datetime import date
 from xml.etree import ElementTree as ET
 from typing import Optional
 import logging
 
+from scripts.profiling import timed
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)}
+
 class PubMedXMLParser:
     @staticmethod
+    @timed
     def parse_article(article_elem: ET.Element) -> dict:
         """XML 형식의 논문 정보를 파싱하여 딕셔너리로 반환합니다."""
         try:
@@ -14,21 +22,35 @@ class PubMedXMLParser:
             title_elem = article_elem.find('.//ArticleTitle')
             title = title_elem.text if title_elem is not None else ''
 
-            # 저자 정보 추출
+            # 저자 정보 추출 (소속은 저자 순서와 맞춘 목록)
             authors = []
+            affiliations = []
             author_list = article_elem.findall('.//Author')
             for author in author_list:
                 last_name = author.find('LastName')
                 fore_name = author.find('ForeName')
                 if last_name is not None and fore_name is not None:
                     authors.append(f"{fore_name.text} {last_name.text}")
+                    affiliations.append([elem.text.strip() for elem in author.findall('AffiliationInfo/Affiliation')
+                                         if elem.text and elem.text.strip()])
 
-            # 초록 추출
+            # 초록 추출 (구조화 초록은 구획별 Label·NlmCategory와 초록 문자열 내 위치를 함께 기록)
             abstract = ''
+            abstract_sections = []
             abstract_texts = article_elem.findall('.//Abstract/AbstractText')
             for abstract_text in abstract_texts:
-                if abstract_text.text:
-                    abstract += abstract_text.text + ' '
+                content = ''.join(abstract_text.itertext()).strip()
+                if not content:
+                    continue
+                label = abstract_text.get('Label')
+                if label or abstract_text.get('NlmCategory'):
+                    abstract_sections.append({
+                        'label': label,
+                        'category': abstract_text.get('NlmCategory'),
+                        'start': len(abstract),
+                        'end': len(abstract) + len(content),
+                    })
+                abstract += content + ' '
 
             # 저널 정보 추출
             journal_elem = article_elem.find('.//Journal')
@@ -39,12 +61,55 @@ class PubMedXMLParser:
                 'year': PubMedXMLParser._get_text(journal_elem, './/Year')
             }
 
+            # 발행일: 온라인 발행일(ArticleDate)이 있으면 우선, 없으면 호 발행일(PubDate, 빠진 월·일은 1)
+            publication_date = (PubMedXMLParser._parse_date(article_elem.find('.//Article/ArticleDate'))
+                                or PubMedXMLParser._parse_date(
+                                    journal_elem.find('.//PubDate') if journal_elem is not None else None))
+            entry_date = None
+            for status in ('entrez', 'pubmed'):
+                entry_date = PubMedXMLParser._parse_date(
+                    article_elem.find(f".//PubmedData/History/PubMedPubDate[@PubStatus='{status}']"))
+                if entry_date:
+                    break
+
+            doi = (PubMedXMLParser._get_text(article_elem, ".//PubmedData/ArticleIdList/ArticleId[@IdType='doi']")
+                   or PubMedXMLParser._get_text(article_elem, ".//Article/ELocationID[@EIdType='doi']"))
+
+            # MeSH 주제어: 기술어별 세부 표목과 주요 주제 여부
+            mesh_terms = []
+            for heading in article_elem.findall('.//MeshHeadingList/MeshHeading'):
+                descriptor = heading.find('DescriptorName')
+                if descriptor is None or not descriptor.text:
+                    continue
+                mesh_terms.append({
+                    'descriptor': descriptor.text.strip(),
+                    'ui': descriptor.get('UI'),
+                    'major': descriptor.get('MajorTopicYN') == 'Y',
+                    'qualifiers': [
+                        {'name': qualifier.text.strip(), 'ui': qualifier.get('UI'),
+                         'major': qualifier.get('MajorTopicYN') == 'Y'}
+                        for qualifier in heading.findall('QualifierName') if qualifier.text
+                    ],
+                })
+
+            publication_types = [
+                {'name': elem.text.strip(), 'ui': elem.get('UI')}
+                for elem in article_elem.findall('.//PublicationTypeList/PublicationType') if elem.text
+            ]
+
             return {
                 'pmid': pmid,
                 'title': title.strip(),
                 'authors': authors,
+                'affiliations': affiliations,
                 'abstract': abstract.strip(),
-                'journal': journal_info
+                'abstract_sections': abstract_sections,
+                'journal': journal_info,
+                'publication_date': publication_date,
+                'entry_date': entry_date,
+                'doi': doi.strip() or None,
+                'mesh_terms': mesh_terms,
+                'publication_types': publication_types
             }
 
         except Exception as e:
@@ -58,4 +123,27 @@ class PubMedXMLParser:
         if elem is None:
             return ''
         found = elem.find(xpath)
-        return found.text if found is not None else ''
+        return found.text if found is not None and found.text is not None else ''
+
+    @staticmethod
+    def _parse_date(elem: Optional[ET.Element]) -> Optional[date]:
+        """
+        Year/Month/Day 또는 MedlineDate("2019 Nov-Dec")로 된 날짜 요소를 date로 바꿉니다.
+        월은 숫자나 영문 약어 모두 허용하며, 빠진 월·일은 1로 둡니다.
+        """
+        if elem is None:
+            return None
+        year = PubMedXMLParser._get_text(elem, 'Year')
+        month = PubMedXMLParser._get_text(elem, 'Month')
+        day = PubMedXMLParser._get_text(elem, 'Day')
+        if not year:
+            # MedlineDate는 자유 형식이므로 첫 연도와 그 뒤의 첫 월만 사용
+            match = re.match(r'\s*(\d{4})(?:\s+([A-Za-z]{3}|\d{1,2}))?', PubMedXMLParser._get_text(elem, 'MedlineDate'))
+            if not match:
+                return None
+            year, month, day = match.group(1), match.group(2) or '', ''
+        month_number = int(month) if month.isdigit() else MONTHS.get(month[:3].lower(), 1)
+        try:
+            return date(int(year), month_number or 1, int(day) if day.isdigit() else 1)
+        except ValueError:
+            return None
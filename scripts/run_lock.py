@@ -0,0 +1,69 @@
+import os
+from datetime import datetime
+
+from scripts.logger import setup_logging
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class RunLock:
+    """
+    프로세스 간 실행 잠금. 수동 실행(--daily)과 스케줄러 실행이 겹치지 않도록 합니다.
+    운영체제 파일 잠금을 사용하므로 프로세스가 비정상 종료되어도 잠금이 자동으로 풀립니다.
+
+        with RunLock(path) as acquired:
+            if not acquired:
+                return
+    """
+
+    def __init__(self, path: str):
+        self.logger = setup_logging(__name__)
+        self.path = path
+        self._file = None
+
+    def acquire(self) -> bool:
+        """잠금을 기다리지 않고 시도합니다. 다른 프로세스가 잡고 있으면 False를 반환합니다."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        try:
+            if os.name == 'nt':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.seek(0)
+            holder = lock_file.read().strip()
+            lock_file.close()
+            self.logger.warning(f"Run lock {self.path} is held by another process ({holder or 'unknown'})")
+            return False
+
+        # 잠금을 가진 프로세스를 기록 (진단용)
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"pid={os.getpid()} since={datetime.now().isoformat(timespec='seconds')}\n")
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
@@ -0,0 +1,165 @@
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from scripts.logger import setup_logging
+from scripts.term_trends import tokenize, is_term_token
+
+VECTOR_DIM = 512
+BLOCK_ROWS = 32768
+
+
+def feature_vector(title: str, abstract: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """
+    제목과 초록의 유니그램/바이그램을 부호 있는 feature hashing으로 dim차원 벡터에 담고
+    sublinear TF 가중 후 L2 정규화합니다.
+    """
+    tokens = [token for token in tokenize(f"{title or ''} {abstract or ''}") if is_term_token(token)]
+    terms = Counter(tokens)
+    terms.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for term, count in terms.items():
+        h = zlib.crc32(term.encode('utf-8'))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dim] += sign * (1.0 + np.log(count))
+
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class SimilarityIndex:
+    """
+    논문별 정규화 특징 벡터를 memmap 파일에 추가 저장하고,
+    블록 단위 행렬곱으로 코사인 유사도 top-k를 찾습니다.
+    """
+
+    def __init__(self, index_dir: str, dim: int = VECTOR_DIM):
+        self.logger = setup_logging(__name__)
+        self.index_dir = index_dir
+        self.dim = dim
+        self.vectors_path = os.path.join(index_dir, 'vectors.f32')
+        self.pmids_path = os.path.join(index_dir, 'pmids.i64')
+        self._pending = []
+        self._lock = threading.Lock()
+        self._cache = None
+
+    def add(self, pmid: str, title: str, abstract: str):
+        """논문 벡터를 계산하여 다음 flush 때 파일에 추가되도록 대기시킵니다."""
+        vector = feature_vector(title, abstract, self.dim)
+        with self._lock:
+            self._pending.append((int(pmid), vector))
+
+    def flush(self):
+        """
+        대기 중인 벡터를 파일 끝에 추가합니다. 벡터를 먼저 쓰고 PMID를 나중에 씁니다.
+        이전 추가가 두 쓰기 사이에서 중단되었으면 먼저 두 파일을 같은 행 수로 잘라 행 번호를 맞춥니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._truncate_partial_rows()
+        vectors = np.stack([vector for _, vector in pending]).astype(np.float32)
+        pmids = np.array([pmid for pmid, _ in pending], dtype=np.int64)
+        with open(self.vectors_path, 'ab') as f:
+            f.write(vectors.tobytes())
+        with open(self.pmids_path, 'ab') as f:
+            f.write(pmids.tobytes())
+        self.logger.debug(f"Appended {len(pending)} vectors to similarity index")
+
+    def _file_sizes(self) -> Tuple[int, int]:
+        return tuple(os.path.getsize(path) if os.path.exists(path) else 0
+                     for path in (self.pmids_path, self.vectors_path))
+
+    def _complete_rows(self, sizes: Tuple[int, int]) -> int:
+        """PMID와 벡터가 모두 온전히 기록된 행 수 (두 파일 중 짧은 쪽 기준)"""
+        return min(sizes[0] // 8, sizes[1] // (self.dim * 4))
+
+    def _truncate_partial_rows(self):
+        """중단된 추가로 한쪽 파일에만 남은 행이나 일부만 쓰인 행을 잘라냅니다 (쓰는 쪽에서만 호출)."""
+        sizes = self._file_sizes()
+        rows = self._complete_rows(sizes)
+        expected = (rows * 8, rows * self.dim * 4)
+        if sizes == expected:
+            return
+        self.logger.warning(f"Similarity index files disagree (pmids {sizes[0]} bytes, vectors {sizes[1]} bytes); "
+                            f"truncating both to {rows} rows")
+        for path, size in zip((self.pmids_path, self.vectors_path), expected):
+            if os.path.exists(path):
+                os.truncate(path, size)
+        self._cache = None
+
+    def _load(self) -> Tuple[np.ndarray, np.ndarray, Dict[int, int]]:
+        """
+        memmap을 열고 PMID→행 번호 맵을 만듭니다. 파일 크기가 바뀌었을 때만 다시 엽니다.
+        두 파일의 행 수가 다르면 (추가 도중 중단 또는 다른 프로세스가 쓰는 중) 짧은 쪽까지만 사용합니다.
+        """
+        if not os.path.exists(self.pmids_path):
+            return np.empty((0, self.dim), dtype=np.float32), np.empty(0, dtype=np.int64), {}
+
+        size = self._file_sizes()
+        if self._cache is not None and self._cache[0] == size:
+            return self._cache[1:]
+
+        rows = self._complete_rows(size)
+        if rows == 0:
+            return np.empty((0, self.dim), dtype=np.float32), np.empty(0, dtype=np.int64), {}
+        pmids = np.fromfile(self.pmids_path, dtype=np.int64, count=rows)
+        vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        row_of = {int(pmid): row for row, pmid in enumerate(pmids)}
+        self._cache = (size, vectors, pmids, row_of)
+        return vectors, pmids, row_of
+
+    def missing_pmids(self, pmids) -> List[str]:
+        """주어진 PMID 중 아직 색인되지 않은 것을 반환합니다 (숫자가 아닌 PMID는 색인하지 않으므로 제외)."""
+        _, _, row_of = self._load()
+        return [pmid for pmid in pmids if pmid.isdigit() and int(pmid) not in row_of]
+
+    def most_similar(self, pmid: str, k: int = 10) -> List[Tuple[str, float]]:
+        """주어진 논문과 코사인 유사도가 가장 높은 k개 논문의 (PMID, 유사도)를 반환합니다."""
+        if not str(pmid).isdigit():
+            return []
+        vectors, pmids, row_of = self._load()
+        row = row_of.get(int(pmid))
+        if row is None:
+            return []
+
+        query = np.array(vectors[row])
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, len(pmids), BLOCK_ROWS):
+            scores = vectors[start:start + BLOCK_ROWS] @ query
+            block_rows = np.arange(start, start + len(scores))
+            scores = np.concatenate([best_scores, scores])
+            block_rows = np.concatenate([best_rows, block_rows])
+            keep = min(k + 1, len(scores))
+            top = np.argpartition(-scores, keep - 1)[:keep]
+            best_scores, best_rows = scores[top], block_rows[top]
+
+        order = np.argsort(-best_scores)
+        return [
+            (str(pmids[best_rows[i]]), float(best_scores[i]))
+            for i in order if best_rows[i] != row
+        ][:k]
+
+    def sync(self, papers) -> int:
+        """(pmid, title, abstract) 목록 중 아직 색인되지 않은 논문을 추가합니다."""
+        _, _, row_of = self._load()
+        added = 0
+        for pmid, title, abstract in papers:
+            if pmid.isdigit() and int(pmid) not in row_of:
+                self.add(pmid, title, abstract)
+                added += 1
+        self.flush()
+        if added:
+            self.logger.info(f"Added {added} papers to similarity index")
+        return added
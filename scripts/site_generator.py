@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, case
+from sqlalchemy.orm import selectinload
+
+from scripts.blog_generator import CATEGORY_DISPLAY, BLOG_FOOTER, format_paper_entry
+from scripts.database import Paper, Category, CitationRank, PaperSummary, paper_categories, exclude_duplicates
+from scripts.logger import setup_logging
+from scripts.summarizer import SUMMARIZER_VERSION
+
+# 페이지 형식이 바뀌면 올려서 전체 페이지를 다시 쓰게 함
+TEMPLATE_VERSION = '1'
+CATEGORY_PAGE_SIZE = 100
+RANKING_SIZE = 50
+
+
+class SiteGenerator:
+    """
+    DB 조회로 일별·월별·카테고리별 블로그 페이지와 인용 순위 페이지를 만들고,
+    입력 해시 매니페스트와 비교하여 바뀐 페이지만 다시 씁니다.
+    """
+
+    MANIFEST_NAME = '.site_manifest.json'
+
+    def __init__(self, db_manager, blog_dir: str):
+        self.logger = setup_logging(__name__)
+        self.db_manager = db_manager
+        self.content_dir = os.path.join(blog_dir, 'content')
+        self.manifest_path = os.path.join(blog_dir, self.MANIFEST_NAME)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, str]):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _digest(*values) -> str:
+        return hashlib.sha256(repr((TEMPLATE_VERSION, SUMMARIZER_VERSION) + values).encode('utf-8')).hexdigest()
+
+    def build(self) -> Tuple[int, int]:
+        """사이트를 증분 빌드하고 (다시 쓴 페이지 수, 전체 페이지 수)를 반환합니다."""
+        manifest = self._load_manifest()
+        session = self.db_manager.Session()
+        try:
+            pages = self._plan_pages(session)
+            written = 0
+            for path, (digest, writer) in pages.items():
+                full_path = os.path.join(self.content_dir, path)
+                if manifest.get(path) == digest and os.path.exists(full_path):
+                    continue
+                writer(session, full_path)
+                manifest[path] = digest
+                written += 1
+
+            # 더 이상 만들어지지 않는 페이지 정리
+            for path in set(manifest) - set(pages):
+                full_path = os.path.join(self.content_dir, path)
+                if os.path.exists(full_path):
+                    os.remove(full_path)
+                del manifest[path]
+
+            self._save_manifest(manifest)
+            self.logger.info(f"Site build: rewrote {written} of {len(pages)} pages")
+            return written, len(pages)
+        finally:
+            session.close()
+
+    def _plan_pages(self, session) -> Dict[str, Tuple[str, object]]:
+        """
+        집계 쿼리로 각 페이지의 입력 시그니처를 계산합니다.
+        시그니처는 논문 수, 논문 id 합계, 캐시된 요약 수로 구성되어 실제 본문을 읽지 않고 변경을 감지합니다.
+        """
+        summary_exists = (session.query(PaperSummary.pmid)
+                          .filter(PaperSummary.version == SUMMARIZER_VERSION)
+                          .filter(PaperSummary.pmid == Paper.pmid)
+                          .exists())
+        has_summary = func.sum(case((summary_exists, 1), else_=0))
+        pages = {}
+
+        # 일별 페이지
+        day_rows = (exclude_duplicates(session.query(Paper.created_date, func.count(Paper.id),
+                                                      func.sum(Paper.id), has_summary))
+                    .filter(Paper.created_date.isnot(None))
+                    .group_by(Paper.created_date)
+                    .all())
+        for day, count, id_sum, summaries in day_rows:
+            path = os.path.join('daily', f"{day.isoformat()}.md")
+            pages[path] = (self._digest(count, id_sum, summaries), self._day_writer(day))
+
+        # 월별 아카이브 페이지
+        month = func.strftime('%Y-%m', Paper.created_date)
+        month_rows = (exclude_duplicates(session.query(month, func.count(Paper.id),
+                                                        func.sum(Paper.id), has_summary))
+                      .filter(Paper.created_date.isnot(None))
+                      .group_by(month)
+                      .all())
+        for month_key, count, id_sum, summaries in month_rows:
+            path = os.path.join('archive', f"{month_key}.md")
+            pages[path] = (self._digest(count, id_sum, summaries), self._month_writer(month_key))
+
+        # 카테고리 페이지: id 오름차순으로 고정 크기 페이지에 나누어 새 논문은 마지막 페이지만 바꿈
+        category_rows = (exclude_duplicates(session.query(Category.name, Paper.id, summary_exists))
+                         .join(paper_categories, paper_categories.c.paper_id == Paper.id)
+                         .join(Category, Category.id == paper_categories.c.category_id)
+                         .order_by(Category.name, Paper.id)
+                         .all())
+        by_category = defaultdict(list)
+        for name, paper_id, summarized in category_rows:
+            by_category[name].append((paper_id, bool(summarized)))
+
+        for name, entries in by_category.items():
+            page_count = (len(entries) + CATEGORY_PAGE_SIZE - 1) // CATEGORY_PAGE_SIZE
+            for page in range(page_count):
+                chunk = entries[page * CATEGORY_PAGE_SIZE:(page + 1) * CATEGORY_PAGE_SIZE]
+                path = os.path.join('categories', name, f"page-{page + 1:04d}.md")
+                pages[path] = (self._digest(chunk), self._category_page_writer(name, page + 1, chunk))
+            index_path = os.path.join('categories', name, '_index.md')
+            pages[index_path] = (self._digest(page_count, len(entries)),
+                                 self._category_index_writer(name, page_count, len(entries)))
+
+        # 인용 순위 페이지: PageRank 상위 논문과 피인용 수가 바뀔 때만 다시 씀
+        ranking = (exclude_duplicates(session.query(Paper.id, CitationRank.cited_by, summary_exists))
+                   .join(CitationRank, CitationRank.pmid == Paper.pmid)
+                   .order_by(CitationRank.pagerank.desc(), Paper.id)
+                   .limit(RANKING_SIZE)
+                   .all())
+        if ranking:
+            entries = [(paper_id, cited_by, bool(summarized)) for paper_id, cited_by, summarized in ranking]
+            pages['ranking.md'] = (self._digest(entries), self._ranking_writer(entries))
+
+        return pages
+
+    def _write_page(self, session, full_path: str, front_matter: Dict[str, str], heading: str,
+                    papers: List[Paper], cited_by: Dict[int, int] = None):
+        """페이지를 임시 파일에 스트리밍으로 쓴 뒤 교체합니다. cited_by(논문 id → 피인용 수)는 항목에 함께 표시합니다."""
+        summaries = self._summaries(session, papers)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = full_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('---\n')
+            for key, value in front_matter.items():
+                f.write(f"{key}: {value}\n")
+            f.write('---\n\n')
+            f.write(f"# {heading}\n\n")
+            f.write(f"> **논문 수**: {len(papers)}개\n\n---\n\n")
+            for i, paper in enumerate(papers, 1):
+                f.write(format_paper_entry(paper, i, summaries, (cited_by or {}).get(paper.id)))
+            f.write(BLOG_FOOTER)
+        os.replace(tmp_path, full_path)
+
+    @staticmethod
+    def _summaries(session, papers: List[Paper]) -> Dict[str, str]:
+        rows = (session.query(PaperSummary.pmid, PaperSummary.summary)
+                .filter(PaperSummary.version == SUMMARIZER_VERSION,
+                        PaperSummary.pmid.in_([paper.pmid for paper in papers]))
+                .all())
+        return dict(rows)
+
+    @staticmethod
+    def _papers_query(session):
+        return exclude_duplicates(session.query(Paper).options(selectinload(Paper.categories)))
+
+    def _day_writer(self, day):
+        def write(session, full_path):
+            papers = self._papers_query(session).filter(Paper.created_date == day).order_by(Paper.id).all()
+            self._write_page(session, full_path, {
+                'title': f'"MCI 논문 ({day.isoformat()})"',
+                'date': day.isoformat(),
+                'tags': '[MCI, Papers, Daily]',
+                'author': '"CLAIR"',
+            }, f"🧠 {day.isoformat()} 수집 논문", papers)
+        return write
+
+    def _month_writer(self, month_key: str):
+        def write(session, full_path):
+            papers = (self._papers_query(session)
+                      .filter(func.strftime('%Y-%m', Paper.created_date) == month_key)
+                      .order_by(Paper.id)
+                      .all())
+            self._write_page(session, full_path, {
+                'title': f'"MCI 논문 아카이브 ({month_key})"',
+                'date': f"{month_key}-01",
+                'tags': '[MCI, Papers, Archive]',
+                'author': '"CLAIR"',
+            }, f"🗂️ {month_key} 논문 아카이브", papers)
+        return write
+
+    def _category_page_writer(self, name: str, page: int, chunk):
+        def write(session, full_path):
+            paper_ids = [paper_id for paper_id, _ in chunk]
+            papers = self._papers_query(session).filter(Paper.id.in_(paper_ids)).order_by(Paper.id).all()
+            display = CATEGORY_DISPLAY.get(name, f'📄 {name}')
+            self._write_page(session, full_path, {
+                'title': f'"{display} ({page})"',
+                'categories': f"[{name}]",
+                'tags': '[MCI, Papers]',
+                'author': '"CLAIR"',
+            }, f"{display} - {page} 페이지", papers)
+        return write
+
+    def _ranking_writer(self, entries):
+        def write(session, full_path):
+            order = {paper_id: position for position, (paper_id, _, _) in enumerate(entries)}
+            papers = self._papers_query(session).filter(Paper.id.in_(list(order))).all()
+            papers.sort(key=lambda paper: order[paper.id])
+            self._write_page(session, full_path, {
+                'title': '"MCI 논문 인용 순위"',
+                'tags': '[MCI, Papers, Citations]',
+                'author': '"CLAIR"',
+            }, "🏆 인용 영향력 상위 논문 (PageRank)", papers,
+                {paper_id: cited_by for paper_id, cited_by, _ in entries})
+        return write
+
+    def _category_index_writer(self, name: str, page_count: int, total: int):
+        def write(session, full_path):
+            display = CATEGORY_DISPLAY.get(name, f'📄 {name}')
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp_path = full_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f'---\ntitle: "{display}"\ncategories: [{name}]\n---\n\n')
+                f.write(f"# {display}\n\n> **논문 수**: {total}개\n\n")
+                for page in range(page_count, 0, -1):
+                    f.write(f"- [{page} 페이지](page-{page:04d}/)\n")
+            os.replace(tmp_path, full_path)
+        return write
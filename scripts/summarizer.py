@@ -0,0 +1,157 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import numpy as np
+import yaml
+
+from scripts.database import Paper, PaperSummary
+from scripts.logger import setup_logging, worker_logging
+from scripts.term_trends import tokenize, is_term_token
+
+SUMMARIZER_VERSION = 'textrank-1'
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9(\[])')
+
+
+def split_sentences(text: str) -> List[str]:
+    """초록을 문장 단위로 분리합니다."""
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text or '') if sentence.strip()]
+
+
+def _truncate_words(text: str, max_words: int) -> str:
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return ' '.join(words[:max_words]) + '...'
+
+
+def textrank_summary(text: str, max_length: int = 256, sentences: int = 2) -> str:
+    """
+    문장 간 코사인 유사도 행렬에 TextRank(PageRank)를 적용하여
+    중요도가 높은 문장을 원래 순서대로 골라 요약합니다. max_length는 최대 단어 수입니다.
+    """
+    candidates = split_sentences(text)
+    if len(candidates) <= sentences:
+        return _truncate_words(' '.join(candidates), max_length)
+
+    # 문장별 단어 빈도 행렬
+    vocabulary = {}
+    rows = []
+    for sentence in candidates:
+        counts = {}
+        for token in tokenize(sentence):
+            if is_term_token(token):
+                column = vocabulary.setdefault(token, len(vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+        rows.append(counts)
+    matrix = np.zeros((len(candidates), max(len(vocabulary), 1)), dtype=np.float64)
+    for i, counts in enumerate(rows):
+        for column, count in counts.items():
+            matrix[i, column] = count
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # 행 정규화 후 power iteration
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / len(candidates)),
+                           where=out_weight > 0)
+    damping = 0.85
+    scores = np.full(len(candidates), 1.0 / len(candidates))
+    for _ in range(50):
+        updated = (1 - damping) / len(candidates) + damping * transition.T @ scores
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+
+    selected = sorted(np.argsort(-scores)[:sentences])
+    return _truncate_words(' '.join(candidates[i] for i in selected), max_length)
+
+
+def summarize_batch(abstracts: List[str], max_length: int, sentences: int) -> List[str]:
+    """워커 프로세스에서 초록 묶음을 요약합니다."""
+    return [textrank_summary(abstract, max_length, sentences) for abstract in abstracts]
+
+
+class PaperSummarizer:
+    """CPU 기반 추출 요약을 배치 단위로 병렬 실행하고 결과를 PMID·버전별로 DB에 캐시합니다."""
+
+    def __init__(self):
+        self.logger = setup_logging(__name__)
+        self.config = self._load_config()
+        self.max_length = self.config.get('max_length', 256)
+        self.batch_size = self.config.get('batch_size', 64)
+        self.sentences = self.config.get('sentences', 2)
+        self.workers = self.config.get('workers')
+        if self.config.get('model', 'textrank') != 'textrank':
+            self.logger.warning(f"Summarizer model '{self.config['model']}' is not supported, using textrank")
+
+    def _load_config(self) -> Dict[str, Any]:
+        """설정 파일의 summarizer 섹션을 로드합니다."""
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.yaml')
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f).get('summarizer') or {}
+
+    def summarize_missing(self, db_manager, chunk_size: int = 2000) -> int:
+        """
+        현재 버전의 요약이 없는 논문만 요약하여 저장합니다. 저장한 요약 수를 반환합니다.
+        실패하면 그때까지 커밋한 요약은 남기고 예외를 다시 발생시킵니다.
+        """
+        session = db_manager.Session()
+        total = 0
+        try:
+            summarized = session.query(PaperSummary.pmid).filter(PaperSummary.version == SUMMARIZER_VERSION)
+            query = (session.query(Paper.pmid, Paper.abstract)
+                     .filter(Paper.abstract.isnot(None), Paper.abstract != '',
+                             Paper.pmid.notin_(summarized))
+                     .order_by(Paper.id))
+
+            with ProcessPoolExecutor(max_workers=self.workers, **worker_logging()) as executor:
+                while True:
+                    # 저장한 논문은 다음 조회에서 빠지므로 항상 처음부터 chunk_size만큼 가져옴
+                    rows = query.limit(chunk_size).all()
+                    if not rows:
+                        break
+                    batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+                    futures = [
+                        executor.submit(summarize_batch, [abstract for _, abstract in batch],
+                                        self.max_length, self.sentences)
+                        for batch in batches
+                    ]
+                    for batch, future in zip(batches, futures):
+                        session.add_all([
+                            PaperSummary(pmid=pmid, version=SUMMARIZER_VERSION, summary=summary)
+                            for (pmid, _), summary in zip(batch, future.result())
+                        ])
+                    session.commit()
+                    total += len(rows)
+
+            if total:
+                self.logger.info(f"Summarized {total} papers with {SUMMARIZER_VERSION}")
+            return total
+
+        except Exception as e:
+            # 이미 커밋한 묶음은 남기고, 실패는 호출한 쪽(실행 단계 기록)으로 전달
+            self.logger.error(f"Error summarizing papers after {total} saved: {str(e)}")
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def get_summaries(self, db_manager, pmids: List[str]) -> Dict[str, str]:
+        """PMID 목록에 대한 캐시된 요약을 반환합니다."""
+        session = db_manager.Session()
+        try:
+            rows = (session.query(PaperSummary.pmid, PaperSummary.summary)
+                    .filter(PaperSummary.version == SUMMARIZER_VERSION, PaperSummary.pmid.in_(pmids))
+                    .all())
+            return dict(rows)
+        except Exception as e:
+            self.logger.error(f"Error retrieving summaries: {str(e)}")
+            return {}
+        finally:
+            session.close()
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import re
+import threading
+import zlib
+from datetime import date
+from typing import Dict, List, Set
+
+import numpy as np
+
+from scripts.database import Paper, TermSketch, AppState, exclude_duplicates, trend_date
+from scripts.logger import setup_logging
+from scripts.trend_cube import window_start
+
+# count-min sketch 크기: 월당 depth × width개의 int32 카운터 (압축 전 512KB)
+SKETCH_DEPTH = 4
+SKETCH_WIDTH = 2 ** 15
+_WIDTH_BITS = SKETCH_WIDTH.bit_length() - 1
+# 월별로 sketch 추정 빈도 상위 몇 개 용어를 급증 용어 후보로 유지할지
+TOP_TERMS_PER_MONTH = 2000
+# sketch 재생성 시 이만큼의 논문마다 대기 중인 sketch를 DB에 반영하여 메모리 사용을 제한
+REBUILD_FLUSH_PAPERS = 5000
+_HASH_MULTIPLIERS = np.array([
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93
+], dtype=np.uint64)[:SKETCH_DEPTH]
+
+TOKEN_PATTERN = re.compile(r"\w[\w\-]*\w|\w")
+
+STOPWORDS = frozenset("""
+a about above after again against all also among an and any are as at be been before being
+between both but by can could did do does during each either for from further had has have
+having here how however if in into is it its itself may more most much must no nor not of
+on only or other our out over own same should so some such than that the their them then
+there these they this those through to too under until up upon very was we were what when
+where whether which while who whom why will with within without would you
+background objective objectives methods method results result conclusion conclusions aim aims
+purpose study studies using used use based associated compared significant significantly
+total respectively including included include showed show shown found among participants
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """텍스트를 소문자 토큰 목록으로 분리합니다."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def is_term_token(token: str) -> bool:
+    return len(token) >= 3 and token not in STOPWORDS and not token.isdigit()
+
+
+def extract_terms(title: str, abstract: str) -> Set[str]:
+    """제목과 초록에서 유니그램과 바이그램 용어 집합을 추출합니다 (문서 빈도 기준)."""
+    terms = set()
+    for text in (title, abstract):
+        tokens = tokenize(text)
+        valid = [is_term_token(token) for token in tokens]
+        for i, token in enumerate(tokens):
+            if not valid[i]:
+                continue
+            terms.add(token)
+            if i + 1 < len(tokens) and valid[i + 1]:
+                terms.add(f"{token} {tokens[i + 1]}")
+    return terms
+
+
+def hash_terms(terms: List[str]) -> np.ndarray:
+    """용어를 프로세스와 무관하게 안정적인 64비트 해시로 변환합니다."""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+        for term in terms
+    ], dtype=np.uint64)
+
+
+def sketch_indices(hashes: np.ndarray) -> np.ndarray:
+    """multiply-shift 해싱으로 (depth, n) 크기의 sketch 열 인덱스를 계산합니다."""
+    return (hashes[None, :] * _HASH_MULTIPLIERS[:, None]) >> np.uint64(64 - _WIDTH_BITS)
+
+
+def _empty_sketch() -> np.ndarray:
+    return np.zeros((SKETCH_DEPTH, SKETCH_WIDTH), dtype=np.int32)
+
+
+def estimate(counts: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """sketch에서 용어별 빈도를 추정합니다 (depth별 카운터의 최솟값)."""
+    return counts[np.arange(SKETCH_DEPTH)[:, None], indices].min(axis=0)
+
+
+class TermTrendEngine:
+    """
+    월별 용어 빈도를 count-min sketch로 증분 관리하고 급증하는 용어를 찾습니다.
+    sketch는 용어 이름을 모르므로, 월마다 추정 빈도 상위 TOP_TERMS_PER_MONTH개 용어를 후보 목록으로 함께 저장합니다.
+    """
+
+    BUILT_KEY = 'term_sketch_built'
+    # 2: 수집일 대신 발행일(trend_date) 기준 월별 sketch
+    # 3: 월별 빈출 후보 용어(top_terms) 추가
+    BUILT_VERSION = '3'
+
+    def __init__(self):
+        self.logger = setup_logging(__name__)
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def observe(self, day: date, title: str, abstract: str):
+        """수집된 논문의 용어를 해당 월의 대기 중인 sketch와 후보 용어 집합에 더합니다."""
+        terms = extract_terms(title, abstract or '')
+        month = day.strftime('%Y-%m')
+        indices = sketch_indices(hash_terms(list(terms))) if terms else None
+        with self._lock:
+            entry = self._pending.get(month)
+            if entry is None:
+                entry = self._pending[month] = [0, _empty_sketch(), set()]
+            entry[0] += 1
+            entry[2].update(terms)
+            if indices is not None:
+                for depth in range(SKETCH_DEPTH):
+                    np.add.at(entry[1][depth], indices[depth], 1)
+
+    def flush(self, session):
+        """
+        대기 중인 월별 sketch를 DB에 병합하고, 이전 후보와 이번 묶음의 용어 중 병합된 sketch의 추정 빈도 상위
+        용어로 후보 목록을 갱신합니다. 커밋에 실패하면 대기분을 되돌려 놓아 다음 flush에서 다시 반영합니다.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        try:
+            for month, (doc_count, counts, terms) in pending.items():
+                row = session.get(TermSketch, month)
+                if row is not None:
+                    counts = self._unpack(row.counts) + counts
+                    terms = terms | set(self._unpack_terms(row.top_terms))
+                top_terms = self._top_terms(counts, terms)
+                if row is None:
+                    session.add(TermSketch(month=month, doc_count=doc_count, counts=self._pack(counts),
+                                           top_terms=self._pack_terms(top_terms)))
+                else:
+                    row.counts = self._pack(counts)
+                    row.top_terms = self._pack_terms(top_terms)
+                    row.doc_count += doc_count
+            session.commit()
+        except Exception:
+            self._restore(pending)
+            raise
+        self.logger.debug(f"Flushed term sketches for {len(pending)} months")
+
+    def _restore(self, pending: Dict):
+        """반영하지 못한 대기분을 그 사이 쌓인 대기분에 다시 더합니다."""
+        with self._lock:
+            for month, (doc_count, counts, terms) in pending.items():
+                entry = self._pending.get(month)
+                if entry is None:
+                    self._pending[month] = [doc_count, counts, terms]
+                else:
+                    entry[0] += doc_count
+                    entry[1] += counts
+                    entry[2].update(terms)
+
+    @staticmethod
+    def _top_terms(counts: np.ndarray, terms: Set[str]) -> List[str]:
+        """후보 용어 중 sketch 추정 빈도 상위 TOP_TERMS_PER_MONTH개를 반환합니다."""
+        terms = list(terms)
+        if len(terms) <= TOP_TERMS_PER_MONTH:
+            return terms
+        estimates = estimate(counts, sketch_indices(hash_terms(terms)).astype(np.intp))
+        keep = np.argpartition(-estimates, TOP_TERMS_PER_MONTH - 1)[:TOP_TERMS_PER_MONTH]
+        return [terms[i] for i in keep]
+
+    def is_built(self, session) -> bool:
+        """현재 버전의 sketch가 만들어져 있는지 확인합니다 (읽기 전용 연결에서도 사용)."""
+        built = session.get(AppState, self.BUILT_KEY)
+        return built is not None and built.value == self.BUILT_VERSION
+
+    def ensure_built(self, session):
+        """sketch가 아직 만들어지지 않았다면 기존 논문으로부터 한 번 생성합니다 (쓰기 가능한 연결 전용)."""
+        if not self.is_built(session):
+            self.rebuild(session)
+
+    def rebuild(self, session):
+        """전체 논문으로부터 월별 sketch를 다시 계산합니다."""
+        with self._lock:
+            self._pending = {}
+
+        session.query(TermSketch).delete()
+        # 묶음마다 커밋하므로 커서를 열어 두지 않고 id 순서로 REBUILD_FLUSH_PAPERS편씩 읽음
+        paper_count = 0
+        last_id = 0
+        while True:
+            rows = (exclude_duplicates(session.query(Paper.id, trend_date(), Paper.title, Paper.abstract))
+                    .filter(Paper.created_date.isnot(None), Paper.id > last_id)
+                    .order_by(Paper.id)
+                    .limit(REBUILD_FLUSH_PAPERS)
+                    .all())
+            if not rows:
+                break
+            for _, day, title, abstract in rows:
+                self.observe(day, title, abstract)
+            paper_count += len(rows)
+            last_id = rows[-1][0]
+            self.flush(session)
+
+        session.merge(AppState(key=self.BUILT_KEY, value=self.BUILT_VERSION))
+        self.flush(session)
+        session.commit()
+        self.logger.info(f"Rebuilt term sketches from {paper_count} papers")
+
+    def emerging_terms(self, session, today: date, months: int = 12, recent_months: int = 3,
+                       top_n: int = 20, min_count: int = 3) -> List[Dict]:
+        """
+        최근 recent_months개월과 그 이전 기간의 문서 비율을 비교하여 급증하는 용어를 찾습니다.
+        후보 용어는 최근 월들의 빈출 후보 목록(top_terms)에서 가져오고, 두 기간의 빈도는 모두 sketch에서 추정하므로
+        논문 테이블을 읽지 않습니다.
+        """
+        recent_start = window_start(today, recent_months, 'month')
+        baseline_start = window_start(today, months, 'month')
+
+        rows = (session.query(TermSketch)
+                .filter(TermSketch.month >= baseline_start.strftime('%Y-%m'))
+                .all())
+        recent_rows = [row for row in rows if row.month >= recent_start.strftime('%Y-%m')]
+        baseline_rows = [row for row in rows if row.month < recent_start.strftime('%Y-%m')]
+        recent_docs = sum(row.doc_count for row in recent_rows)
+        baseline_docs = sum(row.doc_count for row in baseline_rows)
+        if recent_docs == 0:
+            return []
+        if baseline_docs == 0:
+            self.logger.info("Not enough history for emerging term detection")
+            return []
+
+        candidates = sorted(set().union(*(self._unpack_terms(row.top_terms) for row in recent_rows)))
+        if not candidates:
+            return []
+
+        # 기간별 빈도 추정: 월별 sketch에서 depth별 최솟값을 취해 더함
+        indices = sketch_indices(hash_terms(candidates)).astype(np.intp)
+        recent = np.zeros(len(candidates), dtype=np.float64)
+        for row in recent_rows:
+            recent += estimate(self._unpack(row.counts), indices)
+        baseline = np.zeros(len(candidates), dtype=np.float64)
+        for row in baseline_rows:
+            baseline += estimate(self._unpack(row.counts), indices)
+
+        # count-min 추정은 과대 추정만 하므로 문서 수를 넘지 않게 자름
+        recent = np.minimum(recent, recent_docs)
+        baseline = np.minimum(baseline, baseline_docs)
+        keep = recent >= min_count
+        candidates = [term for term, kept in zip(candidates, keep) if kept]
+        recent, baseline = recent[keep], baseline[keep]
+        if not candidates:
+            return []
+
+        # 두 비율 z-검정 (벡터화)
+        p_recent = recent / recent_docs
+        p_baseline = (baseline + 0.5) / (baseline_docs + 1)
+        pooled = (recent + baseline) / (recent_docs + baseline_docs)
+        se = np.sqrt(pooled * (1 - pooled) * (1 / recent_docs + 1 / baseline_docs))
+        z_scores = np.divide(p_recent - p_baseline, se, out=np.zeros_like(se), where=se > 0)
+        growth = p_recent / p_baseline
+
+        order = np.argsort(-z_scores)[:top_n]
+        return [
+            {
+                'term': candidates[i],
+                'recent_count': int(recent[i]),
+                'baseline_count': int(baseline[i]),
+                'growth': float(growth[i]),
+                'z_score': float(z_scores[i])
+            }
+            for i in order if z_scores[i] > 0
+        ]
+
+    def term_series(self, session, terms: List[str], start: date) -> Dict[str, List[int]]:
+        """start 이후 월별로 각 용어의 추정 문서 빈도를 반환합니다 ({월: [용어별 빈도]})."""
+        if not terms:
+            return {}
+        indices = sketch_indices(hash_terms(terms)).astype(np.intp)
+        rows = (session.query(TermSketch)
+                .filter(TermSketch.month >= start.strftime('%Y-%m'))
+                .order_by(TermSketch.month)
+                .all())
+        return {row.month: estimate(self._unpack(row.counts), indices).tolist() for row in rows}
+
+    @staticmethod
+    def _pack(counts: np.ndarray) -> bytes:
+        return zlib.compress(counts.astype(np.int32).tobytes())
+
+    @staticmethod
+    def _unpack(blob: bytes) -> np.ndarray:
+        return np.frombuffer(zlib.decompress(blob), dtype=np.int32).reshape(SKETCH_DEPTH, SKETCH_WIDTH).copy()
+
+    @staticmethod
+    def _pack_terms(terms: List[str]) -> bytes:
+        return zlib.compress(json.dumps(terms, ensure_ascii=False).encode('utf-8'))
+
+    @staticmethod
+    def _unpack_terms(blob: bytes) -> List[str]:
+        return json.loads(zlib.decompress(blob)) if blob else []
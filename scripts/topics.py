@@ -0,0 +1,41 @@
+import os
+from typing import Any, Dict, List
+
+import yaml
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TOPIC = {
+    'key': 'mci',
+    'name': 'Mild cognitive impairment',
+    'keywords': 'config/keywords.txt',
+    'category_rules': 'config/category_rules.yaml',
+}
+
+
+def _resolve(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def load_topics() -> List[Dict[str, Any]]:
+    """
+    config.yaml의 topics 섹션에서 수집 주제 목록을 읽습니다.
+    각 주제는 key, name, keywords(검색어 목록), category_rules(규칙 파일 절대 경로)를 가지며,
+    첫 번째 주제가 주제 정보 없이 추가된 논문의 기본 주제입니다.
+    섹션이 없으면 기존 keywords.txt·category_rules.yaml로 된 단일 주제를 사용합니다.
+    """
+    with open(os.path.join(PROJECT_ROOT, 'config', 'config.yaml'), 'r', encoding='utf-8') as f:
+        configured = (yaml.safe_load(f) or {}).get('topics') or {'mci': DEFAULT_TOPIC}
+
+    topics = []
+    for key, topic in configured.items():
+        keywords = topic.get('keywords', DEFAULT_TOPIC['keywords'])
+        if isinstance(keywords, str):
+            with open(_resolve(keywords), 'r', encoding='utf-8') as f:
+                keywords = [line.strip() for line in f if line.strip()]
+        topics.append({
+            'key': key,
+            'name': topic.get('name', key),
+            'keywords': keywords,
+            'category_rules': _resolve(topic.get('category_rules', DEFAULT_TOPIC['category_rules'])),
+        })
+    return topics
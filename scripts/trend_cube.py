@@ -0,0 +1,131 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+
+from scripts.database import (Paper, Category, CategoryPeriodCount, AppState, paper_categories, exclude_duplicates,
+                              trend_date)
+from scripts.logger import setup_logging
+
+GRANULARITIES = ('month', 'week', 'quarter')
+
+
+def period_of(day: date, granularity: str) -> Tuple[str, date]:
+    """날짜가 속한 기간의 키와 시작일을 반환합니다."""
+    if granularity == 'month':
+        return day.strftime('%Y-%m'), day.replace(day=1)
+    if granularity == 'quarter':
+        quarter = (day.month - 1) // 3 + 1
+        return f"{day.year}-Q{quarter}", date(day.year, 3 * quarter - 2, 1)
+    if granularity == 'week':
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}", date.fromisocalendar(iso_year, iso_week, 1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def window_start(today: date, periods: int, granularity: str) -> date:
+    """오늘을 포함하여 최근 periods개 기간의 시작일을 계산합니다."""
+    if granularity == 'month':
+        month_index = today.year * 12 + today.month - 1 - (periods - 1)
+        return date(month_index // 12, month_index % 12 + 1, 1)
+    if granularity == 'quarter':
+        quarter_index = today.year * 4 + (today.month - 1) // 3 - (periods - 1)
+        return date(quarter_index // 4, (quarter_index % 4) * 3 + 1, 1)
+    if granularity == 'week':
+        _, start = period_of(today, 'week')
+        return date.fromordinal(start.toordinal() - 7 * (periods - 1))
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+class TrendCube:
+    """카테고리 × 기간 논문 수를 DB에 유지하고 수집 시 증분 갱신합니다."""
+
+    BUILT_KEY = 'trend_cube_built'
+    # 2: 수집일 대신 발행일(trend_date) 기준으로 집계
+    BUILT_VERSION = '2'
+
+    def __init__(self):
+        self.logger = setup_logging(__name__)
+
+    def increment(self, session, day: date, category_ids: Iterable[int], amount: int = 1):
+        """수집된 논문이 속한 기간의 카운트만 갱신합니다 (호출자 트랜잭션 내에서 실행)."""
+        self.increment_batch(session, [(day, category_ids)], amount)
+
+    def increment_batch(self, session, items: Iterable[Tuple[date, Iterable[int]]], amount: int = 1):
+        """
+        (수집일, 카테고리 id 목록) 묶음의 증분을 셀별로 합산한 뒤 한 번의 executemany로 반영합니다.
+        배치 저장 시 논문마다 upsert를 실행하지 않기 위해 사용합니다.
+        """
+        deltas = defaultdict(int)
+        for day, category_ids in items:
+            for category_id in category_ids:
+                for granularity in GRANULARITIES:
+                    period, period_start = period_of(day, granularity)
+                    deltas[(granularity, period, category_id, period_start)] += amount
+        if not deltas:
+            return
+
+        stmt = insert(CategoryPeriodCount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['granularity', 'period', 'category_id'],
+            set_={'count': CategoryPeriodCount.count + stmt.excluded.count}
+        )
+        session.execute(stmt, [
+            {'granularity': granularity, 'period': period, 'category_id': category_id,
+             'period_start': period_start, 'count': count}
+            for (granularity, period, category_id, period_start), count in deltas.items()
+        ])
+
+    def is_built(self, session) -> bool:
+        """현재 버전의 큐브가 만들어져 있는지 확인합니다 (읽기 전용 연결에서도 사용)."""
+        built = session.get(AppState, self.BUILT_KEY)
+        return built is not None and built.value == self.BUILT_VERSION
+
+    def ensure_built(self, session):
+        """큐브가 아직 만들어지지 않았다면 기존 논문으로부터 한 번 생성합니다 (쓰기 가능한 연결 전용)."""
+        if not self.is_built(session):
+            self.rebuild(session)
+
+    def rebuild(self, session):
+        """전체 논문으로부터 큐브를 다시 계산합니다."""
+        day_expr = trend_date()
+        query = (session.query(day_expr, paper_categories.c.category_id, func.count(Paper.id))
+                 .join(paper_categories, paper_categories.c.paper_id == Paper.id)
+                 .filter(Paper.created_date.isnot(None)))
+        rows = (exclude_duplicates(query)
+                .group_by(day_expr, paper_categories.c.category_id)
+                .all())
+
+        cube = defaultdict(int)
+        starts = {}
+        for day, category_id, count in rows:
+            for granularity in GRANULARITIES:
+                period, period_start = period_of(day, granularity)
+                cube[(granularity, period, category_id)] += count
+                starts[(granularity, period)] = period_start
+
+        session.query(CategoryPeriodCount).delete()
+        session.bulk_insert_mappings(CategoryPeriodCount, [
+            {
+                'granularity': granularity,
+                'period': period,
+                'category_id': category_id,
+                'period_start': starts[(granularity, period)],
+                'count': count
+            }
+            for (granularity, period, category_id), count in cube.items()
+        ])
+        session.merge(AppState(key=self.BUILT_KEY, value=self.BUILT_VERSION))
+        session.commit()
+        self.logger.info(f"Rebuilt trend cube from {len(rows)} date/category groups")
+
+    def query(self, session, start: date, granularity: str = 'month') -> List[Tuple[str, str, int]]:
+        """start 이후 기간의 (기간, 카테고리, 논문 수) 목록을 반환합니다."""
+        return (session.query(CategoryPeriodCount.period, Category.name, CategoryPeriodCount.count)
+                .join(Category, Category.id == CategoryPeriodCount.category_id)
+                .filter(CategoryPeriodCount.granularity == granularity,
+                        CategoryPeriodCount.period_start >= start)
+                .order_by(CategoryPeriodCount.period_start)
+                .all())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+MCI 논문 데이터베이스 로컬 JSON API 서버
+노트북·대시보드 등에서 DB 파일을 직접 열지 않고 조회할 수 있도록 localhost에서 제공
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python path에 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scripts.api_server import PaperAPIServer
+
+def main():
+    parser = argparse.ArgumentParser(description='MCI 논문 읽기 전용 JSON API 서버')
+    parser.add_argument('--db', default='data/mci_papers.db', help='데이터베이스 경로')
+    parser.add_argument('--host', help='바인드 주소 (기본: config의 api.host)')
+    parser.add_argument('--port', type=int, help='포트 (기본: config의 api.port)')
+    parser.add_argument('--pool-size', type=int, help='읽기 전용 연결 풀 크기')
+    args = parser.parse_args()
+
+    server = PaperAPIServer(args.db, host=args.host, port=args.port, pool_size=args.pool_size)
+    print(f"🌐 API 서버 실행: http://{server.host}:{server.port}")
+    print("   /papers, /papers/{pmid}, /search?q=, /stats, /trends")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n👋 API 서버를 종료합니다.")
+
+if __name__ == "__main__":
+    main()